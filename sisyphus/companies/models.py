@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 
 from sisyphus.accounts.models import UserProfile
 from sisyphus.core.models import UUIDModel
+from sisyphus.jobs.cache import company_cache, company_key
 
 
 class Company(UUIDModel):
@@ -44,6 +45,7 @@ class Company(UUIDModel):
         self.banned_at = timezone.now()
         self.ban_reason = reason
         self.save(update_fields=['is_banned', 'banned_at', 'ban_reason'])
+        company_cache.pop(company_key(self.user_id, self.linkedin_url))
         for job in self.jobs.filter(status__in=[Job.Status.NEW, Job.Status.SAVED]):
             job.update_status(Job.Status.BANNED)
 
@@ -55,6 +57,7 @@ class Company(UUIDModel):
         self.banned_at = None
         self.ban_reason = ''
         self.save(update_fields=['is_banned', 'banned_at', 'ban_reason'])
+        company_cache.pop(company_key(self.user_id, self.linkedin_url))
         for job in self.jobs.filter(status=Job.Status.BANNED):
             job.update_status(job.pre_ban_status or Job.Status.NEW)
 
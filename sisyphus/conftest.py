@@ -1,8 +1,47 @@
+import fakeredis
 import pytest
 
 from sisyphus.accounts.models import User, UserProfile
 from sisyphus.companies.models import Company
+from sisyphus.core.stores import RedisStore
 from sisyphus.jobs.models import Job, Location
+from sisyphus.searches.telemetry import telemetry
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    """Back every Redis store with an in-memory Redis, dropping telemetry left pending."""
+    connection = fakeredis.FakeRedis()
+    for store in RedisStore.instances:
+        monkeypatch.setattr(store, '_connection', connection)
+    monkeypatch.setattr(telemetry, '_pending', {})
+    monkeypatch.setattr(telemetry, '_count', 0)
+    return connection
+
+
+@pytest.fixture(autouse=True)
+def response_cache_dir(settings, tmp_path):
+    """Keep cached responses out of the working tree."""
+    settings.SCRAPER_CACHE_DIR = str(tmp_path / 'responses')
+    return tmp_path / 'responses'
+
+
+@pytest.fixture
+def limits(request, settings):
+    """Apply the settings given to the test's ``limits`` markers."""
+    for marker in reversed(list(request.node.iter_markers('limits'))):
+        for name, value in marker.kwargs.items():
+            setattr(settings, name, value)
+    return settings
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """Freeze the clock function named by the test's ``clock`` marker; advance it through ``clock[0]``."""
+    marker = request.node.get_closest_marker('clock')
+    now = [marker.kwargs.get('start', 1000.0)]
+    monkeypatch.setattr(marker.args[0], lambda: now[0])
+    return now
 
 
 @pytest.fixture
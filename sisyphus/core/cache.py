@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+
+class LRUCache:
+    """A bounded least-recently-used mapping that counts hits and misses.
+
+    A disabled cache stores nothing and always misses without counting.
+    """
+
+    def __init__(self, maxsize: int = 1024, enabled: bool = True) -> None:
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Any, Any] = OrderedDict()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value for key, marking it as recently used."""
+        if not self.enabled:
+            return default
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Cache value for key, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """Remove key from the cache and return its value."""
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return the current size and hit/miss counters."""
+        return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
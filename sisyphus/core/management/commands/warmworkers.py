@@ -0,0 +1,30 @@
+import django_rq
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from sisyphus.core.worker import MAX_MEMORY_MB, WarmWorkerPool
+
+
+class Command(BaseCommand):
+    help = 'Run a prefork pool of warm RQ workers, recycling children one at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queues', nargs='*', default=['default'], help='Queues to work on')
+        parser.add_argument('--num-workers', type=int, default=settings.WORKER_POOL_SIZE)
+        parser.add_argument('--max-jobs', type=int, default=settings.WORKER_MAX_JOBS)
+        parser.add_argument('--max-memory', type=int, default=MAX_MEMORY_MB, help='RSS in MB that retires a child')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queues are empty')
+
+    def handle(self, *args, **options):
+        queues = [django_rq.get_queue(name) for name in options['queues']]
+        pool = WarmWorkerPool(
+            queues=queues,
+            connection=queues[0].connection,
+            num_workers=options['num_workers'],
+            max_jobs=options['max_jobs'] or None,
+            max_memory_mb=options['max_memory'],
+        )
+        # Children must not inherit the parent's database connections
+        connections.close_all()
+        pool.start(burst=options['burst'], logging_level='DEBUG' if options['verbosity'] >= 2 else 'INFO')
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from queue import Empty, Full, Queue
+from typing import Any
+
+# Markers passed through the queue after the last item
+_DONE = object()
+_ERROR = object()
+
+# How often a blocked producer checks whether the consumer has gone away
+_POLL_SECONDS = 0.1
+
+
+class Stage:
+    """Run an iterable on a background thread and hand its items over a bounded queue.
+
+    Iterating the stage yields the producer's items in order, re-raising
+    anything the producer raised. At most ``maxsize`` items wait between the
+    two sides, so a slow consumer pauses the producer; with ``maxsize`` 0 the
+    iterable runs inline on the consumer's thread instead. Time spent on
+    each side is recorded:
+
+    - ``produce_seconds``: inside the producer's iterable
+    - ``blocked_seconds``: producer waiting for room in a full queue
+    - ``waiting_seconds``: consumer waiting for the next item
+    """
+
+    def __init__(self, source: Iterable[Any], maxsize: int, name: str = 'stage') -> None:
+        self.source = source
+        self.maxsize = maxsize
+        self.name = name
+        self.produce_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.waiting_seconds = 0.0
+        self.max_depth = 0
+        self._queue: Queue[tuple[object, Any]] = Queue(maxsize)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._inline: Iterator[Any] | None = None
+
+    def __enter__(self) -> Stage:
+        if self.maxsize > 0:
+            # The producer sees the consumer's context variables, as it would running inline
+            context = contextvars.copy_context()
+            self._thread = threading.Thread(target=context.run, args=(self._produce,), name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._thread is None:
+            self._inline = iter(self.source)
+            yield from self._timed(self._inline)
+            return
+        while True:
+            start = time.perf_counter()
+            marker, value = self._queue.get()
+            self.waiting_seconds += time.perf_counter() - start
+            if marker is _DONE:
+                return
+            if marker is _ERROR:
+                raise value
+            yield value
+
+    def _timed(self, iterator: Iterator[Any]) -> Iterator[Any]:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.produce_seconds += time.perf_counter() - start
+            yield item
+
+    def _produce(self) -> None:
+        iterator = iter(self.source)
+        try:
+            for item in self._timed(iterator):
+                if not self._put(None, item):
+                    return
+        except Exception as exc:
+            self._put(_ERROR, exc)
+        else:
+            self._put(_DONE, None)
+        finally:
+            # Close the source here, since a generator can only be closed by the thread running it
+            if hasattr(iterator, 'close'):
+                iterator.close()
+
+    def _put(self, marker: object, value: Any) -> bool:
+        """Queue an item, waiting for room; return False if the consumer went away."""
+        start = time.perf_counter()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put((marker, value), timeout=_POLL_SECONDS)
+                except Full:
+                    continue
+                self.max_depth = max(self.max_depth, self._queue.qsize())
+                return True
+            return False
+        finally:
+            self.blocked_seconds += time.perf_counter() - start
+
+    def close(self) -> None:
+        """Stop the producer after its current item and wait for it to finish."""
+        self._stopped.set()
+        if self._thread is None:
+            if hasattr(self._inline, 'close'):
+                self._inline.close()
+            return
+        while self._thread.is_alive():
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except Empty:
+                pass
+            self._thread.join(_POLL_SECONDS)
+        self._thread = None
+
+    def summary(self) -> dict[str, float]:
+        return {
+            'produce_seconds': round(self.produce_seconds, 3),
+            'blocked_seconds': round(self.blocked_seconds, 3),
+            'waiting_seconds': round(self.waiting_seconds, 3),
+            'max_depth': self.max_depth,
+        }
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+from weakref import WeakSet
+
+
+class RedisStore(ABC):
+    """Base for state kept in Redis and shared by every worker.
+
+    The connection defaults to the RQ connection on first use. Every store
+    created is tracked in ``instances``, so tests can swap all of their
+    connections at once.
+    """
+
+    instances: ClassVar[WeakSet[RedisStore]] = WeakSet()
+
+    def __init__(self, connection: Any = None) -> None:
+        self._connection = connection
+        RedisStore.instances.add(self)
+
+    @property
+    def connection(self) -> Any:
+        """Return the Redis connection, defaulting to the RQ connection."""
+        if self._connection is None:
+            import django_rq  # noqa: PLC0415
+
+            self._connection = django_rq.get_connection()
+        return self._connection
+
+    @property
+    @abstractmethod
+    def enabled(self) -> bool:
+        """Return whether the store is turned on in settings."""
@@ -0,0 +1,37 @@
+from sisyphus.core.cache import LRUCache
+
+
+class TestLRUCache:
+    """Tests for the LRUCache mapping."""
+
+    def test_get_counts_hits_and_misses(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 1}
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 2
+
+    def test_pop_and_clear(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        assert cache.pop('a') == 1
+        cache.set('b', 2)
+        cache.get('b')
+        cache.clear()
+        assert cache.stats() == {'size': 0, 'hits': 0, 'misses': 0}
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = LRUCache(2, enabled=False)
+        cache.set('a', 1)
+        assert cache.get('a') is None
+        assert cache.stats() == {'size': 0, 'hits': 0, 'misses': 0}
@@ -0,0 +1,29 @@
+from sisyphus.core.histogram import Histogram
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_empty(self):
+        assert Histogram().percentile(0.5) == 0.0
+
+    def test_percentiles(self):
+        histogram = Histogram(bounds=(1.0, 2.0, 4.0))
+        for value in [0.5] * 9 + [3.0]:
+            histogram.observe(value)
+        assert histogram.percentile(0.5) == 1.0
+        assert histogram.percentile(0.95) == 4.0
+
+    def test_overflow_reports_max(self):
+        histogram = Histogram(bounds=(1.0,))
+        histogram.observe(7.5)
+        assert histogram.percentile(0.95) == 7.5
+
+    def test_summary(self):
+        histogram = Histogram()
+        histogram.observe(0.2)
+        histogram.observe(0.4)
+        summary = histogram.summary()
+        assert summary['count'] == 2
+        assert summary['mean'] == 0.3
+        assert summary['p50'] == 0.25
@@ -0,0 +1,69 @@
+import contextvars
+import threading
+
+import pytest
+
+from sisyphus.core.pipeline import Stage
+
+
+class TestStage:
+    """Tests for Stage."""
+
+    @pytest.mark.parametrize('maxsize', [0, 1, 4])
+    def test_yields_in_order(self, maxsize):
+        with Stage(range(10), maxsize) as stage:
+            assert list(stage) == list(range(10))
+
+    def test_runs_on_another_thread(self):
+        def source():
+            yield threading.current_thread()
+
+        with Stage(source(), 1) as stage:
+            assert next(iter(stage)) is not threading.current_thread()
+
+    def test_producer_sees_context_variables(self):
+        user = contextvars.ContextVar('user', default='')
+        user.set('alice')
+
+        def source():
+            yield user.get()
+
+        with Stage(source(), 1) as stage:
+            assert list(stage) == ['alice']
+
+    def test_reraises_producer_error(self):
+        def source():
+            yield 1
+            raise ValueError('boom')
+
+        with Stage(source(), 2) as stage:
+            items = iter(stage)
+            assert next(items) == 1
+            with pytest.raises(ValueError, match='boom'):
+                next(items)
+
+    def test_close_stops_producer(self):
+        closed = threading.Event()
+        produced = []
+
+        def source():
+            try:
+                for n in range(1000):
+                    produced.append(n)
+                    yield n
+            finally:
+                closed.set()
+
+        with Stage(source(), 1) as stage:
+            assert next(iter(stage)) == 0
+        assert closed.is_set()
+        assert len(produced) < 1000
+
+    def test_full_queue_blocks_producer(self):
+        with Stage(range(3), 1) as stage:
+            items = iter(stage)
+            next(items)
+            threading.Event().wait(0.2)
+            list(items)
+        assert stage.blocked_seconds >= 0.1
+        assert stage.max_depth == 1
@@ -0,0 +1,32 @@
+import pytest
+
+from sisyphus.core.stores import RedisStore
+
+
+class Store(RedisStore):
+    enabled = True
+
+
+class TestRedisStore:
+    """Tests for the RedisStore base."""
+
+    def test_defaults_to_rq_connection(self, monkeypatch):
+        connection = object()
+        monkeypatch.setattr('django_rq.get_connection', lambda: connection)
+        assert Store().connection is connection
+
+    def test_keeps_given_connection(self, monkeypatch):
+        monkeypatch.setattr('django_rq.get_connection', lambda: pytest.fail('RQ connection used'))
+        connection = object()
+        assert Store(connection).connection is connection
+
+    def test_tracks_instances(self):
+        store = Store()
+        assert store in RedisStore.instances
+
+    def test_requires_enabled(self):
+        class Incomplete(RedisStore):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
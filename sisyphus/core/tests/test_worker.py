@@ -0,0 +1,53 @@
+import pytest
+from rq.worker import Worker
+from rq.worker_pool import WorkerData
+
+from sisyphus.core import worker
+from sisyphus.core.worker import PooledWorker, WarmWorkerPool
+
+
+class TestWarmWorkerPool:
+    """Tests for WarmWorkerPool recycling."""
+
+    @pytest.fixture
+    def pool(self, fake_redis, monkeypatch):
+        pool = WarmWorkerPool(['default'], connection=fake_redis, num_workers=2, max_jobs=10, max_memory_mb=100)
+        pool.status = pool.Status.STARTED
+        pool.events = []
+        for name, pid in (('a', 1), ('b', 2)):
+            pool.worker_dict[name] = WorkerData(name=name, pid=pid, process=None)
+        monkeypatch.setattr(pool, 'start_worker', lambda **kwargs: pool.events.append('start'))
+        monkeypatch.setattr(pool, 'stop_worker', lambda data: pool.events.append(f'stop {data.name}'))
+        monkeypatch.setattr(pool, 'reap_workers', lambda: None)
+        return pool
+
+    def jobs(self, pool, name, count):
+        pool.connection.hset(Worker.redis_worker_namespace_prefix + name, 'successful_job_count', count)
+
+    def test_children_do_not_stop_themselves(self, pool):
+        assert pool.worker_class is PooledWorker
+        assert PooledWorker.max_memory_mb is None
+
+    def test_leaves_children_under_limits(self, pool, monkeypatch):
+        monkeypatch.setattr(worker, '_get_rss_mb', lambda pid: 50)
+        self.jobs(pool, 'a', 9)
+        assert pool.recycle() is None
+        assert pool.events == []
+
+    def test_replacement_starts_before_child_stops(self, pool, monkeypatch):
+        monkeypatch.setattr(worker, '_get_rss_mb', lambda pid: 50)
+        self.jobs(pool, 'b', 10)
+        pool.check_workers()
+        assert pool.events == ['start', 'stop b']
+        assert pool.retiring == 'b'
+
+    def test_one_child_retires_at_a_time(self, pool, monkeypatch):
+        monkeypatch.setattr(worker, '_get_rss_mb', lambda pid: 500)
+        pool.check_workers()
+        pool.check_workers()
+        assert pool.events == ['start', 'stop a']
+
+        pool.handle_dead_worker(pool.worker_dict['a'])
+        assert pool.retiring is None
+        pool.check_workers()
+        assert pool.events[-1] == 'stop b'
@@ -1,37 +1,129 @@
 import logging
 import os
+from importlib import import_module
 
-from rq.worker import SimpleWorker
+from rq.utils import now
+from rq.worker import SimpleWorker, Worker
+from rq.worker_pool import WorkerData, WorkerPool
 
 logger = logging.getLogger(__name__)
 
 MAX_MEMORY_MB = 3072  # 3 GB
 
 
+def _get_rss_mb(pid: int | str = 'self') -> int:
+    """Read a process's RSS from /proc/<pid>/status (VmRSS line, in kB)."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) // 1024
+    except FileNotFoundError:
+        pass
+    return 0
+
+
 def _get_current_rss_mb() -> int:
     """Read current RSS from /proc/self/status (VmRSS line, in kB)."""
-    with open('/proc/self/status') as f:
-        for line in f:
-            if line.startswith('VmRSS:'):
-                return int(line.split()[1]) // 1024
-    return 0
+    return _get_rss_mb()
 
 
 class MemoryLimitWorker(SimpleWorker):
-    """RQ worker that shuts down gracefully when RSS exceeds MAX_MEMORY_MB."""
+    """RQ worker that shuts down gracefully when RSS exceeds max_memory_mb."""
+
+    max_memory_mb: int | None = MAX_MEMORY_MB
 
     def perform_job(self, job, queue):
+        if job.enqueued_at is not None:
+            # Time spent waiting on the stage's queue, i.e. how far behind its workers are
+            logger.info('Job %s waited %.1fs on queue %s', job.id, (now() - job.enqueued_at).total_seconds(), queue.name)
+
         result = super().perform_job(job, queue)
 
         rss_mb = _get_current_rss_mb()
         logger.info('Worker RSS after job %s: %d MB', job.id, rss_mb)
 
-        if rss_mb > MAX_MEMORY_MB:
+        if self.max_memory_mb is not None and rss_mb > self.max_memory_mb:
             logger.warning(
                 'Worker exceeded memory limit (%d MB > %d MB). Shutting down.',
                 rss_mb,
-                MAX_MEMORY_MB,
+                self.max_memory_mb,
             )
             self._stop_requested = True
 
         return result
+
+    def teardown(self):
+        from sisyphus.searches.parsers.base import BaseParser  # noqa: PLC0415
+
+        # Close the browsers the parsers kept open between jobs
+        BaseParser.shutdown_all()
+        super().teardown()
+
+
+class PooledWorker(MemoryLimitWorker):
+    """Child of a WarmWorkerPool, which recycles it instead of the child stopping itself."""
+
+    max_memory_mb = None
+
+
+class WarmWorkerPool(WorkerPool):
+    """Prefork pool of warm workers that are recycled one at a time.
+
+    Children fork from a parent that has already imported Django and the task
+    modules, sharing them copy-on-write. Each runs jobs in its own process, so
+    its parsers and browser stay live between jobs. When a child passes
+    ``max_memory_mb`` or ``max_jobs``, its replacement starts before it is
+    asked to finish its current job and exit, and only one child is retired
+    at a time.
+    """
+
+    # Imported before forking so that every child starts with them loaded
+    preload = (
+        'sisyphus.searches.tasks',
+        'sisyphus.searches.parsers',
+        'sisyphus.jobs.tasks',
+        'sisyphus.rules.tasks',
+    )
+
+    def __init__(self, *args, max_jobs: int | None = None, max_memory_mb: int = MAX_MEMORY_MB, **kwargs) -> None:
+        kwargs.setdefault('worker_class', PooledWorker)
+        super().__init__(*args, **kwargs)
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.retiring: str | None = None
+
+    def start(self, burst: bool = False, logging_level: str = 'INFO'):
+        for module in self.preload:
+            import_module(module)
+        super().start(burst=burst, logging_level=logging_level)
+
+    def handle_dead_worker(self, worker_data: WorkerData):
+        super().handle_dead_worker(worker_data)
+        if worker_data.name == self.retiring:
+            self.retiring = None
+
+    def check_workers(self, respawn: bool = True) -> None:
+        super().check_workers(respawn=respawn)
+        if respawn and self.status != self.Status.STOPPED and self.retiring is None:
+            self.recycle()
+
+    def job_count(self, name: str) -> int:
+        """Return how many jobs a child has finished, from the stats RQ keeps for it in Redis."""
+        counts = self.connection.hmget(
+            Worker.redis_worker_namespace_prefix + name, 'successful_job_count', 'failed_job_count'
+        )
+        return sum(int(count) for count in counts if count)
+
+    def recycle(self) -> str | None:
+        """Replace the first child over a limit, starting its successor first, and return its name."""
+        for data in list(self.worker_dict.values()):
+            rss_mb = _get_rss_mb(data.pid)
+            jobs = self.job_count(data.name)
+            if rss_mb > self.max_memory_mb or (self.max_jobs and jobs >= self.max_jobs):
+                self.log.info('Recycling worker %s (%d MB, %d jobs)', data.name, rss_mb, jobs)
+                self.retiring = data.name
+                self.start_worker(burst=self._burst, _sleep=self._sleep)
+                self.stop_worker(data)
+                return data.name
+        return None
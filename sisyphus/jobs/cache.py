@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.conf import settings
+
+from sisyphus.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Company and Location rows resolved during ingestion. Companies are keyed on
+# (user_id, linkedin_url) and locations on name. The caches are only enabled
+# inside an identity_scope and are emptied when it exits, so a ban made in
+# another process is never served stale for longer than one run.
+company_cache = LRUCache(settings.IDENTITY_CACHE_SIZE, enabled=False)
+location_cache = LRUCache(settings.IDENTITY_CACHE_SIZE, enabled=False)
+
+
+def company_key(user_id: int, linkedin_url: str | None) -> tuple[int, str | None]:
+    """Return the identity cache key for a company."""
+    return (user_id, linkedin_url)
+
+
+def reset_identity_cache() -> None:
+    """Clear the company and location caches and their counters."""
+    company_cache.clear()
+    location_cache.clear()
+
+
+def identity_cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit and miss counters for the company and location caches."""
+    return {'companies': company_cache.stats(), 'locations': location_cache.stats()}
+
+
+@contextmanager
+def identity_scope(label: Any) -> Iterator[None]:
+    """Scope the identity cache to one unit of work and log the queries it saved."""
+    reset_identity_cache()
+    company_cache.enabled = location_cache.enabled = True
+    try:
+        yield
+    finally:
+        company_cache.enabled = location_cache.enabled = False
+        stats = identity_cache_stats()
+        logger.info(
+            'Identity cache for %s: companies %d hits / %d misses, locations %d hits / %d misses',
+            label,
+            stats['companies']['hits'],
+            stats['companies']['misses'],
+            stats['locations']['hits'],
+            stats['locations']['misses'],
+        )
+        reset_identity_cache()
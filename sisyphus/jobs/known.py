@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from itertools import batched
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from sisyphus.core.stores import RedisStore
+
+logger = logging.getLogger(__name__)
+
+# Stored in every loaded set so that a user with no jobs still has a key
+_SENTINEL = ''
+
+_CHUNK_SIZE = 5000
+
+
+class KnownUrlFilter(RedisStore):
+    """Per-user Redis set of job URLs already stored in the database.
+
+    Sets are loaded lazily from ``Job.url`` the first time a user is checked
+    and expire after ``KNOWN_URL_TTL`` seconds so deleted jobs eventually drop
+    out. Redis errors are logged and treated as "not known", leaving the
+    database constraint to catch duplicates.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the filter is turned on in settings."""
+        return bool(settings.KNOWN_URL_FILTER)
+
+    def key(self, user_id: int) -> str:
+        """Return the Redis key holding a user's known URLs."""
+        return f'sisyphus:known-urls:{user_id}'
+
+    def rebuild(self, user_id: int) -> int:
+        """Reload a user's set from the database and return the number of URLs."""
+        from sisyphus.jobs.models import Job  # noqa: PLC0415
+
+        key = self.key(user_id)
+        loading = f'{key}:loading'
+        urls = Job.objects.filter(user_id=user_id).values_list('url', flat=True).iterator(chunk_size=_CHUNK_SIZE)
+        count = 0
+        pipe = self.connection.pipeline()
+        pipe.delete(loading)
+        pipe.sadd(loading, _SENTINEL)
+        for chunk in batched(urls, _CHUNK_SIZE):
+            pipe.sadd(loading, *chunk)
+            count += len(chunk)
+        pipe.expire(loading, settings.KNOWN_URL_TTL)
+        pipe.rename(loading, key)
+        pipe.execute()
+        return count
+
+    def _ensure_loaded(self, user_id: int) -> None:
+        if not self.connection.exists(self.key(user_id)):
+            count = self.rebuild(user_id)
+            logger.info('Loaded %d known URLs for user %s', count, user_id)
+
+    def contains(self, user_id: int, urls: list[str]) -> list[bool]:
+        """Return whether each URL is already known for the user."""
+        if not urls or not self.enabled:
+            return [False] * len(urls)
+        try:
+            self._ensure_loaded(user_id)
+            return [bool(hit) for hit in self.connection.smismember(self.key(user_id), urls)]
+        except RedisError:
+            logger.warning('Known URL filter unavailable, checking the database instead', exc_info=True)
+            return [False] * len(urls)
+
+    def add(self, user_id: int, urls: Iterable[str]) -> None:
+        """Record URLs as known if the user's set is already loaded."""
+        urls = list(urls)
+        if not urls or not self.enabled:
+            return
+        try:
+            # Only touch loaded sets; an unloaded set is built from the database anyway
+            key = self.key(user_id)
+            if self.connection.exists(key):
+                self.connection.sadd(key, *urls)
+        except RedisError:
+            logger.warning('Known URL filter unavailable, not recording URLs', exc_info=True)
+
+    def novelty(self, user_id: int, urls: list[str]) -> float:
+        """Return the fraction of URLs that are not yet known for the user."""
+        if not urls:
+            return 0.0
+        known = sum(self.contains(user_id, urls))
+        return (len(urls) - known) / len(urls)
+
+
+known_urls = KnownUrlFilter()
@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from sisyphus.jobs.cache import identity_scope
 from sisyphus.jobs.models import Job
 from sisyphus.searches.utils import NullableTag, remove_query
 
@@ -63,7 +64,11 @@ class Command(BaseCommand):
         return job
 
     def parse_similar_jobs(self, job: Job) -> list[dict]:
-        soup = BeautifulSoup(job.raw_html[len('NullableTag') + 1:-1], 'html.parser')
+        html = job.raw_html
+        # Older rows stored the page wrapped as NullableTag(...)
+        if html.startswith('NullableTag('):
+            html = html[len('NullableTag') + 1:-1]
+        soup = BeautifulSoup(html, 'html.parser')
         try:
             divs = [
                 li.find('div', {'class': 'base-main-card'})
@@ -87,7 +92,8 @@ class Command(BaseCommand):
         logger.info(f'Found {len(similar_jobs)} similar jobs.')
 
         if options['save']:
-            Job.objects.add_jobs(similar_jobs, None)
+            with identity_scope('parsesimilar'):
+                Job.objects.add_jobs(similar_jobs, None)
             for job in jobs:
                 job.similar_jobs_parsed = True
                 job.save(update_fields=['similar_jobs_parsed'])
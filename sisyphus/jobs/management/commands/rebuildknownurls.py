@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from sisyphus.jobs.known import known_urls
+from sisyphus.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Redis known URL filter from stored jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='UserProfile id (repeatable)')
+
+    def handle(self, *args, **options):
+        user_ids = options['users'] or Job.objects.values_list('user_id', flat=True).distinct().order_by()
+        for user_id in user_ids:
+            count = known_urls.rebuild(user_id)
+            self.stdout.write(f'User {user_id}: {count} URLs')
+        self.stdout.write(self.style.SUCCESS('Rebuilt known URL filter'))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_job_similar_jobs_parsed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='populate_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
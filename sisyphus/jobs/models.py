@@ -1,15 +1,19 @@
 import json
 import logging
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import dateparse, timezone
 from django.utils.translation import gettext_lazy as _
 
 from sisyphus.accounts.models import UserProfile
 from sisyphus.companies.models import Company
 from sisyphus.core.models import UUIDModel
+from sisyphus.jobs.cache import company_cache, company_key, location_cache, reset_identity_cache
+from sisyphus.jobs.known import known_urls
 
 import rq.job
 
@@ -20,6 +24,11 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def encode_raw(raw: Any) -> str:
+    """Return raw listing data as stored text, keeping JSON the parser already has as text."""
+    return raw if isinstance(raw, str) else json.dumps(raw)
+
+
 class Location(UUIDModel):
     """A geographic location for job listings."""
 
@@ -49,22 +58,44 @@ class JobManager(models.Manager):
             dt = timezone.make_aware(dt)
         return dt
     
+    def _search_user(self, search_run: 'SearchRun') -> UserProfile:
+        """Return the user a search run's jobs belong to."""
+        try:
+            return search_run.search.user
+        except AttributeError:
+            # TODO: this is a hack, fix later
+            return UserProfile.objects.first()
+
+    def _unknown(self, user: UserProfile, jobs: list[dict]) -> list[dict]:
+        """Drop listings whose URL is in the user's known URL filter.
+
+        Listings carrying a description are kept, as they update the stored job.
+        """
+        known = known_urls.contains(user.id, [job['url'] for job in jobs])
+        return [job for job, hit in zip(jobs, known, strict=True) if not hit or 'description' in job]
+
     def add_job(self, job: dict, search_run: 'SearchRun') -> bool:
         """Add parsed job to database."""
         try:
-            try:
-                user = search_run.search.user
-            except AttributeError:
-                # TODO: this is a hack, fix later
-                user = UserProfile.objects.first()
+            user = self._search_user(search_run)
 
-            company, _ = Company.objects.get_or_create(linkedin_url=job['company_url'], user=user, defaults={'name': job['company']})
+            if not self._unknown(user, [job]):
+                return False
+
+            key = company_key(user.id, job['company_url'])
+            company = company_cache.get(key)
+            if company is None:
+                company, _ = Company.objects.get_or_create(linkedin_url=job['company_url'], user=user, defaults={'name': job['company']})
+                company_cache.set(key, company)
             if company.is_banned:
                 return False
 
             location = None
             if job['location'] is not None:
-                location, _  = Location.objects.get_or_create(name=job['location'])
+                location = location_cache.get(job['location'])
+                if location is None:
+                    location, _  = Location.objects.get_or_create(name=job['location'])
+                    location_cache.set(job['location'], location)
 
             if 'flexibility' in job:
                 flexibility = job['flexibility']
@@ -98,17 +129,216 @@ class JobManager(models.Manager):
             if 'description' in job:
                 obj.description = job['description']
                 obj.easy_apply = False
-                obj.raw_html = json.dumps(job.get('raw_html', '{}'))
+                obj.raw_html = encode_raw(job.get('raw_html', '{}'))
                 obj.populated = True
                 obj.save(update_fields=['description', 'easy_apply', 'raw_html', 'populated'])
 
+            transaction.on_commit(lambda: known_urls.add(user.id, [obj.url]))
             return created
         except Exception as e:
             logger.exception('Error adding job: %s', e)
             return False
     
     def add_jobs(self, jobs: list[dict], search_run: 'SearchRun') -> int:
-        return sum(1 for job in jobs if self.add_job(job, search_run))
+        """Add a page of parsed jobs and return the number created."""
+        return self.ingest_jobs(jobs, search_run)['created']
+
+    def ingest_jobs(
+        self, jobs: list[dict], search_run: 'SearchRun', watermark: datetime | None = None
+    ) -> dict[str, int]:
+        """Add a page of parsed jobs using set-based queries.
+
+        Companies, locations and jobs are each resolved with one lookup and
+        inserted with one ``bulk_create`` inside a single transaction. Falls
+        back to ``add_job`` per listing if the bulk path fails.
+
+        Listings whose URL is already in the user's known URL filter are
+        dropped before any queries and counted as ``known`` and ``existing``,
+        unless they carry a description to store on the existing job.
+        ``fresh`` counts created jobs posted on or after watermark, since some
+        sources only give a posting date.
+        """
+        user = self._search_user(search_run)
+        unknown = self._unknown(user, jobs)
+
+        try:
+            with transaction.atomic():
+                counts = self._bulk_ingest(unknown, search_run, user, watermark)
+        except Exception as e:
+            logger.exception('Bulk ingestion failed, falling back to per-job ingestion: %s', e)
+            # Companies and locations cached by the bulk path may have been rolled back with it
+            reset_identity_cache()
+            created = sum(1 for job in unknown if self.add_job(job, search_run))
+            counts = {'created': created, 'existing': len(unknown) - created, 'skipped': 0, 'fresh': created}
+
+        counts['known'] = len(jobs) - len(unknown)
+        counts['existing'] += counts['known']
+        return counts
+
+    def _bulk_ingest(
+        self, jobs: list[dict], search_run: 'SearchRun', user: UserProfile, watermark: datetime | None
+    ) -> dict[str, int]:
+        """Resolve and insert companies, locations and jobs for one page."""
+        if not jobs:
+            return {'created': 0, 'existing': 0, 'skipped': 0, 'fresh': 0}
+
+        try:
+            default_flexibility = search_run.search.flexibility
+        except AttributeError:
+            default_flexibility = ''
+
+        try:
+            source = search_run.search.source
+        except AttributeError:
+            source = None
+
+        # First listing wins when a page repeats a URL, matching get_or_create order
+        listings: dict[str, dict] = {}
+        for job in jobs:
+            listings.setdefault(job['url'], job)
+
+        companies = self._resolve_companies(user, listings.values())
+        locations = self._resolve_locations(listings.values())
+
+        existing = {obj.url: obj for obj in self.filter(user=user, url__in=listings.keys()).only('id', 'url')}
+
+        new_jobs: list[Job] = []
+        populated_jobs: list[Job] = []
+        skipped = 0
+        for url, job in listings.items():
+            company = companies[job['company_url']]
+            if company.is_banned:
+                skipped += 1
+                continue
+
+            obj = existing.get(url)
+            if obj is None:
+                obj = self.model(
+                    url=url,
+                    user=user,
+                    company=company,
+                    title=job['title'],
+                    location=locations.get(job['location']),
+                    date_posted=self.parse_datetime(job['date_posted']),
+                    search_run=search_run,
+                    date_found=self.parse_datetime(job['date_found']),
+                    flexibility=job.get('flexibility', default_flexibility),
+                    source=source,
+                )
+                new_jobs.append(obj)
+
+            # HiringCafe parser
+            if 'description' in job:
+                obj.description = job['description']
+                obj.easy_apply = False
+                obj.raw_html = encode_raw(job.get('raw_html', '{}'))
+                obj.populated = True
+                if obj.pk is not None:
+                    populated_jobs.append(obj)
+
+        before = len(existing)
+        self.bulk_create(new_jobs, ignore_conflicts=True)
+        if populated_jobs:
+            self.bulk_update(populated_jobs, ['description', 'easy_apply', 'raw_html', 'populated'])
+        # ignore_conflicts hides rows lost to a concurrent insert; only rows this run inserted carry its search_run
+        urls = [obj.url for obj in new_jobs]
+        landed = set(self.filter(user=user, search_run=search_run, url__in=urls).values_list('url', flat=True))
+        created = [obj for obj in new_jobs if obj.url in landed]
+
+        stored = [*existing, *(obj.url for obj in new_jobs)]
+        transaction.on_commit(lambda: known_urls.add(user.id, stored))
+
+        fresh = sum(
+            1 for obj in created if watermark is None or obj.date_posted is None or obj.date_posted >= watermark
+        )
+
+        return {
+            'created': len(created),
+            'existing': before + len(new_jobs) - len(created),
+            'skipped': skipped,
+            'fresh': fresh,
+        }
+
+    def _resolve_companies(self, user: UserProfile, jobs: Iterable[dict]) -> dict[str | None, Company]:
+        """Return companies keyed by LinkedIn URL, creating any that are missing."""
+        names: dict[str | None, str] = {}
+        companies: dict[str | None, Company] = {}
+        for job in jobs:
+            url = job['company_url']
+            if url in names or url in companies:
+                continue
+            if (company := company_cache.get(company_key(user.id, url))) is not None:
+                companies[url] = company
+            else:
+                names[url] = job['company']
+        if not names:
+            return companies
+
+        def lookup() -> dict[str | None, Company]:
+            found: dict[str | None, Company] = {}
+            urls = [url for url in names if url is not None]
+            query = models.Q(linkedin_url__in=urls)
+            if None in names:
+                query |= models.Q(linkedin_url__isnull=True)
+            for company in Company.objects.filter(query, user=user).order_by('created_at'):
+                found.setdefault(company.linkedin_url, company)
+            return found
+
+        found = lookup()
+        missing = [Company(linkedin_url=url, user=user, name=name) for url, name in names.items() if url not in found]
+        if missing:
+            Company.objects.bulk_create(missing, ignore_conflicts=True)
+            found = lookup()
+
+        for url, company in found.items():
+            company_cache.set(company_key(user.id, url), company)
+        return companies | found
+
+    def _resolve_locations(self, jobs: Iterable[dict]) -> dict[str, Location]:
+        """Return locations keyed by name, creating any that are missing."""
+        names: set[str] = set()
+        locations: dict[str, Location] = {}
+        for job in jobs:
+            name = job['location']
+            if name is None or name in names or name in locations:
+                continue
+            if (location := location_cache.get(name)) is not None:
+                locations[name] = location
+            else:
+                names.add(name)
+        if not names:
+            return locations
+
+        found = {location.name: location for location in Location.objects.filter(name__in=names)}
+        missing = [Location(name=name) for name in names if name not in found]
+        if missing:
+            Location.objects.bulk_create(missing, ignore_conflicts=True)
+            found = {location.name: location for location in Location.objects.filter(name__in=names)}
+
+        for name, location in found.items():
+            location_cache.set(name, location)
+        return locations | found
+
+    def claim_unpopulated(self, job_ids: Iterable[int]) -> list['Job']:
+        """Reserve the new, unpopulated jobs among job_ids for one populate batch and return them.
+
+        Jobs another batch claimed less than POPULATE_CLAIM_TTL seconds ago are left out.
+        """
+        now = timezone.now()
+        stale = now - timedelta(seconds=settings.POPULATE_CLAIM_TTL)
+        with transaction.atomic():
+            ids = list(
+                self.select_for_update(skip_locked=True)
+                .filter(id__in=job_ids, populated=False, status=self.model.Status.NEW)
+                .filter(models.Q(populate_claimed_at__isnull=True) | models.Q(populate_claimed_at__lt=stale))
+                .values_list('id', flat=True)
+            )
+            self.filter(id__in=ids).update(populate_claimed_at=now)
+        return list(self.select_related('source').filter(id__in=ids))
+
+    def release_claims(self, jobs: Iterable['Job']) -> None:
+        """Let other populate batches claim jobs again."""
+        self.filter(id__in=[job.id for job in jobs]).update(populate_claimed_at=None)
 
 
 class Job(UUIDModel):
@@ -145,6 +375,7 @@ class Job(UUIDModel):
     search_run = models.ForeignKey('searches.SearchRun', related_name='jobs', on_delete=models.SET_NULL, null=True, blank=True)
     date_found = models.DateTimeField(null=True, blank=True)
     populated = models.BooleanField(default=False)
+    populate_claimed_at = models.DateTimeField(null=True, blank=True)
 
     flexibility = models.CharField(max_length=6, choices=Flexibility.choices, default='', blank=True)
 
@@ -210,7 +441,7 @@ class Job(UUIDModel):
                 except Exception:  # noqa: BLE001
                     pass
 
-            queue = django_rq.get_queue()
+            queue = django_rq.get_queue('score')
             result = queue.enqueue(
                 calculate_job_score,
                 self.id,
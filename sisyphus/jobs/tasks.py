@@ -17,7 +17,7 @@ def parse_json_response(response: str) -> dict[str, Any]:
     return json.loads(text)  # type: ignore[no-any-return]
 
 
-@django_rq.job
+@django_rq.job('maintenance')
 def ban_jobs_with_banned_company() -> int:
     """Ban all jobs whose company is banned but whose status is not banned."""
     from sisyphus.jobs.models import Job  # noqa: PLC0415
@@ -30,7 +30,7 @@ def ban_jobs_with_banned_company() -> int:
     return count
 
 
-@django_rq.job
+@django_rq.job('score')
 def calculate_job_score(job_id: int, resume_id: int) -> dict[str, Any]:
     """Calculate a fit score between a job and a resume using OpenAI."""
     from sisyphus.core.services import get_openai  # noqa: PLC0415
@@ -98,18 +98,15 @@ Resume:
         return result
 
 
-@django_rq.job
+@django_rq.job('populate')
 def populate_unpopulated_jobs():
     from sisyphus.jobs.models import Job  # noqa: PLC0415
-    from sisyphus.searches.tasks import populate_job  # noqa: PLC0415
+    from sisyphus.searches.tasks import enqueue_populate_batches  # noqa: PLC0415
 
-    queue = django_rq.get_queue()
     job_ids = list(
         Job.objects.filter(status__in=[Job.Status.NEW, Job.Status.SAVED], populated=False)
         .values_list('id', flat=True)
     )
-
-    for job_id in job_ids:
-        queue.enqueue(populate_job, job_id)
+    enqueue_populate_batches(job_ids)
 
     return {'enqueued': len(job_ids)}
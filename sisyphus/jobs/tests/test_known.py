@@ -0,0 +1,41 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from sisyphus.jobs.known import KnownUrlFilter, known_urls
+from sisyphus.jobs.models import Job
+
+
+class TestKnownUrlFilter:
+    """Tests for the Redis-backed known URL filter."""
+
+    def test_loads_lazily_from_database(self, job, fake_redis):
+        assert not fake_redis.exists(known_urls.key(job.user_id))
+        assert known_urls.contains(job.user_id, [job.url, 'https://test.com/jobs/new']) == [True, False]
+        assert fake_redis.ttl(known_urls.key(job.user_id)) > 0
+
+    def test_add_only_updates_loaded_sets(self, user_profile, fake_redis):
+        known_urls.add(user_profile.id, ['https://x.com/j/1'])
+        assert not fake_redis.exists(known_urls.key(user_profile.id))
+
+        known_urls.contains(user_profile.id, ['https://x.com/j/1'])
+        known_urls.add(user_profile.id, ['https://x.com/j/1'])
+        assert known_urls.contains(user_profile.id, ['https://x.com/j/1']) == [True]
+
+    def test_rebuild_drops_deleted_jobs(self, job):
+        known_urls.contains(job.user_id, [job.url])
+        Job.objects.filter(id=job.id).delete()
+        assert known_urls.rebuild(job.user_id) == 0
+        assert known_urls.contains(job.user_id, [job.url]) == [False]
+
+    def test_novelty(self, job):
+        assert known_urls.novelty(job.user_id, [job.url, 'https://test.com/jobs/new']) == 0.5
+
+    def test_disabled(self, job, settings):
+        settings.KNOWN_URL_FILTER = False
+        assert known_urls.contains(job.user_id, [job.url]) == [False]
+
+    def test_redis_errors_treated_as_unknown(self, job):
+        class BrokenRedis:
+            def exists(self, key):
+                raise RedisConnectionError
+
+        assert KnownUrlFilter(BrokenRedis()).contains(job.user_id, [job.url]) == [False]
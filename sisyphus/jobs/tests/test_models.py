@@ -1,6 +1,10 @@
 import pytest
+from django.db import DatabaseError
 
+from sisyphus.companies.models import Company
+from sisyphus.jobs.cache import company_cache, identity_scope, location_cache
 from sisyphus.jobs.models import Job, JobEvent, JobNote, Location
+from sisyphus.searches.models import Search, SearchRun, Source
 
 
 class TestLocation:
@@ -62,3 +66,121 @@ class TestJobNote:
     def test_str(self, job):
         note = JobNote.objects.create(job=job, text='A note')
         assert str(note) == 'Software Engineer | A note'
+
+
+class TestJobManager:
+    """Tests for bulk job ingestion."""
+
+    def listing(self, url, company_url='https://linkedin.com/company/acme', location='Remote', **kwargs):
+        return {
+            'company': 'Acme',
+            'company_url': company_url,
+            'title': 'Engineer',
+            'url': url,
+            'location': location,
+            'date_posted': '2026-01-01T00:00:00',
+            'date_found': '2026-01-02T00:00:00',
+            **kwargs,
+        }
+
+    def test_ingest_creates_jobs_companies_and_locations(self, user_profile):
+        jobs = [self.listing('https://x.com/j/1'), self.listing('https://x.com/j/2', location=None)]
+        counts = Job.objects.ingest_jobs(jobs, None)
+        assert counts == {'created': 2, 'existing': 0, 'skipped': 0, 'fresh': 2, 'known': 0}
+        assert Job.objects.filter(user=user_profile).count() == 2
+        assert Location.objects.filter(name='Remote').count() == 1
+        assert Job.objects.get(url='https://x.com/j/2').location is None
+
+    def test_ingest_counts_existing_jobs(self, user_profile):
+        Job.objects.ingest_jobs([self.listing('https://x.com/j/1')], None)
+        counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1'), self.listing('https://x.com/j/2')], None)
+        assert counts == {'created': 1, 'existing': 1, 'skipped': 0, 'fresh': 1, 'known': 0}
+
+    def test_ingest_dedupes_urls_within_page(self, user_profile):
+        counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1'), self.listing('https://x.com/j/1')], None)
+        assert counts['created'] == 1
+
+    def test_ingest_skips_banned_company(self, company):
+        company.linkedin_url = 'https://linkedin.com/company/banned'
+        company.save()
+        company.ban()
+        counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1', company_url=company.linkedin_url)], None)
+        assert counts == {'created': 0, 'existing': 0, 'skipped': 1, 'fresh': 0, 'known': 0}
+
+    def test_ingest_drops_known_urls(self, user_profile, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            Job.objects.ingest_jobs([self.listing('https://x.com/j/1')], None)
+        counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1'), self.listing('https://x.com/j/2')], None)
+        assert counts == {'created': 1, 'existing': 1, 'skipped': 0, 'fresh': 1, 'known': 1}
+
+    def test_ingest_populates_description(self, user_profile):
+        Job.objects.ingest_jobs([self.listing('https://x.com/j/1')], None)
+        Job.objects.ingest_jobs([self.listing('https://x.com/j/1', description='Details', raw_html={'id': 1})], None)
+        job = Job.objects.get(url='https://x.com/j/1')
+        assert job.populated
+        assert job.description == 'Details'
+        assert job.raw_html == '{"id": 1}'
+
+    def test_ingest_populates_description_of_known_url(self, user_profile, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            Job.objects.ingest_jobs([self.listing('https://x.com/j/1')], None)
+        counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1', description='Details')], None)
+        assert counts == {'created': 0, 'existing': 1, 'skipped': 0, 'fresh': 0, 'known': 0}
+        assert Job.objects.get(url='https://x.com/j/1').description == 'Details'
+
+    def test_ingest_keeps_raw_json_text(self, user_profile):
+        Job.objects.ingest_jobs([self.listing('https://x.com/j/1', description='Details', raw_html='{"id":1}')], None)
+        assert Job.objects.get(url='https://x.com/j/1').raw_html == '{"id":1}'
+
+    def test_ingest_counts_fresh_jobs_after_watermark(self, user_profile):
+        watermark = Job.objects.parse_datetime('2026-01-01T00:00:00')
+        jobs = [
+            self.listing('https://x.com/j/1', date_posted='2025-12-31T00:00:00'),
+            self.listing('https://x.com/j/2'),
+            self.listing('https://x.com/j/3', date_posted='2026-02-01T00:00:00'),
+        ]
+        counts = Job.objects.ingest_jobs(jobs, None, watermark=watermark)
+        assert counts['created'] == 3
+        assert counts['fresh'] == 2
+
+    def test_add_jobs_returns_created_count(self, user_profile):
+        assert Job.objects.add_jobs([self.listing('https://x.com/j/1')], None) == 1
+
+    def test_ingest_reuses_identity_cache(self, user_profile):
+        with identity_scope('test'):
+            Job.objects.ingest_jobs([self.listing('https://x.com/j/1')], None)
+            Job.objects.ingest_jobs([self.listing('https://x.com/j/2')], None)
+            assert company_cache.hits == 1
+            assert location_cache.hits == 1
+
+    def test_failed_bulk_ingest_drops_cached_rows(self, user_profile, monkeypatch):
+        def fail(*args, **kwargs):
+            raise DatabaseError('bulk insert failed')
+
+        with identity_scope('test'):
+            monkeypatch.setattr(type(Job.objects), 'bulk_create', fail)
+            counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1', location='Berlin')], None)
+        assert counts['created'] == 1
+        job = Job.objects.get(url='https://x.com/j/1')
+        assert Location.objects.filter(id=job.location_id, name='Berlin').exists()
+
+    def test_ingest_does_not_count_concurrent_inserts(self, user_profile, company, monkeypatch):
+        source = Source.objects.get(parser='linkedin')
+        run = SearchRun.objects.create(search=Search.objects.create(user=user_profile, keywords='python', source=source))
+        bulk_create = type(Job.objects).bulk_create
+
+        def race(manager, objs, **kwargs):
+            # Another worker inserts the same URL between the existing lookup and the insert
+            Job.objects.create(url='https://x.com/j/1', user=user_profile, company=company, title='Engineer')
+            return bulk_create(manager, objs, **kwargs)
+
+        monkeypatch.setattr(type(Job.objects), 'bulk_create', race)
+        counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/1'), self.listing('https://x.com/j/2')], run)
+        assert counts == {'created': 1, 'existing': 1, 'skipped': 0, 'fresh': 1, 'known': 0}
+
+    def test_ban_invalidates_identity_cache(self, user_profile):
+        with identity_scope('test'):
+            Job.objects.ingest_jobs([self.listing('https://x.com/j/1')], None)
+            Company.objects.get(linkedin_url='https://linkedin.com/company/acme').ban()
+            counts = Job.objects.ingest_jobs([self.listing('https://x.com/j/2')], None)
+            assert counts['skipped'] == 1
@@ -3,7 +3,7 @@ from typing import Any
 import django_rq
 
 
-@django_rq.job
+@django_rq.job('maintenance')
 def apply_all_rules(user_id: int, populated: bool = False) -> dict[str, Any]:
     """Apply all active rules for a user to eligible jobs."""
     from sisyphus.accounts.models import UserProfile  # noqa: PLC0415
@@ -32,7 +32,7 @@ def apply_all_rules(user_id: int, populated: bool = False) -> dict[str, Any]:
     return {'matched_count': matched_count}
 
 
-@django_rq.job
+@django_rq.job('maintenance')
 def apply_rule_to_existing_jobs(rule_id: int) -> dict[str, Any]:
     """Apply a single rule to all eligible jobs."""
     from sisyphus.jobs.models import Job  # noqa: PLC0415
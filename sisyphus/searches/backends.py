@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from bs4 import BeautifulSoup, ElementFilter, SoupStrainer
+from django.conf import settings
+
+from sisyphus.searches.utils import NullableTag
+
+if TYPE_CHECKING:
+    from selectolax.lexbor import LexborNode
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# A tag name and attributes, as passed to find(), naming a subtree a parser reads
+Target = tuple[str, dict[str, str]]
+
+
+def to_selector(name: str | None = None, attrs: dict[str, str] | None = None, **kwargs: str) -> str:
+    """Translate BeautifulSoup ``find`` arguments into a CSS selector.
+
+    Only the forms the parsers use are supported: a tag name plus string
+    attribute values, where ``class`` matches each listed class.
+    """
+    attrs = {**(attrs or {}), **{key.rstrip('_'): value for key, value in kwargs.items()}}
+    selector = name or ''
+    for key, value in attrs.items():
+        if not isinstance(value, str):
+            raise TypeError(f'Unsupported value for {key!r}: {value!r}')
+        if key == 'class':
+            selector += ''.join(f'.{name}' for name in value.split())
+        else:
+            selector += f'[{key}="{value}"]'
+    return selector or '*'
+
+
+class Fragments(ElementFilter):
+    """Build only the subtrees rooted at elements matching any of several targets."""
+
+    def __init__(self, targets: list[Target]) -> None:
+        super().__init__()
+        self.strainers = [SoupStrainer(name, attrs) for name, attrs in targets]
+
+    def allow_tag_creation(self, nsprefix: str | None, name: str, attrs: Any) -> bool:
+        # Raw attributes are unsplit here, so match class against each of its values as find() does
+        if attrs and isinstance(attrs.get('class'), str):
+            attrs = {**attrs, 'class': attrs['class'].split()}
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+class SelectolaxTag:
+    """The subset of the bs4 Tag interface NullableTag needs, over a selectolax node."""
+
+    def __init__(self, node: LexborNode) -> None:
+        self.node = node
+
+    def _descendants(self, selector: str) -> list[LexborNode]:
+        # CSS matching includes the node itself, bs4 only searches below it
+        return [node for node in self.node.css(selector) if node.mem_id != self.node.mem_id]
+
+    def find(self, *args: Any, **kwargs: Any) -> SelectolaxTag | None:
+        selector = to_selector(*args, **kwargs)
+        node = self.node.css_first(selector)
+        if node is not None and node.mem_id == self.node.mem_id:
+            node = next(iter(self._descendants(selector)), None)
+        return SelectolaxTag(node) if node is not None else None
+
+    def find_all(self, *args: Any, **kwargs: Any) -> list[SelectolaxTag]:
+        return [SelectolaxTag(node) for node in self._descendants(to_selector(*args, **kwargs))]
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def decode_contents(self) -> str:
+        return self.node.inner_html or ''
+
+    @property
+    def string(self) -> str | None:
+        node = self.node
+        while node.child is not None and node.child.next is None:
+            node = node.child
+            if node.is_text_node:
+                return node.text_content
+        return None
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        return self.node.attributes.get(key, default)
+
+    def __getitem__(self, key: str) -> str | None:
+        return self.node.attributes[key]
+
+    def __repr__(self) -> str:
+        return self.node.html or ''
+
+
+def parse_html(html: str, backend: str | None = None, only: list[Target] | None = None) -> NullableTag:
+    """Parse html with the configured backend and return its ``<html>`` element.
+
+    With ``only``, bs4 backends keep just the matching subtrees and return
+    the document holding them. lexbor trees live outside the Python heap, so
+    selectolax always parses the whole page.
+    """
+    backend = backend or settings.HTML_PARSER_BACKEND
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser  # noqa: PLC0415
+
+        root = LexborHTMLParser(html).root
+        return NullableTag(SelectolaxTag(root) if root is not None else None)
+    if backend in ('html.parser', 'lxml'):
+        if only:
+            return NullableTag(BeautifulSoup(html, backend, parse_only=Fragments(only)))
+        return NullableTag(BeautifulSoup(html, backend).html)
+    raise ValueError(f'Unknown HTML parser backend {backend!r}, expected one of {PARSER_BACKENDS}')
@@ -0,0 +1,107 @@
+import logging
+from collections import Counter
+from typing import Any
+
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+# URL patterns for resource types that can be recognised from the URL alone,
+# so Chromium blocks them without asking Python
+RESOURCE_TYPE_PATTERNS = {
+    'image': ('*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*'),
+    'font': ('*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'),
+    'stylesheet': ('*.css*',),
+    'media': ('*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*.ogg*'),
+}
+
+# Rough transfer size of one response of each type, used to estimate bytes saved
+TYPICAL_BYTES = {
+    'image': 20_000,
+    'font': 30_000,
+    'stylesheet': 15_000,
+    'media': 250_000,
+    'script': 25_000,
+    'ping': 500,
+}
+
+
+class BlockProfile:
+    """Requests a parser never needs, blocked by resource type, host or URL pattern.
+
+    Patterns use Chromium's ``*`` wildcard syntax and are handed to the browser
+    once per context. Only resource types in ``RESOURCE_TYPE_PATTERNS`` can be
+    blocked this way; requests of other types, such as pings, must be matched
+    by host or URL pattern.
+    """
+
+    def __init__(
+        self,
+        resource_types: frozenset[str] | set[str] = frozenset(),
+        url_patterns: tuple[str, ...] | list[str] = (),
+        hosts: tuple[str, ...] | list[str] = (),
+    ) -> None:
+        self.resource_types = frozenset(resource_types)
+        self.url_patterns = tuple(url_patterns)
+        self.hosts = tuple(hosts)
+
+    def with_hosts(self, hosts: list[str]) -> BlockProfile:
+        """Return a copy of this profile that also blocks every request to hosts."""
+        return BlockProfile(self.resource_types, self.url_patterns, (*self.hosts, *hosts))
+
+    def patterns(self) -> list[str]:
+        """Return the URL patterns to install with ``Network.setBlockedURLs``."""
+        patterns = [f'*://{host}/*' for host in self.hosts]
+        for resource_type in sorted(self.resource_types):
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, ()))
+        patterns.extend(self.url_patterns)
+        return list(dict.fromkeys(patterns))
+
+    def blocks(self, resource_type: str) -> bool:
+        return resource_type in self.resource_types
+
+
+class BlockStats:
+    """Counts of blocked and allowed requests across every context of a scraper."""
+
+    def __init__(self) -> None:
+        self.blocked: Counter[str] = Counter()
+        self.allowed = 0
+        self.allowed_bytes = 0
+
+    def on_loading_failed(self, event: dict[str, Any]) -> None:
+        if event.get('blockedReason') or event.get('errorText') == 'net::ERR_BLOCKED_BY_CLIENT':
+            self.blocked[event.get('type', 'Other').lower()] += 1
+
+    def on_loading_finished(self, event: dict[str, Any]) -> None:
+        self.allowed += 1
+        self.allowed_bytes += int(event.get('encodedDataLength', 0))
+
+    @property
+    def bytes_saved(self) -> int:
+        """Estimated bytes not downloaded, from typical sizes per resource type."""
+        return sum(TYPICAL_BYTES.get(resource_type, 0) * count for resource_type, count in self.blocked.items())
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'blocked': sum(self.blocked.values()),
+            'blocked_by_type': dict(self.blocked),
+            'allowed': self.allowed,
+            'allowed_bytes': self.allowed_bytes,
+            'bytes_saved': self.bytes_saved,
+        }
+
+
+async def install(page: Page, profile: BlockProfile, stats: BlockStats | None = None) -> None:
+    """Block a profile's URL patterns on a page, reporting its requests to stats if given.
+
+    This runs once per pooled context; matching requests then fail inside
+    Chromium without a round trip through Python. Counting requests takes
+    a Python callback per request, so stats are only for measuring.
+    """
+    session = await page.context.new_cdp_session(page)
+    await session.send('Network.enable')
+    await session.send('Network.setBlockedURLs', {'urls': profile.patterns()})
+    if stats is not None:
+        session.on('Network.loadingFailed', stats.on_loading_failed)
+        session.on('Network.loadingFinished', stats.on_loading_finished)
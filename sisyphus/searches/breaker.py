@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from sisyphus.core.stores import RedisStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle host's breaker state is kept
+_STATE_TTL = 86400
+
+# KEYS: state, recent failures, half-open probe
+# ARGV: now, cooldown
+# Closes the circuit unless it opened less than cooldown seconds ago; returns whether it closed.
+_SUCCESS = """
+local opened = tonumber(redis.call('HGET', KEYS[1], 'opened_at'))
+if opened and tonumber(ARGV[1]) - opened < tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+return 1
+"""
+
+# KEYS: state, recent failures, half-open probe
+# ARGV: now, cooldown, threshold, window
+# Counts a failure, opening the circuit at threshold failures within window seconds
+# or reopening it when a half-open probe fails; returns whether it opened.
+_FAILURE = """
+local now, cooldown = tonumber(ARGV[1]), tonumber(ARGV[2])
+local opened = tonumber(redis.call('HGET', KEYS[1], 'opened_at'))
+if opened then
+    if now - opened < cooldown then
+        return 0
+    end
+else
+    local failures = redis.call('INCR', KEYS[2])
+    if failures == 1 then
+        redis.call('EXPIRE', KEYS[2], ARGV[4])
+    end
+    if failures < tonumber(ARGV[3]) then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], 'opened_at', now)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('DEL', KEYS[2], KEYS[3])
+return 1
+"""
+
+
+class CircuitBreaker(RedisStore):
+    """Per-host circuit breaker kept in Redis, shared by every worker.
+
+    A host's circuit starts closed. ``SCRAPER_BREAKER_THRESHOLD`` failures
+    within ``SCRAPER_BREAKER_WINDOW`` seconds open it, and requests to the
+    host are refused for ``SCRAPER_BREAKER_COOLDOWN`` seconds. After that it
+    is half-open: one probe request is let through, whose success closes the
+    circuit and whose failure opens it for another cooldown. Redis errors
+    leave every circuit closed.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, connection: Any = None) -> None:
+        super().__init__(connection)
+        self._scripts: dict[str, Any] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the breaker is turned on in settings."""
+        return settings.SCRAPER_BREAKER_THRESHOLD > 0
+
+    def keys(self, host: str) -> list[str]:
+        return [f'sisyphus:breaker:{host}', f'sisyphus:breaker:{host}:failures', f'sisyphus:breaker:{host}:probe']
+
+    def _script(self, source: str) -> Any:
+        script = self._scripts.get(source)
+        if script is None or script.registered_client is not self.connection:
+            script = self._scripts[source] = self.connection.register_script(source)
+        return script
+
+    def _opened_at(self, host: str) -> float | None:
+        opened = self.connection.hget(self.keys(host)[0], 'opened_at')
+        return None if opened is None else float(opened)
+
+    def state(self, host: str | None) -> str:
+        """Return whether host's circuit is closed, open or half-open."""
+        if not self.enabled or not host:
+            return self.CLOSED
+        try:
+            opened = self._opened_at(host)
+        except RedisError:
+            logger.warning('Circuit breaker unavailable for %s', host, exc_info=True)
+            return self.CLOSED
+        if opened is None:
+            return self.CLOSED
+        if time.time() - opened < settings.SCRAPER_BREAKER_COOLDOWN:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def retry_after(self, host: str | None) -> float:
+        """Return the seconds until host's circuit lets a probe through."""
+        if not self.enabled or not host:
+            return 0.0
+        try:
+            opened = self._opened_at(host)
+        except RedisError:
+            return 0.0
+        if opened is None:
+            return 0.0
+        return max(0.0, opened + settings.SCRAPER_BREAKER_COOLDOWN - time.time())
+
+    def allow(self, host: str | None) -> bool:
+        """Return whether a request to host may go ahead, taking the probe if the circuit is half-open."""
+        state = self.state(host)
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        try:
+            return bool(self.connection.set(self.keys(host)[2], '1', nx=True, ex=settings.SCRAPER_BREAKER_COOLDOWN))
+        except RedisError:
+            return True
+
+    def record_success(self, host: str | None) -> None:
+        """Close host's circuit after a good response."""
+        if not self.enabled or not host:
+            return
+        try:
+            if self._script(_SUCCESS)(keys=self.keys(host), args=[time.time(), settings.SCRAPER_BREAKER_COOLDOWN]):
+                logger.debug('Circuit for %s closed', host)
+        except RedisError:
+            logger.warning('Could not record success for %s', host, exc_info=True)
+
+    def record_failure(self, host: str | None) -> None:
+        """Count a failed or blocked request to host, opening its circuit at the threshold."""
+        if not self.enabled or not host:
+            return
+        args = [
+            time.time(),
+            settings.SCRAPER_BREAKER_COOLDOWN,
+            settings.SCRAPER_BREAKER_THRESHOLD,
+            settings.SCRAPER_BREAKER_WINDOW,
+            _STATE_TTL,
+        ]
+        try:
+            if self._script(_FAILURE)(keys=self.keys(host), args=args):
+                logger.warning('Circuit for %s opened for %ds', host, settings.SCRAPER_BREAKER_COOLDOWN)
+        except RedisError:
+            logger.warning('Could not record failure for %s', host, exc_info=True)
+
+
+breaker = CircuitBreaker()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from django.conf import settings
+
+from sisyphus.searches.playwright import Extracted, RawResponse, endpoint_of
+
+if TYPE_CHECKING:
+    from sisyphus.searches.playwright import PageResult
+
+try:
+    from compression import zstd as codec
+
+    SUFFIX = '.zst'
+except ImportError:  # Python < 3.14 has no zstd in the standard library
+    import zlib as codec
+
+    SUFFIX = '.zz'
+
+logger = logging.getLogger(__name__)
+
+OFF = 'off'
+CACHE = 'cache'
+RECORD = 'record'
+REPLAY = 'replay'
+MODES = (OFF, CACHE, RECORD, REPLAY)
+
+# Query parameters that only track the visitor and never change the response
+_TRACKING_PARAMS = frozenset({'trk', 'trackingId', 'refId', 'position', 'pageNum'})
+
+# Fraction of max size the cache is pruned down to, so eviction does not run on every write
+_PRUNE_TO = 0.9
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode for a request that was never recorded."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        super().__init__(f'No recorded response for {url}')
+
+
+def canonical_url(url: str) -> str:
+    """Return url with a lowercase scheme and host, sorted query and no fragment or tracking parameters."""
+    parsed = urlparse(url)
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key not in _TRACKING_PARAMS and not key.startswith('utm_')
+    )
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', '', urlencode(query), ''))
+
+
+def fingerprint(url: str, kind: str) -> str:
+    """Return the content address of a request: its canonical URL and what kind of result it asked for."""
+    return hashlib.sha256(f'GET {canonical_url(url)} {kind}'.encode()).hexdigest()
+
+
+def encode(result: PageResult) -> tuple[dict, bytes]:
+    """Split a fetch result into a JSON header and its body."""
+    if isinstance(result, RawResponse):
+        return {'type': 'raw', 'content_type': result.content_type, 'status': result.status}, result.content
+    if isinstance(result, Extracted):
+        return {'type': 'extracted'}, json.dumps({'records': result.records, 'html': result.html}).encode()
+    return {'type': 'html'}, result.encode()
+
+
+def decode(header: dict, body: bytes) -> PageResult:
+    """Rebuild the fetch result that ``encode`` split up."""
+    if header['type'] == 'raw':
+        return RawResponse(body, header['content_type'], header['status'])
+    if header['type'] == 'extracted':
+        data = json.loads(body)
+        return Extracted(data['records'], data['html'])
+    return body.decode()
+
+
+class ResponseCache:
+    """On-disk cache of fetch results, addressed by canonical URL and request kind.
+
+    ``SCRAPER_CACHE_MODE`` selects how fetches use it:
+
+    - ``cache``: serve results younger than their endpoint's TTL, from
+      ``SCRAPER_CACHE_TTLS`` or ``SCRAPER_CACHE_TTL``, and store new ones
+      for endpoints with a TTL
+    - ``record``: always fetch, and store every result
+    - ``replay``: serve stored results whatever their age and raise
+      CacheMiss for anything else, so pipelines run offline
+    - ``off``: neither read nor write
+
+    Entries are compressed files under ``SCRAPER_CACHE_DIR``. Once they take
+    more than ``SCRAPER_CACHE_MAX_MB``, the least recently used are deleted.
+    Only successful results are stored, and I/O errors count as misses.
+    """
+
+    def __init__(self, directory: str | Path | None = None, mode: str | None = None) -> None:
+        self._directory = directory
+        self._mode = mode
+        self._size: int | None = None
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.SCRAPER_CACHE_DIR if self._directory is None else self._directory)
+
+    @property
+    def mode(self) -> str:
+        return settings.SCRAPER_CACHE_MODE if self._mode is None else self._mode
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether fetches read or write the cache."""
+        return self.mode != OFF
+
+    def ttl(self, url: str) -> int:
+        """Return the seconds url's results stay fresh, from its endpoint's entry in SCRAPER_CACHE_TTLS."""
+        return int(settings.SCRAPER_CACHE_TTLS.get(endpoint_of(url), settings.SCRAPER_CACHE_TTL))
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}{SUFFIX}'
+
+    def get(self, url: str, kind: str) -> PageResult:
+        """Return the stored result for a request, or None if there is no usable one.
+
+        In replay mode a missing entry raises CacheMiss instead.
+        """
+        if self.mode not in (CACHE, REPLAY):
+            return None
+        path = self.path(fingerprint(url, kind))
+        try:
+            header, _, body = codec.decompress(path.read_bytes()).partition(b'\n')
+            header = json.loads(header)
+        except FileNotFoundError:
+            if self.mode == REPLAY:
+                raise CacheMiss(url) from None
+            return None
+        except Exception:
+            logger.warning('Unreadable cache entry %s for %s', path.name, url, exc_info=True)
+            if self.mode == REPLAY:
+                raise CacheMiss(url) from None
+            return None
+        if self.mode == CACHE and time.time() - header['stored_at'] >= self.ttl(url):
+            return None
+        try:
+            # Reading counts as use for the LRU order
+            os.utime(path)
+        except OSError:
+            pass
+        return decode(header, body)
+
+    def put(self, url: str, kind: str, result: PageResult) -> None:
+        """Store a successful result, if the mode and url's TTL call for it."""
+        if result is None or not (self.mode == RECORD or (self.mode == CACHE and self.ttl(url) > 0)):
+            return
+        header, body = encode(result)
+        header.update(url=url, kind=kind, stored_at=time.time())
+        data = codec.compress(json.dumps(header).encode() + b'\n' + body)
+        path = self.path(fingerprint(url, kind))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half an entry
+            partial = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            partial.write_bytes(data)
+            partial.replace(path)
+        except OSError:
+            logger.warning('Could not cache %s', url, exc_info=True)
+            return
+        self._size = (self.size() if self._size is None else self._size) + len(data)
+        if self._size > settings.SCRAPER_CACHE_MAX_MB * 1024 * 1024:
+            self.prune()
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """Return the last use, size and path of each stored entry, least recently used first."""
+        entries = []
+        for path in self.directory.glob(f'*/*{SUFFIX}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def size(self) -> int:
+        """Return the bytes taken by stored entries."""
+        return sum(size for _, size, _ in self.entries())
+
+    def prune(self, max_bytes: int | None = None) -> int:
+        """Delete the least recently used entries until they fit in max_bytes, returning how many were deleted."""
+        limit = settings.SCRAPER_CACHE_MAX_MB * 1024 * 1024 * _PRUNE_TO if max_bytes is None else max_bytes
+        paths = self.entries()
+        total = sum(size for _, size, _ in paths)
+        deleted = 0
+        for _, size, path in paths:
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        self._size = total
+        if deleted:
+            logger.info('Evicted %d cached responses, %d KB left', deleted, total // 1024)
+        return deleted
+
+    def clear(self) -> int:
+        """Delete every stored entry and return how many there were."""
+        return self.prune(0)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from sisyphus.core.stores import RedisStore
+
+if TYPE_CHECKING:
+    from sisyphus.searches.models import Search
+    from sisyphus.searches.parsers.base import BaseParser
+
+logger = logging.getLogger(__name__)
+
+# Hash field marking that the stored pages run to the end of the results
+_END = 'end'
+
+
+class SharedResults(RedisStore):
+    """Parsed result pages of canonical queries, shared between searches in Redis.
+
+    Searches that would load the same result pages, whoever owns them, map
+    to one key. The first run of a query stores each page as it is parsed;
+    equivalent runs within ``SEARCH_FANIN_TTL`` seconds replay the stored
+    pages and only load pages past the last one stored. A lock makes
+    equivalent runs take turns, so each page is loaded once however many
+    searches subscribe to the query. The lock expires
+    ``SEARCH_FANIN_LOCK_TIMEOUT`` seconds after the last page its run
+    handled, so a long run keeps it while a crashed one soon lets go.
+    Redis errors fall back to loading every page directly.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether sharing is turned on in settings."""
+        return settings.SEARCH_FANIN_TTL > 0
+
+    def key(self, parser: BaseParser, search: Search, period: int | None) -> str:
+        """Return the Redis key shared by searches that load the same result pages.
+
+        The first page URL carries every parameter the query depends on;
+        keywords are compared ignoring case and extra whitespace.
+        """
+        canonical = copy.copy(search)
+        canonical.keywords = ' '.join(search.keywords.lower().split())
+        url = parser.get_page_url(canonical, 1, period)
+        return f'sisyphus:fanin:{parser.name}:{hashlib.sha1(url.encode()).hexdigest()}'
+
+    def load(self, key: str) -> tuple[dict[int, list[dict]], bool]:
+        """Return the stored pages of a query and whether they run to the end."""
+        stored = self.connection.hgetall(key)
+        complete = stored.pop(_END.encode(), None) is not None
+        return {int(page): json.loads(jobs) for page, jobs in stored.items()}, complete
+
+    def store(self, key: str, page: int, jobs: list[dict], refresh: bool) -> None:
+        """Store a page, restarting the key's TTL if refresh."""
+        self._set(key, str(page), json.dumps(jobs), refresh)
+
+    def finish(self, key: str, refresh: bool) -> None:
+        """Mark the stored pages as running to the end of the results."""
+        self._set(key, _END, '', refresh)
+
+    def _set(self, key: str, field: str, value: str, refresh: bool) -> None:
+        pipe = self.connection.pipeline()
+        pipe.hset(key, field, value)
+        if refresh:
+            pipe.expire(key, settings.SEARCH_FANIN_TTL)
+        pipe.execute()
+
+    def iter_jobs(
+        self, parser: BaseParser, search: Search, period: int | None = None, after: int | None = None
+    ) -> Iterator[tuple[int, list[dict]]]:
+        """Yield (page, jobs) like ``parser.iter_jobs``, replaying pages another search already loaded.
+
+        Pages up to ``after`` are skipped, whether stored or not.
+        """
+        if not self.enabled:
+            yield from parser.iter_jobs(search, period, after=after)
+            return
+        key = self.key(parser, search, period)
+        try:
+            lock = self.connection.lock(
+                f'{key}:lock',
+                timeout=settings.SEARCH_FANIN_LOCK_TIMEOUT,
+                blocking_timeout=settings.SEARCH_FANIN_WAIT,
+            )
+            acquired = lock.acquire()
+            stored, complete = self.load(key) if acquired else ({}, False)
+        except RedisError:
+            logger.warning('Shared search results unavailable, loading %s directly', key, exc_info=True)
+            acquired = False
+        if not acquired:
+            yield from parser.iter_jobs(search, period, after=after)
+            return
+
+        try:
+            last = after
+            for page in sorted(stored):
+                last = max(page, last or 0)
+                if after is not None and page <= after:
+                    continue
+                yield page, stored[page]
+                self._renew(lock, key)
+            if complete:
+                return
+            if stored:
+                logger.info('Replayed %d shared pages of %s', len(stored), key)
+
+            # The TTL runs from the first run that loaded the query, not from later runs extending it
+            refresh = not stored
+            for page, jobs in parser.iter_jobs(search, period, after=last):
+                self._quietly(self.store, key, page, jobs, refresh)
+                yield page, jobs
+                self._renew(lock, key)
+            self._quietly(self.finish, key, refresh)
+        finally:
+            try:
+                lock.release()
+            except RedisError:
+                logger.warning('Could not release %s:lock', key, exc_info=True)
+
+    def _renew(self, lock: Any, key: str) -> None:
+        """Restart the lock's timeout once a page has been handled."""
+        try:
+            lock.extend(settings.SEARCH_FANIN_LOCK_TIMEOUT, replace_ttl=True)
+        except RedisError:
+            logger.warning('Could not renew %s:lock', key, exc_info=True)
+
+    def _quietly(self, write: Callable[..., None], key: str, *args: Any) -> None:
+        try:
+            write(key, *args)
+        except RedisError:
+            logger.warning('Could not update shared results %s', key, exc_info=True)
+
+
+shared_results = SharedResults()
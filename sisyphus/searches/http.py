@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import html
+import logging
+import random
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+from django.conf import settings
+
+from sisyphus.searches.playwright import (
+    BLOCKED_STATUSES,
+    CHALLENGE_MARKERS,
+    RawResponse,
+    ua_to_client_hints,
+    user_agent_list,
+)
+
+from sisyphus.searches.telemetry import BLOCKED, CHALLENGE, ERROR, OK
+
+if TYPE_CHECKING:
+    from sisyphus.searches.proxies import ProxyPool
+    from sisyphus.searches.telemetry import RequestTelemetry
+
+logger = logging.getLogger(__name__)
+
+# Body fragments of interstitials served with a 200 status
+CHALLENGE_BODY_MARKERS = ('challenge-platform', 'cf-chl-', 'captcha-delivery', '<title>Just a moment')
+
+
+class BrowserFallback(Exception):
+    """Raised when a response must be fetched again with a real browser."""
+
+
+def render_like_browser(response: httpx.Response) -> str:
+    """Return the document Chromium would serialize for this response.
+
+    JSON is shown by Chromium inside a ``<pre>``, and HTML fragments get
+    wrapped in ``<html><body>``, so parsers see the same tree either way.
+    """
+    content_type = response.headers.get('content-type', '')
+    if 'json' in content_type or content_type.startswith('text/plain'):
+        return f'<html><head></head><body><pre>{html.escape(response.text, quote=False)}</pre></body></html>'
+    text = response.text
+    if '<html' not in text[:1024].lower():
+        return f'<html><head></head><body>{text}</body></html>'
+    return text
+
+
+class HttpClient:
+    """Keep-alive HTTP client for endpoints that do not need a browser.
+
+    Sends the same User-Agent and Client Hints headers as a browser context,
+    switching to a new User-Agent, and proxy from ``proxies`` if given,
+    whenever a response looks blocked or the proxy is evicted.
+    """
+
+    def __init__(self, timeout: float | None = None, proxies: ProxyPool | None = None) -> None:
+        self.timeout = settings.SCRAPER_HTTP_TIMEOUT if timeout is None else timeout
+        self.proxies = proxies
+        self.proxy: str | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is not None and self.proxies is not None and not self.proxies.available(self.proxy):
+            await self.close()
+        if self._client is None:
+            ua = random.choice(user_agent_list)
+            self.proxy = self.proxies.choose() if self.proxies is not None else None
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': ua, **ua_to_client_hints(ua)},
+                follow_redirects=True,
+                timeout=self.timeout,
+                proxy=self.proxy,
+            )
+        return self._client
+
+    def _record(self, proxy: str | None, status: int | None, start: float, blocked: bool = False) -> None:
+        if self.proxies is not None:
+            self.proxies.record(proxy, status, time.perf_counter() - start, blocked)
+
+    async def _get(self, url: str, sample: RequestTelemetry | None = None) -> httpx.Response:
+        """GET url, raising BrowserFallback on transport errors, rate limiting, blocks and challenge pages.
+
+        The response's status, size and classification are filled in on sample, if given.
+        """
+        logger.info('HTTP GET %s', url)
+        client = await self._get_client()
+        proxy = self.proxy
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as exc:
+            self._record(proxy, None, start)
+            raise BrowserFallback(f'{type(exc).__name__}: {exc}') from exc
+
+        if sample is not None:
+            sample.status = response.status_code
+            sample.bytes = response.num_bytes_downloaded or len(response.content)
+        if response.status_code in BLOCKED_STATUSES:
+            self._record(proxy, response.status_code, start, blocked=True)
+            await self.close()
+            self._classify(sample, BLOCKED)
+            raise BrowserFallback(f'HTTP {response.status_code}')
+        if any(marker in str(response.url) for marker in CHALLENGE_MARKERS) or any(
+            marker in response.text for marker in CHALLENGE_BODY_MARKERS
+        ):
+            self._record(proxy, response.status_code, start, blocked=True)
+            await self.close()
+            self._classify(sample, CHALLENGE)
+            raise BrowserFallback('challenge page')
+        self._record(proxy, response.status_code, start)
+        self._classify(sample, ERROR if response.status_code >= 400 else OK)
+        return response
+
+    @staticmethod
+    def _classify(sample: RequestTelemetry | None, outcome: str) -> None:
+        if sample is not None:
+            sample.outcome = outcome
+
+    async def fetch(self, url: str, sample: RequestTelemetry | None = None) -> str | None:
+        """Return the page rendered as the browser would, or None for a non-2xx status."""
+        response = await self._get(url, sample)
+        if response.status_code >= 400:
+            return None
+        return render_like_browser(response)
+
+    async def fetch_raw(self, url: str, sample: RequestTelemetry | None = None) -> RawResponse | None:
+        """Return the undecoded body, or None for a non-2xx status."""
+        response = await self._get(url, sample)
+        if response.status_code >= 400:
+            return None
+        return RawResponse(response.content, response.headers.get('content-type', ''), response.status_code)
+
+    async def close(self) -> None:
+        """Close pooled connections; the next fetch opens a new client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
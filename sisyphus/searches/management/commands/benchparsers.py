@@ -0,0 +1,102 @@
+import gc
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sisyphus.searches.backends import PARSER_BACKENDS, Target, parse_html
+from sisyphus.searches.parsers.linkedin import LinkedInParser
+from sisyphus.searches.utils import NullableTag
+
+MB = 1024 * 1024
+
+
+def current_rss() -> int:
+    """Return the resident set size of this process in bytes, or 0 off Linux."""
+    try:
+        pages = int(Path('/proc/self/statm').read_text().split()[1])
+    except OSError:
+        return 0
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def peak_heap(pages: list[tuple[str, str]], backend: str, only: list[Target] | None = None) -> tuple[int, int]:
+    """Return peak traced Python heap and RSS growth while every page is parsed and held."""
+    gc.collect()
+    rss = current_rss()
+    tracemalloc.start()
+    trees = [parse_html(html, backend, only) for _, html in pages]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss = current_rss() - rss
+    del trees
+    return peak, rss
+
+
+def extract_fields(parser: LinkedInParser, tag: NullableTag) -> dict:
+    """Return the fields the LinkedIn parser reads from a listing or job page."""
+    return {
+        'cards': [{key: value for key, value in job.items() if key != 'date_found'} for job in parser.parse_cards(tag)],
+        'description': tag.find('div', {'class': 'show-more-less-html__markup'}).decode_contents().strip(),
+        'apply_url': bool(tag.find('code', {'id': 'applyUrl'})),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare HTML parser backends on recorded LinkedIn listing and job pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', help='Directory of recorded pages')
+        parser.add_argument('--rounds', type=int, default=5)
+        parser.add_argument('--backends', nargs='+', choices=PARSER_BACKENDS, default=list(PARSER_BACKENDS))
+
+    def handle(self, *args, **options):
+        fixtures = Path(options['fixtures'])
+        paths = sorted(path for path in fixtures.iterdir() if path.is_file()) if fixtures.is_dir() else []
+        if not paths:
+            raise CommandError(f'No recorded pages found in {fixtures}')
+        pages = [(path.name, path.read_text(errors='replace')) for path in paths]
+        parser = LinkedInParser()
+        targets = parser.CARD_TARGETS + parser.JOB_TARGETS
+        reference: list[dict] | None = None
+
+        for backend in options['backends']:
+            start = time.perf_counter()
+            for _ in range(options['rounds']):
+                trees = [parse_html(html, backend) for _, html in pages]
+            elapsed = time.perf_counter() - start
+            fields = [extract_fields(parser, tag) for tag in trees]
+            del trees
+
+            start = time.perf_counter()
+            for _ in range(options['rounds']):
+                trees = [parse_html(html, backend, targets) for _, html in pages]
+            strained_elapsed = time.perf_counter() - start
+            strained_fields = [extract_fields(parser, tag) for tag in trees]
+            del trees
+
+            # Measured in separate passes, since tracing slows parsing down
+            peak, rss = peak_heap(pages, backend)
+            strained_peak, _ = peak_heap(pages, backend, targets)
+
+            if reference is None:
+                reference = fields
+            differ = [name for (name, _), ours, theirs in zip(pages, fields, reference, strict=True) if ours != theirs]
+            strained_differ = [
+                name for (name, _), ours, theirs in zip(pages, strained_fields, fields, strict=True) if ours != theirs
+            ]
+            per_page = elapsed / (options['rounds'] * len(pages)) * 1000
+            strained_per_page = strained_elapsed / (options['rounds'] * len(pages)) * 1000
+            self.stdout.write(
+                f'{backend}: {per_page:.2f} ms/page, peak Python heap {peak / MB:.1f} MB, '
+                f'RSS +{rss / MB:.1f} MB, {len(differ)}/{len(pages)} pages differ from {options["backends"][0]}'
+            )
+            self.stdout.write(
+                f'{backend} (targets only): {strained_per_page:.2f} ms/page, '
+                f'peak Python heap {strained_peak / MB:.1f} MB, '
+                f'{len(strained_differ)}/{len(pages)} pages differ from the full parse'
+            )
+            for name in differ:
+                self.stdout.write(f'  {name}')
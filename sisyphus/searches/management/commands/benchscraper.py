@@ -0,0 +1,75 @@
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sisyphus.core.histogram import Histogram
+from sisyphus.searches.playwright import Scraper
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Compare pages per minute and latency across scraper settings against recorded pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', help='Directory of recorded responses to serve locally')
+        parser.add_argument('--rounds', type=int, default=3)
+        parser.add_argument('--pool-size', type=int, default=settings.SCRAPER_POOL_SIZE)
+        parser.add_argument('--max-uses', type=int, default=settings.SCRAPER_CONTEXT_MAX_USES)
+        parser.add_argument('--wait-until', default='networkidle')
+        parser.add_argument('--ready-selector', help='Also time pooled loads that return once this selector is present')
+
+    def handle(self, *args, **options):
+        fixtures = Path(options['fixtures'])
+        names = sorted(path.name for path in fixtures.iterdir() if path.is_file()) if fixtures.is_dir() else []
+        if not names:
+            raise CommandError(f'No recorded responses found in {fixtures}')
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(fixtures)))
+        Thread(target=server.serve_forever, daemon=True).start()
+        urls = [f'http://127.0.0.1:{server.server_port}/{name}' for name in names]
+
+        modes = [
+            ('context per request', {'pool_size': 1, 'max_uses': 1}),
+            ('pooled', {'pool_size': options['pool_size'], 'max_uses': options['max_uses']}),
+        ]
+        if options['ready_selector']:
+            selector = options['ready_selector']
+            modes.append(
+                (
+                    'pooled, ready selector',
+                    {
+                        'pool_size': options['pool_size'],
+                        'max_uses': options['max_uses'],
+                        'ready_selector': lambda url: selector,
+                    },
+                )
+            )
+        try:
+            for label, kwargs in modes:
+                with Scraper(**kwargs) as scraper:
+                    # Launch the browser outside the timed loop
+                    scraper.get(urls[0], wait_until=options['wait_until'])
+                    histogram = Histogram()
+                    start = time.perf_counter()
+                    for _ in range(options['rounds']):
+                        for url in urls:
+                            page_start = time.perf_counter()
+                            scraper.get(url, wait_until=options['wait_until'])
+                            histogram.observe(time.perf_counter() - page_start)
+                    elapsed = time.perf_counter() - start
+                pages = options['rounds'] * len(urls)
+                self.stdout.write(
+                    f'{label}: {pages} pages in {elapsed:.1f}s ({pages / elapsed * 60:.0f} pages/min, '
+                    f'p50 {histogram.percentile(0.5):.2f}s, p95 {histogram.percentile(0.95):.2f}s)'
+                )
+        finally:
+            server.shutdown()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from sisyphus.searches.ratelimit import rate_limiter
+
+
+class Command(BaseCommand):
+    help = 'Show requests throttled by the shared per-host rate limiter and how long they waited'
+
+    def handle(self, *args, **options):
+        keys = sorted(key.decode() for key in rate_limiter.connection.scan_iter(rate_limiter.key('*', 'stats')))
+        for key in keys:
+            host = key.split(':')[2]
+            stats = rate_limiter.stats(host)
+            self.stdout.write(
+                f'{host}: {stats["throttled"]} throttled, {stats["wait_seconds"]:.1f}s waited, '
+                f'{rate_limiter.rate(host):g} req/s'
+            )
+        if not keys:
+            self.stdout.write('No throttled requests recorded')
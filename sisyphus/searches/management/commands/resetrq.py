@@ -2,14 +2,18 @@ import django_rq
 from rq import Worker
 from rq.command import send_stop_job_command
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 
 class Command(BaseCommand):
     def handle(self, **options):
-        q = django_rq.get_queue('default')
+        for name in settings.RQ_QUEUES:
+            self.reset(django_rq.get_queue(name))
+
+    def reset(self, q):
         q.empty()
-        workers = Worker.all(q.connection)
+        workers = Worker.all(queue=q)
         for worker in workers:
             if worker.get_current_job():
                 send_stop_job_command(q.connection, worker.get_current_job().id)
@@ -19,4 +23,3 @@ class Command(BaseCommand):
         failed = q.failed_job_registry
         for job_id in failed.get_job_ids():
             failed.remove(job_id, delete_job=True)
-        
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from sisyphus.searches.cache import response_cache
+
+
+class Command(BaseCommand):
+    help = 'Show or clear the on-disk scraper response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help='Delete every cached response')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(f'Deleted {response_cache.clear()} cached responses')
+            return
+        entries = response_cache.entries()
+        self.stdout.write(
+            f'{response_cache.directory} ({response_cache.mode}): {len(entries)} responses, '
+            f'{sum(size for _, size, _ in entries) // 1024} KB'
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from sisyphus.searches.telemetry import PARSER, WORKER, telemetry
+
+
+class Command(BaseCommand):
+    help = 'Show request counts, outcomes, bytes and mean phase timings recorded per parser and worker'
+
+    def handle(self, *args, **options):
+        telemetry.flush()
+        found = False
+        for scope in (PARSER, WORKER):
+            for name in telemetry.names(scope):
+                found = True
+                stats = telemetry.stats(scope, name)
+                outcomes = ', '.join(
+                    f'{field.removeprefix("outcome:")} {count}'
+                    for field, count in sorted(stats.items())
+                    if field.startswith('outcome:')
+                )
+                self.stdout.write(
+                    f'{scope} {name}: {stats.get("requests", 0)} requests ({outcomes}), '
+                    f'{stats.get("bytes", 0) // 1024} KB, {stats.get("blocked_requests", 0)} sub-requests blocked, '
+                    f'context {stats.get("mean_context_seconds", 0):.2f}s, '
+                    f'navigation {stats.get("mean_navigation_seconds", 0):.2f}s, '
+                    f'ready {stats.get("mean_ready_seconds", 0):.2f}s'
+                )
+        if not found:
+            self.stdout.write('No scraper telemetry recorded')
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0010_add_hiringcafe_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='search',
+            name='watermark',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='searchrun',
+            name='last_page',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='searchrun',
+            name='stop_reason',
+            field=models.CharField(blank=True, choices=[('exhausted', 'All pages fetched'), ('stale', 'No new listings'), ('page_error', 'Page failed')], default='', max_length=10),
+        ),
+    ]
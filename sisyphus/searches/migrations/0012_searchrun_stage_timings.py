@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0011_search_watermark_searchrun_stop_reason'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchrun',
+            name='fetch_blocked_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='searchrun',
+            name='fetch_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='searchrun',
+            name='ingest_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='searchrun',
+            name='ingest_waiting_seconds',
+            field=models.FloatField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0012_searchrun_stage_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='search',
+            name='job_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='search',
+            name='job_count_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0013_search_job_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchrun',
+            name='telemetry',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
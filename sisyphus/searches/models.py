@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 from enum import IntEnum
 
 from django.db import models
@@ -50,6 +51,13 @@ class Search(UUIDModel):
     last_executed_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=7, choices=Status.choices, default=Status.IDLE)
 
+    # Newest date_posted ingested by this search, used to stop paginating early
+    watermark = models.DateTimeField(null=True, blank=True)
+
+    # Listings seen by the last run that paged through to the end of the results
+    job_count = models.PositiveIntegerField(null=True, blank=True)
+    job_count_at = models.DateTimeField(null=True, blank=True)
+
     schedule = models.CharField(
         max_length=100,
         blank=True,
@@ -122,6 +130,19 @@ class Search(UUIDModel):
 
         return best
 
+    def advance_watermark(self, newest: datetime | None) -> None:
+        """Move the watermark up to newest, the latest posting date a run created a job for."""
+        if newest is None or (self.watermark is not None and newest <= self.watermark):
+            return
+        self.watermark = newest
+        self.save(update_fields=['watermark'])
+
+    def record_job_count(self, count: int) -> None:
+        """Save the number of listings a complete run saw."""
+        self.job_count = count
+        self.job_count_at = timezone.now()
+        self.save(update_fields=['job_count', 'job_count_at'])
+
     def set_status(self, status: Status) -> None:
         """Set status and save."""
         self.status = status
@@ -158,7 +179,7 @@ class Search(UUIDModel):
             func=execute_search,
             args=[self.id, self.user_id],
             meta={'task_name': task_name},
-            queue_name='default',
+            queue_name='maintenance',
         )
 
 
@@ -168,6 +189,11 @@ class SearchRun(UUIDModel):
         SUCCESS = 'success', _('Success')
         ERROR = 'error', _('Error')
 
+    class StopReason(models.TextChoices):
+        EXHAUSTED = 'exhausted', _('All pages fetched')
+        STALE = 'stale', _('No new listings')
+        PAGE_ERROR = 'page_error', _('Page failed')
+
     search = models.ForeignKey(Search, related_name='runs', on_delete=models.CASCADE)
     period = models.IntegerField(default=0)
     status = models.CharField(max_length=7, choices=Status.choices, default=Status.RUNNING)
@@ -178,6 +204,18 @@ class SearchRun(UUIDModel):
     jobs_found = models.PositiveIntegerField(default=0)
     jobs_created = models.PositiveIntegerField(default=0)
 
+    last_page = models.IntegerField(null=True, blank=True)
+    stop_reason = models.CharField(max_length=10, choices=StopReason.choices, default='', blank=True)
+
+    # Seconds spent loading and parsing pages, ingesting them, and each side waiting on the other
+    fetch_seconds = models.FloatField(default=0)
+    ingest_seconds = models.FloatField(default=0)
+    fetch_blocked_seconds = models.FloatField(default=0)
+    ingest_waiting_seconds = models.FloatField(default=0)
+
+    # Request totals from the scraper telemetry, as recorded when the run ended
+    telemetry = models.JSONField(default=dict, blank=True)
+
     error_message = models.TextField(default='', blank=True)
 
     class Meta:
@@ -185,3 +223,7 @@ class SearchRun(UUIDModel):
 
     def __str__(self):
         return f'{self.search.keywords} | {self.get_status_display()} | {self.started_at}'
+
+    def newest_posted(self) -> datetime | None:
+        """Return the latest posting date among the jobs this run created."""
+        return self.jobs.aggregate(newest=models.Max('date_posted'))['newest']
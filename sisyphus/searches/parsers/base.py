@@ -1,18 +1,66 @@
+from __future__ import annotations
+
 import logging
-from typing import ClassVar
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from typing import TYPE_CHECKING, ClassVar
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 
-from sisyphus.searches.playwright import Scraper
+from sisyphus.searches.backends import Target, parse_html
+from sisyphus.searches.blocking import BlockProfile
+from sisyphus.searches.playwright import Extracted, FetchError, PageResult, RawResponse, Scraper
 from sisyphus.searches.utils import NullableTag
 
+if TYPE_CHECKING:
+    from sisyphus.jobs.models import Job
+    from sisyphus.searches.models import Search
+
 logger = logging.getLogger(__name__)
 
 
+class PageError(Exception):
+    """A page of search results could not be loaded or parsed."""
+
+    def __init__(self, page: int) -> None:
+        super().__init__(f'Page {page} failed')
+        self.page = page
+
+
 class BaseParser:
     blocklist: ClassVar[list[str]] = []
 
+    # URL prefixes fetched with the keep-alive HTTP client before falling back to the browser
+    http_endpoints: ClassVar[list[str]] = []
+
+    # URL prefix -> CSS selector whose presence means the page is ready to parse
+    ready_selectors: ClassVar[dict[str, str]] = {}
+
+    # URL prefixes whose response body is read as is, skipping the DOM
+    raw_endpoints: ClassVar[list[str]] = []
+
+    # URL prefix -> script evaluated in the page, returning records instead of HTML
+    extract_scripts: ClassVar[dict[str, str]] = {}
+
+    # Whether result pages run newest first, so that pages of known listings mean no new ones follow
+    sorted_by_date: ClassVar[bool] = False
+
+    # Resource types and URL patterns blocked in the browser, in addition to blocklist hosts.
+    # When installed it replaces intercept_request, so its patterns must cover whatever that
+    # blocks; resource types without entries in RESOURCE_TYPE_PATTERNS are not blocked at all.
+    block_profile: ClassVar[BlockProfile | None] = None
+
+    # Result page URL, formatted with the search, page and period; parsers that build a
+    # query string override get_page_url instead
+    page_url_template: ClassVar[str] = ''
+
+    # Job fields populate_job fills in, written back in one bulk_update by populate_jobs
+    populate_fields: ClassVar[list[str]] = ['raw_html', 'description', 'easy_apply', 'populated']
+
     name: ClassVar[str] = ''
 
     _instances: ClassVar[dict[type, 'BaseParser']] = {}
@@ -25,27 +73,207 @@ class BaseParser:
     def __init__(self):
         if hasattr(self, 'scraper'):
             return
-        self.scraper = Scraper(self.intercept_request)
+        profile = self.block_profile.with_hosts(self.blocklist) if self.block_profile is not None else None
+        self.scraper = Scraper(
+            self.intercept_request,
+            use_http=self.use_http,
+            block_profile=profile,
+            ready_selector=self.ready_selector,
+            extract_script=self.extract_script,
+            read_raw=self.reads_raw,
+            name=self.name,
+        )
+        self._prefetched: dict[str, PageResult | FetchError] = {}
 
-    def intercept_request(self, route) -> bool:
+    async def intercept_request(self, route) -> bool:
         host = urlparse(route.request.url).hostname
-        if host in self.blocklist:
-            route.abort()
+        if host in self.blocklist or (
+            self.block_profile is not None and self.block_profile.blocks(route.request.resource_type)
+        ):
+            await route.abort('blockedbyclient')
             return True
         else:
             logger.info('Intercepting %s', host)
             if type(self).intercept_request is BaseParser.intercept_request:
-                route.continue_()
+                await route.continue_()
                 return True
         return False
 
-    def get(self, url: str) -> NullableTag:
-        if (html := self.scraper.get_with_retry(url)) is not None:
-            return NullableTag(self.soupify(html).html)
+    def use_http(self, url: str) -> bool:
+        """Return whether url is served well enough without a browser."""
+        return url.startswith(tuple(self.http_endpoints))
+
+    def ready_selector(self, url: str) -> str | None:
+        """Return the selector to wait for on url, or None to wait for networkidle."""
+        for prefix, selector in self.ready_selectors.items():
+            if url.startswith(prefix):
+                return selector
+        return None
+
+    def extract_script(self, url: str) -> str | None:
+        """Return the in-page extraction script for url, if there is one."""
+        if not settings.SCRAPER_IN_PAGE_EXTRACT:
+            return None
+        for prefix, script in self.extract_scripts.items():
+            if url.startswith(prefix):
+                return script
+        return None
+
+    def reads_raw(self, url: str) -> bool:
+        return url.startswith(tuple(self.raw_endpoints))
+
+    def load(self, url: str) -> PageResult:
+        """Return the prefetched result for url, or fetch it now, raising FetchError if it failed."""
+        if url in self._prefetched:
+            result = self._prefetched.pop(url)
+            if isinstance(result, FetchError):
+                raise result
+            return result
+        return self.scraper.get_with_retry(url)
+
+    def tag(self, html: str | None, only: list[Target] | None = None) -> NullableTag:
+        if html is not None:
+            return self.soupify(html, only)
         return NullableTag()
 
-    def soupify(self, html: str) -> BeautifulSoup:
-        return BeautifulSoup(html, 'html.parser')
+    def get_raw(self, url: str) -> RawResponse | None:
+        """Fetch the undecoded body of one of the parser's raw_endpoints."""
+        result = self.load(url)
+        if result is None or isinstance(result, RawResponse):
+            return result
+        logger.warning('Expected a raw body for %s', url)
+        return None
+
+    def get_html(self, url: str) -> str | None:
+        """Fetch url and return its HTML body."""
+        result = self.load(url)
+        if isinstance(result, Extracted):
+            return result.html
+        return result
+
+    def get(self, url: str, only: list[Target] | None = None) -> NullableTag:
+        """Fetch url and parse it, keeping only the ``only`` subtrees if given."""
+        return self.tag(self.get_html(url), only)
+
+    def verify_extraction(self, url: str, extracted: list[dict], parsed: list[dict]) -> bool:
+        """Log a warning if in-page extraction and the HTML parser disagree about url."""
+
+        def comparable(jobs: list[dict]) -> list[dict]:
+            return [{key: value for key, value in job.items() if key != 'date_found'} for job in jobs]
+
+        if comparable(extracted) == comparable(parsed):
+            return True
+        logger.warning(
+            'In-page extraction differs from parsed HTML for %s (%d vs %d jobs)', url, len(extracted), len(parsed)
+        )
+        return False
+
+    @contextmanager
+    def prefetch(self, urls: list[str]) -> Iterator[None]:
+        """Fetch urls concurrently so that ``get`` calls inside the block return immediately."""
+        urls = [url for url in dict.fromkeys(urls) if url not in self._prefetched]
+        self._prefetched.update(zip(urls, self.scraper.get_many(urls), strict=True))
+        try:
+            yield
+        finally:
+            for url in urls:
+                self._prefetched.pop(url, None)
+
+    def prefetch_stream(self, urls: Iterable[str], window: int) -> Iterator[str]:
+        """Yield urls in order as each loads, keeping up to ``window`` loads in flight.
+
+        ``get`` for the url just yielded returns immediately.
+        """
+        for url, result in self.scraper.iter_many(urls, window):
+            self._prefetched[url] = result
+            try:
+                yield url
+            finally:
+                self._prefetched.pop(url, None)
+
+    def soupify(self, html: str, only: list[Target] | None = None) -> NullableTag:
+        """Parse html with the HTML_PARSER_BACKEND setting."""
+        return parse_html(html, only=only)
+
+    def get_page_url(self, search: Search, page: int, period: int | None = None) -> str:
+        """Return the URL that ``parse`` fetches for a page of search results."""
+        if not self.page_url_template:
+            raise ImproperlyConfigured(f'{type(self).__name__} sets neither page_url_template nor get_page_url')
+        return self.page_url_template.format(search=search, page=page, period=period)
+
+    def get_pages(self, search: Search, period: int | None = None) -> Iterable[int]:
+        """Return the page numbers of a search's results."""
+        return range(1, self.get_page_count(search) + 1)
+
+    def parse_page(self, search: Search, page: int, period: int | None = None) -> tuple[list[dict], int]:
+        """Parse a results page, returning its jobs and how many results it held before any were dropped."""
+        jobs = self.parse(search, page=page, period=period)
+        return jobs, len(jobs)
+
+    def is_last_page(self, count: int) -> bool:
+        """Return whether a page holding ``count`` results shows that none follow it."""
+        return False
+
+    def iter_jobs(
+        self, search: Search, period: int | None = None, after: int | None = None
+    ) -> Iterator[tuple[int, list[dict]]]:
+        """Yield each page number with its parsed jobs, in order, as the pages load.
+
+        Up to SEARCH_PAGE_CONCURRENCY pages load ahead of the one being
+        parsed, starting after page ``after`` if given. Iteration ends after
+        the last page or one that ``is_last_page``. A page that fails raises
+        PageError; closing the iterator cancels the loads still in flight.
+        """
+        pages: dict[str, int] = {}
+
+        def urls() -> Iterator[str]:
+            for page in self.get_pages(search, period):
+                if after is not None and page <= after:
+                    continue
+                url = self.get_page_url(search, page, period)
+                pages[url] = page
+                yield url
+
+        with closing(self.prefetch_stream(urls(), settings.SEARCH_PAGE_CONCURRENCY)) as stream:
+            for url in stream:
+                page = pages.pop(url)
+                try:
+                    jobs, count = self.parse_page(search, page, period)
+                except Exception as exc:
+                    raise PageError(page) from exc
+                yield page, jobs
+                if self.is_last_page(count):
+                    return
+
+    def populate_jobs(self, jobs: list[Job], deadline: float | None = None) -> dict[str, list[Job]]:
+        """Populate several new jobs, loading their pages concurrently and saving them in one query.
+
+        Jobs filtered or banned since they were found are skipped before
+        anything is loaded. Once ``deadline``, a ``time.monotonic`` value,
+        passes, the jobs not yet reached are returned as ``unfinished``
+        alongside those that ``failed`` and were ``populated``.
+        """
+        from sisyphus.jobs.models import Job  # noqa: PLC0415
+
+        pending = deque(job for job in jobs if job.status == Job.Status.NEW)
+        result: dict[str, list[Job]] = {'populated': [], 'failed': [], 'unfinished': []}
+        with closing(self.prefetch_stream([job.url for job in pending], len(pending))) as stream:
+            for _ in stream:
+                job = pending.popleft()
+                try:
+                    self.populate_job(job, save=False)
+                except Exception:
+                    logger.exception('Error populating job %s', job.id)
+                    result['failed'].append(job)
+                else:
+                    if job.populated:
+                        result['populated'].append(job)
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        result['unfinished'] = list(pending)
+        if result['populated']:
+            Job.objects.bulk_update(result['populated'], self.populate_fields)
+        return result
 
     def close(self):
         """No-op: singleton parsers persist for the lifetime of the process."""
@@ -62,7 +290,7 @@ class IPParser(BaseParser):
     name = 'ip'
 
     def parse(self) -> str:
-        tag = self.get('https://icanhazip.cfom/')
+        tag = self.get('https://icanhazip.cfom/', only=[('pre', {})])
         if (pre := tag.find('pre')) is not None:
             return pre.text.strip()
         return ''
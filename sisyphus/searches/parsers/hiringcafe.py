@@ -2,13 +2,16 @@ import base64
 import logging
 import json
 from datetime import datetime
+from functools import lru_cache
 from typing import ClassVar
 from urllib.parse import urlencode
 
+from django.conf import settings
 from django.utils import timezone
 
 from sisyphus.searches.models import Search
 from sisyphus.searches.parsers.base import BaseParser
+from sisyphus.searches.utils import decode_with_raw_items
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +19,25 @@ logger = logging.getLogger(__name__)
 class HiringCafeParser(BaseParser):
     JOBS_PER_PAGE = 40
 
+    # Lookback window in days when a search is not limited to a period
+    DEFAULT_DAYS = 121
+
     blocklist: ClassVar[list[str]] = []
 
+    # The API returns JSON, decoded straight from the response body
+    raw_endpoints: ClassVar[list[str]] = [
+        'https://hiring.cafe/api/',
+    ]
+
+    http_endpoints: ClassVar[list[str]] = [
+        'https://hiring.cafe/api/search-jobs',
+    ]
+
     name = 'hiringcafe'
 
-    search_state = {
+    # Stored serialized so nothing, nested lists included, can mutate the template;
+    # template() decodes a fresh copy for each search
+    search_state = json.dumps({
         'locations': [
             {
                 'formatted_address': 'United States',
@@ -67,7 +84,7 @@ class HiringCafeParser(BaseParser):
         'onCallRequirements': ['None', 'Occasional (once a month or less)', 'Regular (once a week or more)'],
         'usaGovPref': None,
         'searchQuery': '',
-        'dateFetchedPastNDays': 121,
+        'dateFetchedPastNDays': DEFAULT_DAYS,
         'user': None,
         'searchModeSelectedCompany': None,
         'sortBy': 'default',
@@ -78,7 +95,7 @@ class HiringCafeParser(BaseParser):
         'isNonProfit': 'all',
         'minYearFounded': None,
         'maxYearFounded': None
-    }
+    })
 
     # not entirely sure how dateFetchedPastNDays
     # is derived, so use a manual mapping for now
@@ -103,33 +120,49 @@ class HiringCafeParser(BaseParser):
         94608000: 1440, # 3 years
     }
 
+    @property
+    def page_size(self) -> int:
+        return settings.HIRINGCAFE_PAGE_SIZE or self.JOBS_PER_PAGE
+
     def b64encode(self, data: dict) -> str:
         """Convert given dictionary to urlencoded base64."""
         state = urlencode({'s': json.dumps(data)})[2:].replace('+', ' ')
         return base64.b64encode(state.encode('utf-8')).decode('utf-8')
 
-    def get_json(self, tag):
-        if (pre := tag.find('pre')) is not None:
-            return json.loads(pre.text.strip())
+    def template(self) -> dict:
+        """Return a fresh, mutable copy of the search state template."""
+        return json.loads(self.search_state)
+
+    # Parsers are process-wide singletons, so caching on self does not leak instances
+    @lru_cache(maxsize=256)  # noqa: B019
+    def encode_state(self, keywords: str, days: int) -> str:
+        """Return the encoded search state for a query and lookback window."""
+        return self.b64encode({**self.template(), 'searchQuery': keywords, 'dateFetchedPastNDays': days})
+
+    def get_json(self, url: str) -> dict:
+        if (body := self.get_raw(url)) is not None:
+            return body.json()
         return {}
 
     def get_search_url(self, endpoint: str, state: str, page: int = 0) -> str:
         params = {
             's': state,
-            'size': self.JOBS_PER_PAGE,
+            'size': self.page_size,
             'page': page,
         }
         return f'https://hiring.cafe/api/search-jobs{endpoint}?{urlencode(params)}'
 
+    def get_page_url(self, search: Search, page: int, period: int | None = None) -> str:
+        return self.get_search_url('', self.generate_state(search, period), page=page)
+
     def get_job_count(self, state: str) -> int:
         url = self.get_search_url('/get-total-count', state)
-        tag = self.get(url)
-        if not tag:
-            logger.error('Unable to retrieve job count.')
-            return 0
-        
         try:
-            return self.get_json(tag)['total']
+            data = self.get_json(url)
+            if not data:
+                logger.error('Unable to retrieve job count.')
+                return 0
+            return data['total']
         except Exception:
             logger.exception('Error parsing job count.')
             return 0
@@ -142,10 +175,13 @@ class HiringCafeParser(BaseParser):
         count = self.get_job_count(state)
         if count == 0:
             return 0
-        return (count // self.JOBS_PER_PAGE)
+        return (count // self.page_size)
+
+    def get_pages(self, search: Search, period: int | None = None) -> range:
+        return range(self.get_page_count(self.generate_state(search, period)) + 1)
 
     def generate_state(self, search: Search, period: int | None = None) -> str:
-        self.search_state['searchQuery'] = search.keywords
+        days = self.DEFAULT_DAYS
         if period is not None:
             # TODO: this should really be a separate
             # calculation but for now hijack LinkedIn
@@ -154,10 +190,10 @@ class HiringCafeParser(BaseParser):
             if search.last_executed_at is None:
                 period = 15552000
             key = min(self.period_mapping.keys(), key=lambda x: abs(x - period))
-            self.search_state['dateFetchedPastNDays'] = self.period_mapping[key]
-        return self.b64encode(self.search_state)
+            days = self.period_mapping[key]
+        return self.encode_state(search.keywords, days)
 
-    def parse_job(self, result: dict):
+    def parse_job(self, result: dict, raw: str | None = None):
         error: str | None = None
         job = {}
 
@@ -224,7 +260,7 @@ class HiringCafeParser(BaseParser):
             logger.exception('Error parsing job description. Setting to empty string')
             job['description'] = ''
 
-        job['raw_html'] = result
+        job['raw_html'] = raw if raw is not None else result
 
         if error is not None:
             return None
@@ -233,20 +269,19 @@ class HiringCafeParser(BaseParser):
     def parse(self, search: Search, page=0, period: int | None = None) -> list[dict]:
         """Parse jobs."""
         jobs: list[dict] = []
-        state = self.generate_state(search, period)
-        
-        url = self.get_search_url('', state, page=page)
-        tag = self.get(url)
-        if not tag:
+        url = self.get_page_url(search, page, period)
+        body = self.get_raw(url)
+        if body is None:
             logger.warning('Response for %s is None', url)
             return jobs
 
-        data = self.get_json(tag)
+        # Keep each result's source text for raw_html rather than re-encoding it
+        data, results = decode_with_raw_items(body.text, 'results')
         if 'error' in data:
             raise Exception(data['error'])
 
-        for result in data['results']:
-            job = self.parse_job(result)
+        for result, raw in results:
+            job = self.parse_job(result, raw)
             if job is not None:
                 jobs.append(job)
         return jobs
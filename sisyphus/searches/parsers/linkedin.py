@@ -2,21 +2,62 @@ import logging
 from typing import ClassVar
 from urllib.parse import quote, urlencode, urlparse
 
+from django.conf import settings
 from django.utils import timezone
 
 from sisyphus.jobs.models import Job
+from sisyphus.searches.backends import Target
+from sisyphus.searches.blocking import BlockProfile
 from sisyphus.searches.models import Search
 from sisyphus.searches.parsers.base import BaseParser
+from sisyphus.searches.playwright import Extracted, FetchError
 from sisyphus.searches.utils import NullableTag, remove_query
 
 logger = logging.getLogger(__name__)
 
+# Mirrors parse_job, including NullableTag.text joining stripped text nodes
+EXTRACT_JOB_CARDS = """
+() => {
+    const text = (node) => {
+        if (!node) return '';
+        const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+        const parts = [];
+        while (walker.nextNode()) {
+            const part = walker.currentNode.textContent.trim();
+            if (part) parts.push(part);
+        }
+        return parts.join('');
+    };
+    return Array.from(document.querySelectorAll('div.job-search-card'), (card) => {
+        const company = card.querySelector('h4.base-search-card__subtitle a');
+        const time = card.querySelector('time.job-search-card__listdate, time.job-search-card__listdate--new');
+        return {
+            company: text(company),
+            company_url: company ? company.getAttribute('href') : null,
+            title: text(card.querySelector('h3.base-search-card__title')),
+            url: card.querySelector('a.base-card__full-link')?.getAttribute('href') ?? null,
+            location: text(card.querySelector('span.job-search-card__location')),
+            date_posted: time ? time.getAttribute('datetime') : null,
+        };
+    });
+}
+"""
+
 
 class LinkedInParser(BaseParser):
     JOBS_PER_PAGE = 10
 
     MAX_JOB_COUNT = 1000
 
+    # Subtrees each page type is parsed into; the rest of the document is skipped
+    COUNT_TARGETS: ClassVar[list[Target]] = [('span', {'class': 'results-context-header__job-count'})]
+    CARD_TARGETS: ClassVar[list[Target]] = [('div', {'class': 'job-search-card'})]
+    JOB_TARGETS: ClassVar[list[Target]] = [
+        ('div', {'class': 'show-more-less-html__markup'}),
+        ('code', {'id': 'applyUrl'}),
+        ('section', {'class': 'similar-jobs'}),
+    ]
+
     blocklist: ClassVar[list[str]] = [
         'static.licdn.com',
         'media.licdn.com',
@@ -27,21 +68,53 @@ class LinkedInParser(BaseParser):
         'tzm.protechts.net',
     ]
 
+    block_profile = BlockProfile(
+        resource_types={'image', 'font', 'stylesheet', 'media'},
+        url_patterns=[
+            # Tracking beacons, which carry no extension to block by type
+            '*://www.linkedin.com/li/track*',
+            '*://www.linkedin.com/sensorCollect*',
+            # The pages intercept_request aborts when the profile is not installed
+            '*://www.linkedin.com/',
+            '*://www.linkedin.com/?*',
+            '*://www.linkedin.com/authwall*',
+            '*://www.linkedin.com/favicon.ico*',
+        ],
+    )
+
+    # Guest pages are server-rendered, so most are complete at DOMContentLoaded
+    ready_selectors: ClassVar[dict[str, str]] = {
+        'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/': 'body',
+        'https://www.linkedin.com/jobs/view/': 'div.show-more-less-html__markup',
+        'https://www.linkedin.com/jobs/search': 'span.results-context-header__job-count',
+    }
+
+    extract_scripts: ClassVar[dict[str, str]] = {
+        'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/': EXTRACT_JOB_CARDS,
+    }
+
+    http_endpoints: ClassVar[list[str]] = [
+        'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/',
+    ]
+
+    sorted_by_date = True
+
     name = 'linkedin'
 
-    def intercept_request(self, route):
-        if super().intercept_request(route):
+    async def intercept_request(self, route):
+        if await super().intercept_request(route):
             return
         url = urlparse(route.request.url)
         if url.hostname == 'www.linkedin.com' and url.path.strip('/') in ['', 'authwall', 'favicon.ico']:
-            route.abort()
+            await route.abort()
         else:
-            route.continue_()
+            await route.continue_()
 
     def get_linkedin_url(self, endpoint: str, search: Search, page: int = 1, period: int | None = None):
         params = {
             'keywords': quote(search.keywords),
             'geo_id': search.geo_id,
+            'sortBy': 'DD',
         }
 
         if search.easy_apply:
@@ -72,10 +145,13 @@ class LinkedInParser(BaseParser):
 
         return f'https://www.linkedin.com{endpoint}search?{urlencode(params)}'
 
+    def get_page_url(self, search: Search, page: int, period: int | None = None) -> str:
+        return self.get_linkedin_url('/jobs-guest/jobs/api/seeMoreJobPostings/', search, page, period)
+
     def get_job_count(self, search: Search) -> int:
         """Return number of jobs found."""
         url = self.get_linkedin_url('/jobs/', search)
-        tag = self.get(url)
+        tag = self.get(url, only=self.COUNT_TARGETS)
         if not tag:
             logger.error('Unable to retrieve job count.')
             return 0
@@ -98,6 +174,16 @@ class LinkedInParser(BaseParser):
             return 1
         return (count // self.JOBS_PER_PAGE) + 1
 
+    def get_pages(self, search: Search, period: int | None = None) -> range:
+        if settings.LINKEDIN_ADAPTIVE_PAGINATION:
+            # Skip the job count probe, the heaviest page of a run, and stop on a short page instead
+            return range(1, self.MAX_JOB_COUNT // self.JOBS_PER_PAGE + 1)
+        return super().get_pages(search, period)
+
+    def is_last_page(self, count: int) -> bool:
+        # count includes cards that failed to parse, so a dropped card does not end the search early
+        return settings.LINKEDIN_ADAPTIVE_PAGINATION and count < self.JOBS_PER_PAGE
+
     def parse_job(self, div: NullableTag) -> dict | None:
         """Parse job div."""
         error: str | None = None
@@ -146,33 +232,68 @@ class LinkedInParser(BaseParser):
             return None
         return job
 
-    def parse(self, search: Search, page=1, period: int | None = None) -> list[dict]:
-        """Parse jobs."""
-        jobs: list[dict] = []
+    def parse_record(self, record: dict) -> dict | None:
+        """Build a job from a card returned by EXTRACT_JOB_CARDS, or None if it lacks a field parse_job requires."""
+        missing = [field for field in ('company_url', 'title', 'url', 'date_posted') if not record.get(field)]
+        if missing:
+            logger.error('Error parsing job card: missing %s', ', '.join(missing))
+            return None
+        return {
+            'company': record['company'],
+            'company_url': remove_query(record['company_url']),
+            'title': record['title'],
+            'url': remove_query(record['url']),
+            'location': record['location'],
+            'date_posted': record['date_posted'],
+            'date_found': str(timezone.now()),
+        }
 
-        url = self.get_linkedin_url('/jobs-guest/jobs/api/seeMoreJobPostings/', search, page, period)
-        tag = self.get(url)
-        if not tag:
-            logger.warning('Response for %s is None', url)
-            return jobs
-        
-        for div in tag.find_all('div', {'class': 'job-search-card'}):
+    def find_cards(self, tag: NullableTag) -> list:
+        return tag.find_all('div', {'class': 'job-search-card'})
+
+    def parse_cards(self, tag: NullableTag) -> list[dict]:
+        jobs: list[dict] = []
+        for div in self.find_cards(tag):
             job = self.parse_job(NullableTag(div))
             if job is not None:
                 jobs.append(job)
         return jobs
+
+    def parse(self, search: Search, page=1, period: int | None = None) -> list[dict]:
+        """Parse jobs."""
+        return self.parse_page(search, page, period)[0]
+
+    def parse_page(self, search: Search, page: int, period: int | None = None) -> tuple[list[dict], int]:
+        url = self.get_page_url(search, page, period)
+        result = self.load(url)
+        if result is None:
+            # A failed load is not a short page; iter_jobs raises it as a PageError the search can retry
+            raise FetchError(url, message=f'No response for {url}')
+        if isinstance(result, Extracted):
+            jobs = [job for record in result.records if (job := self.parse_record(record)) is not None]
+            if result.html is not None:
+                self.verify_extraction(url, jobs, self.parse_cards(self.tag(result.html, self.CARD_TARGETS)))
+            return jobs, len(result.records)
+
+        tag = self.tag(result, self.CARD_TARGETS)
+        if not tag:
+            logger.warning('Response for %s is None', url)
+            return [], 0
+        return self.parse_cards(tag), len(self.find_cards(tag))
     
-    def populate_job(self, job: Job) -> None:
+    def populate_job(self, job: Job, save: bool = True) -> None:
         if job.status != Job.Status.NEW:
             logger.warning('Job is not new. Will not populate.')
             return
 
-        tag = self.get(job.url)
+        html = self.get_html(job.url)
+        tag = self.tag(html, self.JOB_TARGETS)
         if not tag:
             logger.warning('Job not found, marking as expired.')
             job.update_status(Job.Status.EXPIRED)
             return
-        job.raw_html = str(tag)
+        # Store the whole page; only the parse is pruned to JOB_TARGETS
+        job.raw_html = html
 
         try:
             job.description = tag.find('div', {'class': 'show-more-less-html__markup'}).decode_contents().strip()
@@ -190,4 +311,5 @@ class LinkedInParser(BaseParser):
             job.easy_apply = False
 
         job.populated = True
-        job.save(update_fields=['raw_html', 'description', 'easy_apply', 'populated'])
+        if save:
+            job.save(update_fields=self.populate_fields)
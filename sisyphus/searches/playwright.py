@@ -1,12 +1,41 @@
+import asyncio
+import hashlib
+import json
 import logging
 import random
 import re
+import threading
 import time
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Coroutine, Iterable, Iterator
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
 from django.conf import settings
-from playwright.sync_api import Browser, Playwright, sync_playwright
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Request, Response, async_playwright
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from sisyphus.core.histogram import Histogram
+from sisyphus.searches.blocking import BlockProfile, BlockStats, install
+from sisyphus.searches.breaker import breaker
+from sisyphus.searches.proxies import ProxyPool, proxy_settings
+from sisyphus.searches.ratelimit import rate_limiter
+from sisyphus.searches.telemetry import (
+    BLOCKED,
+    CACHE,
+    CHALLENGE,
+    ERROR,
+    FAILED,
+    HTTP,
+    OK,
+    RequestTelemetry,
+    telemetry,
+)
+
+if TYPE_CHECKING:
+    from sisyphus.searches.cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +109,38 @@ def ua_to_client_hints(ua: str) -> dict[str, str]:
     }
 
 
+class Extracted:
+    """Records returned by a parser's in-page extraction script, in place of HTML.
+
+    ``html`` is only filled in for the sample of pages checked against the
+    BeautifulSoup path.
+    """
+
+    def __init__(self, records: list[dict[str, Any]], html: str | None = None) -> None:
+        self.records = records
+        self.html = html
+
+
+class RawResponse:
+    """An undecoded response body, returned in place of HTML for URLs read raw."""
+
+    def __init__(self, content: bytes, content_type: str = '', status: int = 200) -> None:
+        self.content = content
+        self.content_type = content_type
+        self.status = status
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+# What a fetch returns: HTML, extracted records or a raw body, or None on a failed load
+PageResult = str | Extracted | RawResponse | None
+
+
 class HttpError(Exception):
     """Raised when a page navigation returns a non-2xx HTTP status."""
 
@@ -88,6 +149,27 @@ class HttpError(Exception):
         self.status = status
         super().__init__(f'HTTP {status} for {url}')
 
+
+class FetchError(Exception):
+    """Raised when a URL still fails after the attempts a fetch makes in place.
+
+    Callers reschedule the work after ``retry_after`` seconds instead of
+    holding a worker while they wait.
+    """
+
+    def __init__(self, url: str, retry_after: float = 0.0, message: str = '') -> None:
+        self.url = url
+        self.retry_after = retry_after
+        super().__init__(message or f'Failed to fetch {url}')
+
+
+class HostUnavailable(FetchError):
+    """Raised instead of fetching while the host's circuit breaker is open."""
+
+    def __init__(self, url: str, retry_after: float) -> None:
+        super().__init__(url, retry_after, f'{urlparse(url).hostname} is unavailable for {retry_after:.0f}s')
+
+
 user_agent_list = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36',
@@ -169,106 +251,588 @@ user_agent_list = [
 ]
 
 
+# Statuses and URL fragments that mean the context has been flagged
+BLOCKED_STATUSES = frozenset({403, 429, 999})
+CHALLENGE_MARKERS = ('/authwall', '/checkpoint/challenge', '/uas/login')
+
+
+class PooledContext:
+    """A browser context and its reusable page, checked out of a ContextPool."""
+
+    def __init__(self, context: BrowserContext, page: Page, user_agent: str, proxy: str | None = None) -> None:
+        self.context = context
+        self.page = page
+        self.user_agent = user_agent
+        self.proxy = proxy
+        self.uses = 0
+        self.blocked = 0
+
+    def on_request_failed(self, request: Request) -> None:
+        """Count a sub-request refused by the block profile or interceptor."""
+        if request.failure and 'ERR_BLOCKED_BY_CLIENT' in request.failure:
+            self.blocked += 1
+
+    async def close(self) -> None:
+        """Close the underlying context, ignoring a browser that is already gone."""
+        try:
+            await self.context.close()
+        except Exception:  # noqa: BLE001
+            logger.debug('Context already closed')
+
+
+class ContextPool:
+    """Reuse browser contexts across requests instead of building one per URL.
+
+    Each context gets its own User-Agent and matching Client Hints, a proxy
+    from the scraper's ProxyPool, and has the request interceptor and block
+    profile installed once. A context is retired after ``max_uses`` requests,
+    as soon as a response looks blocked or once its proxy is evicted, so IPs
+    rotate without restarting the browser. At most ``size`` contexts are
+    checked out at once; further callers wait.
+    """
+
+    def __init__(
+        self,
+        scraper: Scraper,
+        size: int,
+        max_uses: int,
+    ) -> None:
+        self.scraper = scraper
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._idle: deque[PooledContext] = deque()
+        self._slots = asyncio.Semaphore(self.size)
+        self.created = 0
+        self.recycled = 0
+
+    async def _create(self) -> PooledContext:
+        ua = random.choice(user_agent_list)
+        proxy = self.scraper.proxies.choose()
+        browser = await self.scraper.get_browser()
+        context = await browser.new_context(
+            user_agent=ua,
+            extra_http_headers=ua_to_client_hints(ua),
+            proxy=proxy_settings(proxy) if proxy else None,
+        )
+        # An installed block profile stands in for the interceptor, so requests never pause in Python
+        if self.scraper.request_interceptor is not None and self.scraper.block_profile is None:
+            await context.route('**/*', self.scraper.request_interceptor)
+        page = await context.new_page()
+        if self.scraper.block_profile is not None:
+            await install(page, self.scraper.block_profile, self.scraper.block_stats)
+        slot = PooledContext(context, page, ua, proxy)
+        # Only failed requests reach Python, so this costs nothing for the ones allowed through
+        page.on('requestfailed', slot.on_request_failed)
+        self.created += 1
+        return slot
+
+    async def acquire(self) -> PooledContext:
+        """Return an idle context, creating one if none is idle."""
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.popleft()
+        try:
+            return await self._create()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, slot: PooledContext, healthy: bool) -> None:
+        """Return a context to the pool, or close it if it is spent or blocked."""
+        try:
+            slot.uses += 1
+            if healthy and slot.uses < self.max_uses and self.scraper.proxies.available(slot.proxy):
+                self._idle.append(slot)
+                return
+            if not healthy:
+                logger.info('Recycling blocked context (%s)', slot.user_agent)
+            self.recycled += 1
+            await slot.close()
+        finally:
+            self._slots.release()
+
+    async def clear(self) -> None:
+        """Close every idle context."""
+        while self._idle:
+            await self._idle.popleft().close()
+
+
+def endpoint_of(url: str) -> str:
+    """Return the host and first two path segments of url, for grouping latencies."""
+    parsed = urlparse(url)
+    segments = [segment for segment in parsed.path.split('/') if segment][:2]
+    return '/'.join([parsed.hostname or '', *segments])
+
+
+def classify(url: str, status: int | None) -> str:
+    """Return whether a navigation that ended on url with status was ok, an error, blocked or a challenge."""
+    if status is None:
+        return FAILED
+    if status in BLOCKED_STATUSES:
+        return BLOCKED
+    if any(marker in url for marker in CHALLENGE_MARKERS):
+        return CHALLENGE
+    return ERROR if status >= 400 else OK
+
+
+def is_healthy(page: Page, response: Response | None) -> bool:
+    """Return whether a navigation left the context usable for more requests."""
+    return classify(page.url, None if response is None else response.status) in (OK, ERROR)
+
+
+def is_failure(outcome: str, status: int | None) -> bool:
+    """Return whether a request counts against its host's circuit breaker: no response, a block or a 5xx."""
+    return outcome in (BLOCKED, CHALLENGE, FAILED) or (status is not None and status >= 500)
+
+
+async def transfer_size(response: Response) -> int:
+    """Return the bytes received for a response, or its Content-Length if Chromium has no count."""
+    try:
+        sizes = await response.request.sizes()
+    except PlaywrightError:
+        return int(response.headers.get('content-length') or 0)
+    return sizes['responseHeadersSize'] + sizes['responseBodySize']
+
+
 class Scraper:
-    """A web scraper that maintains a reusable Playwright browser instance."""
+    """A web scraper that maintains a reusable Playwright browser instance.
+
+    Playwright runs on an asyncio loop in a private thread so that several
+    pages can load at once. The public methods block the calling thread
+    until their result is ready, so RQ jobs and parsers call them like
+    ordinary functions. Concurrency is bounded by the context pool and by
+    ``per_host`` simultaneous requests to any one host, and every request
+    first takes a token from the host's shared rate limiter. Requests go
+    through the ``SCRAPER_PROXIES`` endpoints, chosen per context by health.
+
+    When ``ready_selector`` returns a selector for a URL, the page is
+    returned as soon as that selector is attached after DOMContentLoaded,
+    instead of waiting for the network to go idle. When ``extract_script``
+    returns a script, it is evaluated in the page and its records are
+    returned as Extracted instead of the serialized DOM. URLs ``read_raw``
+    accepts skip the DOM entirely and return their body as RawResponse.
+    Successful responses are saved in the on-disk ResponseCache, which
+    fetches with retries check first. Every request is logged with its
+    timings, size and outcome and added to the shared telemetry.
+    """
+
+    def __init__(
+        self,
+        request_interceptor: Callable | None = None,
+        *,
+        use_http: Callable[[str], bool] | None = None,
+        block_profile: BlockProfile | None = None,
+        ready_selector: Callable[[str], str | None] | None = None,
+        extract_script: Callable[[str], str | None] | None = None,
+        read_raw: Callable[[str], bool] | None = None,
+        name: str = '',
+        pool_size: int | None = None,
+        max_uses: int | None = None,
+        per_host: int | None = None,
+        cache: 'ResponseCache | None' = None,
+    ) -> None:
+        from sisyphus.searches.cache import response_cache  # noqa: PLC0415
+        from sisyphus.searches.http import HttpClient  # noqa: PLC0415
 
-    def __init__(self, request_interceptor: Callable | None = None) -> None:
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
+        # Held while launching, so concurrent first fetches share one browser
+        self._browser_lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._host_limits: dict[str | None, asyncio.Semaphore] = {}
 
         self.request_interceptor = request_interceptor
+        self.use_http = use_http
+        self.cache = response_cache if cache is None else cache
+        self.proxies = ProxyPool()
+        self.http = HttpClient(proxies=self.proxies)
+        self.block_profile = block_profile if settings.SCRAPER_BLOCK_RESOURCES else None
+        self.block_stats = BlockStats() if settings.SCRAPER_BLOCK_STATS else None
+        self.ready_selector = ready_selector
+        self.extract_script = extract_script
+        self.read_raw = read_raw
+        self.name = name
+        self.latency: dict[str, Histogram] = {}
+        self.pool_size = settings.SCRAPER_POOL_SIZE if pool_size is None else pool_size
+        self.max_uses = settings.SCRAPER_CONTEXT_MAX_USES if max_uses is None else max_uses
+        self.per_host = settings.SCRAPER_PER_HOST_CONCURRENCY if per_host is None else per_host
+        self.pool = ContextPool(self, self.pool_size, self.max_uses)
 
-    @property
-    def browser(self) -> Browser:
+    def _submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule a coroutine on the scraper's loop, starting the loop if needed."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='scraper-loop', daemon=True)
+            self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the scraper's loop and wait for its result."""
+        return self._submit(coro).result()
+
+    async def get_browser(self) -> Browser:
         """Return the browser instance, launching one if needed."""
-        if self._browser is None or not self._browser.is_connected():
-            self._ensure_playwright()
-            assert self._playwright is not None
-            logger.info('Launching browser')
-            launch_kwargs: dict[str, object] = {'headless': True}
-            proxy = getattr(settings, 'PROXY', None)
-            if proxy:
-                parsed = urlparse(proxy)
-                proxy_config: dict[str, str] = {
-                    'server': f'{parsed.scheme}://{parsed.hostname}:{parsed.port}',
-                }
-                if parsed.username:
-                    proxy_config['username'] = parsed.username
-                if parsed.password:
-                    proxy_config['password'] = parsed.password
-                launch_kwargs['proxy'] = proxy_config
-            self._browser = self._playwright.chromium.launch(**launch_kwargs)
-        return self._browser
-
-    def restart_browser(self) -> None:
-        """Close and relaunch the browser to rotate the proxy IP."""
-        if self._browser is not None:
-            logger.info('Restarting browser for proxy rotation')
-            self._browser.close()
-            self._browser = None
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = await self._launch_browser()
+            return self._browser
 
-    def _ensure_playwright(self) -> None:
-        """Start the Playwright instance if not already running."""
+    async def _launch_browser(self) -> Browser:
         if self._playwright is None:
-            self._playwright = sync_playwright().start()
+            self._playwright = await async_playwright().start()
+        # Contexts die with their browser
+        await self.pool.clear()
+        logger.info('Launching browser')
+        launch_kwargs: dict[str, object] = {'headless': True}
+        if self.proxies:
+            # Every context sets its own proxy; some platforms only allow that if the launch sets one too
+            launch_kwargs['proxy'] = {'server': 'http://per-context'}
+        return await self._playwright.chromium.launch(**launch_kwargs)
 
-    def get(self, url: str, *, raise_exception: bool = False, wait_until: str = 'networkidle') -> str:
-        ua = random.choice(user_agent_list)
-        context = self.browser.new_context(
-            user_agent=ua,
-            extra_http_headers=ua_to_client_hints(ua),
-        )
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).hostname
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(max(1, self.per_host))
+        return self._host_limits[host]
+
+    async def _wait_ready(self, page: Page, selector: str) -> None:
+        """Wait for selector to be attached, falling back to a bounded networkidle wait."""
+        timeout = settings.SCRAPER_READY_TIMEOUT * 1000
         try:
-            page = context.new_page()
-            if self.request_interceptor is not None:
-                page.route('**/*', self.request_interceptor)
-            logger.info('GET %s', url)
-            response = page.goto(url, wait_until=wait_until)
-            if response is None or response.status >= 400:
-                if raise_exception is True:
-                    status = 0 if response is None else response.status
-                    raise HttpError(url, status)
-                return None
-            return page.content()
-        finally:
-            context.close()
+            await page.wait_for_selector(selector, state='attached', timeout=timeout)
+        except PlaywrightTimeoutError:
+            logger.warning('%s not found on %s, waiting for networkidle', selector, page.url)
+            try:
+                await page.wait_for_load_state('networkidle', timeout=timeout)
+            except PlaywrightTimeoutError:
+                logger.warning('%s never went idle, using the page as is', page.url)
 
-    def get_with_retry(
+    def observe(self, url: str, seconds: float) -> None:
+        """Record a page load time under its endpoint."""
+        endpoint = endpoint_of(url)
+        if endpoint not in self.latency:
+            self.latency[endpoint] = Histogram()
+        self.latency[endpoint].observe(seconds)
+
+    def latency_summary(self) -> dict[str, dict[str, float]]:
+        return {endpoint: histogram.summary() for endpoint, histogram in sorted(self.latency.items())}
+
+    async def fetch(
         self,
         url: str,
         *,
+        raise_exception: bool = False,
         wait_until: str = 'networkidle',
-        max_retries: int = 8,
+        raw: bool | None = None,
+    ) -> PageResult:
+        """Load a URL in a pooled context and return the rendered HTML, extracted records or raw body."""
+        raw = self.reads_raw(url) if raw is None else raw
+        selector = self.ready_selector(url) if self.ready_selector is not None else None
+        script = self.extract_script(url) if self.extract_script is not None else None
+        host = urlparse(url).hostname
+        sample = RequestTelemetry(url, self.name)
+        async with self._host_limit(url):
+            await rate_limiter.wait(host)
+            start = time.perf_counter()
+            slot = await self.pool.acquire()
+            sample.context_seconds = time.perf_counter() - start
+            blocked = slot.blocked
+            healthy = False
+            status = None
+            start = time.perf_counter()
+            try:
+                if raw:
+                    # body() waits for the rest of the response itself
+                    response = await slot.page.goto(url, wait_until='commit')
+                elif selector is None:
+                    response = await slot.page.goto(url, wait_until=wait_until)
+                else:
+                    response = await slot.page.goto(url, wait_until='domcontentloaded')
+                sample.navigation_seconds = time.perf_counter() - start
+                if not raw and selector is not None and response is not None and response.status < 400:
+                    await self._wait_ready(slot.page, selector)
+                self.observe(url, time.perf_counter() - start)
+                healthy = is_healthy(slot.page, response)
+                status = None if response is None else response.status
+                sample.status = status
+                sample.outcome = classify(slot.page.url, status)
+                if response is None or response.status >= 400:
+                    if raise_exception is True:
+                        status = 0 if response is None else response.status
+                        raise HttpError(url, status)
+                    return None
+                if raw:
+                    content_type = response.headers.get('content-type', '')
+                    result = RawResponse(await response.body(), content_type, response.status)
+                elif script is not None:
+                    records = await slot.page.evaluate(script)
+                    verify = random.random() < settings.SCRAPER_EXTRACT_VERIFY_RATE
+                    result = Extracted(records, await slot.page.content() if verify else None)
+                else:
+                    result = await slot.page.content()
+                sample.bytes = await transfer_size(response)
+            finally:
+                elapsed = time.perf_counter() - start
+                # Whatever follows navigation is readiness: the selector wait, extraction and reading the body
+                if sample.navigation_seconds:
+                    sample.ready_seconds = elapsed - sample.navigation_seconds
+                else:
+                    sample.navigation_seconds = elapsed
+                sample.blocked = slot.blocked - blocked
+                self.proxies.record(slot.proxy, status, elapsed, not healthy)
+                await self.pool.release(slot, healthy)
+                await self._record_host(host, sample)
+                await self._report(sample)
+        # A challenge page served with a good status is returned, but never cached
+        if healthy:
+            await self._store(url, raw, result)
+        return result
+
+    async def fetch_http(self, url: str, *, raw: bool = False) -> str | RawResponse | None:
+        """Fetch a URL without a browser, raising BrowserFallback if it needs one."""
+        host = urlparse(url).hostname
+        sample = RequestTelemetry(url, self.name, via=HTTP)
+        async with self._host_limit(url):
+            await rate_limiter.wait(host)
+            start = time.perf_counter()
+            try:
+                result = await self.http.fetch_raw(url, sample) if raw else await self.http.fetch(url, sample)
+            finally:
+                sample.navigation_seconds = time.perf_counter() - start
+                await self._record_host(host, sample)
+                await self._report(sample)
+        await self._store(url, raw, result)
+        return result
+
+    async def _record_host(self, host: str | None, sample: RequestTelemetry) -> None:
+        """Report a request's outcome to its host's circuit breaker."""
+        failed = is_failure(sample.outcome, sample.status)
+        await asyncio.to_thread(breaker.record_failure if failed else breaker.record_success, host)
+
+    async def _report(self, sample: RequestTelemetry) -> None:
+        """Log a finished request and add it to the telemetry aggregates."""
+        logger.log(
+            logging.DEBUG if sample.via == CACHE else logging.INFO,
+            'GET %s via %s: %s %s, %d KB, %d blocked, context %.2fs, navigation %.2fs, ready %.2fs',
+            sample.url,
+            sample.via,
+            sample.status or '-',
+            sample.outcome,
+            sample.bytes // 1024,
+            sample.blocked,
+            sample.context_seconds,
+            sample.navigation_seconds,
+            sample.ready_seconds,
+            extra={'telemetry': sample.summary()},
+        )
+        if telemetry.record(sample):
+            await asyncio.to_thread(telemetry.flush)
+
+    async def _store(self, url: str, raw: bool, result: PageResult) -> None:
+        """Save a successful result in the response cache."""
+        if self.cache.enabled and result is not None:
+            # Writing entries off the loop, so they do not hold up the other fetches
+            await asyncio.to_thread(self.cache.put, url, self.request_kind(url, raw), result)
+
+    def reads_raw(self, url: str) -> bool:
+        """Return whether url should be returned as an undecoded body."""
+        return self.read_raw is not None and self.read_raw(url)
+
+    def request_kind(self, url: str, raw: bool) -> str:
+        """Return what a fetch of url asks for, which together with the URL addresses its cached result."""
+        if raw:
+            return 'raw'
+        if self.extract_script is not None and (script := self.extract_script(url)) is not None:
+            return f'extract:{hashlib.sha1(script.encode()).hexdigest()[:12]}'
+        return 'html'
+
+    def prefers_http(self, url: str) -> bool:
+        """Return whether url should try the HTTP fast path first."""
+        return settings.SCRAPER_HTTP_FAST_PATH and self.use_http is not None and self.use_http(url)
+
+    async def fetch_with_retry(
+        self,
+        url: str,
+        *,
+        wait_until: str = 'networkidle',
+        max_retries: int | None = None,
         base_delay: float = 1.0,
-    ) -> str:
-        """Get a URL with exponential backoff, restarting the browser between retries."""
-        for attempt in range(max_retries + 1):
+        raw: bool | None = None,
+    ) -> PageResult:
+        """Fetch a URL, retrying briefly in place, unless the response cache holds it.
+
+        URLs the parser serves over plain HTTP try that first and only load
+        in the browser if it is blocked. A failed attempt is retried up to
+        ``max_retries`` times, SCRAPER_FETCH_RETRIES by default, with backoff
+        capped at SCRAPER_RETRY_MAX_DELAY seconds; a failed browser attempt
+        already recycles its context, so the retry gets a fresh proxy.
+        Raises HostUnavailable while the host's circuit breaker is open and
+        FetchError once the attempts run out, so that callers reschedule
+        their work rather than wait here.
+        """
+        from sisyphus.searches.http import BrowserFallback  # noqa: PLC0415
+
+        host = urlparse(url).hostname
+        raw = self.reads_raw(url) if raw is None else raw
+        if self.cache.enabled:
+            kind = self.request_kind(url, raw)
+            if (cached := await asyncio.to_thread(self.cache.get, url, kind)) is not None:
+                sample = RequestTelemetry(url, self.name, via=CACHE)
+                sample.outcome = OK
+                await self._report(sample)
+                return cached
+        retries = settings.SCRAPER_FETCH_RETRIES if max_retries is None else max_retries
+        for attempt in range(retries + 1):
+            if not await asyncio.to_thread(breaker.allow, host):
+                raise HostUnavailable(url, await asyncio.to_thread(breaker.retry_after, host))
+            if attempt == 0 and self.prefers_http(url):
+                try:
+                    return await self.fetch_http(url, raw=raw)
+                except BrowserFallback as exc:
+                    logger.info('Falling back to browser for %s: %s', url, exc)
             try:
-                return self.get(url, wait_until=wait_until)
+                return await self.fetch(url, wait_until=wait_until, raw=raw)
             except Exception:
-                delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
+                if attempt == retries:
+                    break
+                delay = min(base_delay * (2 ** attempt), settings.SCRAPER_RETRY_MAX_DELAY) + random.uniform(0, 1)
                 logger.warning(
                     'Attempt %d/%d failed for %s, retrying in %.1fs',
                     attempt + 1,
-                    max_retries + 1,
+                    retries + 1,
                     url,
                     delay,
                 )
-                time.sleep(delay)
-                self.restart_browser()
+                await asyncio.sleep(delay)
         logger.warning('Max retries for %s exceeded', url)
-        return None
+        raise FetchError(url)
 
-    def close(self) -> None:
-        """Shut down the browser and Playwright instances."""
+    async def _fetch_settled(self, url: str, **kwargs: Any) -> PageResult | FetchError:
+        """Fetch with retries, returning rather than raising a FetchError so one URL cannot fail a batch."""
+        try:
+            return await self.fetch_with_retry(url, **kwargs)
+        except FetchError as exc:
+            return exc
+
+    def get(self, url: str, *, raise_exception: bool = False, wait_until: str = 'networkidle') -> PageResult:
+        return self._run(self.fetch(url, raise_exception=raise_exception, wait_until=wait_until))
+
+    def get_with_retry(
+        self,
+        url: str,
+        *,
+        wait_until: str = 'networkidle',
+        max_retries: int | None = None,
+        base_delay: float = 1.0,
+    ) -> PageResult:
+        """Get a URL with exponential backoff between retries, raising FetchError if it keeps failing."""
+        return self._run(
+            self.fetch_with_retry(url, wait_until=wait_until, max_retries=max_retries, base_delay=base_delay)
+        )
+
+    def get_body(self, url: str, *, max_retries: int | None = None, base_delay: float = 1.0) -> RawResponse | None:
+        """Get the undecoded body and content type of a URL, with retries."""
+        return self._run(self.fetch_with_retry(url, max_retries=max_retries, base_delay=base_delay, raw=True))
+
+    def get_many(self, urls: list[str], *, wait_until: str = 'networkidle') -> list[PageResult | FetchError]:
+        """Get several URLs concurrently, with retries, returning results in the same order.
+
+        A URL that keeps failing has its FetchError in place of a result.
+        """
+
+        async def gather() -> list[PageResult | FetchError]:
+            return await asyncio.gather(*(self._fetch_settled(url, wait_until=wait_until) for url in urls))
+
+        return self._run(gather())
+
+    def iter_many(
+        self,
+        urls: Iterable[str],
+        window: int,
+        *,
+        wait_until: str = 'networkidle',
+    ) -> Iterator[tuple[str, PageResult | FetchError]]:
+        """Yield (url, result) in order, keeping up to ``window`` fetches in flight.
+
+        Unlike get_many, a slow page only holds up the pages after it rather
+        than a whole batch. As there, a URL that keeps failing yields its
+        FetchError. Fetches still pending when the caller stops iterating
+        are cancelled.
+        """
+        pending: deque[tuple[str, Future]] = deque()
+        try:
+            for url in urls:
+                pending.append((url, self._submit(self._fetch_settled(url, wait_until=wait_until))))
+                if len(pending) >= max(1, window):
+                    url, future = pending.popleft()
+                    yield url, future.result()
+            while pending:
+                url, future = pending.popleft()
+                yield url, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def _close(self) -> None:
+        await self.http.close()
+        await asyncio.to_thread(telemetry.flush)
+        for endpoint, summary in self.latency_summary().items():
+            logger.info(
+                '%s %s: %d loads, p50 %.2fs, p95 %.2fs',
+                self.name or 'scraper',
+                endpoint,
+                summary['count'],
+                summary['p50'],
+                summary['p95'],
+            )
+        for proxy, summary in self.proxies.summary().items():
+            logger.info(
+                'Proxy %s: %d requests, %d failed, score %.2f, latency %.2fs',
+                proxy,
+                summary['requests'],
+                summary['failures'],
+                summary['score'],
+                summary['latency'],
+            )
+        if self.block_stats is not None and self.block_stats.blocked:
+            stats = self.block_stats.summary()
+            logger.info(
+                'Blocked %d requests (~%d KB saved), allowed %d (%d KB)',
+                stats['blocked'],
+                stats['bytes_saved'] // 1024,
+                stats['allowed'],
+                stats['allowed_bytes'] // 1024,
+            )
         if self._browser is not None:
             logger.info('Closing browser')
-            self._browser.close()
+            await self.pool.clear()
+            await self._browser.close()
             self._browser = None
         if self._playwright is not None:
-            self._playwright.stop()
+            await self._playwright.stop()
             self._playwright = None
 
+    def close(self) -> None:
+        """Shut down the browser, Playwright and the event loop thread."""
+        if self._loop is None:
+            return
+        try:
+            self._run(self._close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            # Locks and semaphores are bound to the loop that just closed
+            self._browser_lock = asyncio.Lock()
+            self._host_limits.clear()
+            self.pool = ContextPool(self, self.pool_size, self.max_uses)
+
     def __enter__(self) -> Scraper:
         return self
 
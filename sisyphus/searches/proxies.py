@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest request in an endpoint's rolling score
+_DECAY = 0.2
+
+# Requests an endpoint serves before its score can evict it
+_MIN_SAMPLES = 5
+
+
+def proxy_settings(url: str) -> dict[str, str]:
+    """Return a proxy URL as Playwright's proxy option, with credentials split out."""
+    parsed = urlparse(url)
+    config = {'server': f'{parsed.scheme}://{parsed.hostname}:{parsed.port}'}
+    if parsed.username:
+        config['username'] = parsed.username
+    if parsed.password:
+        config['password'] = parsed.password
+    return config
+
+
+def label(url: str) -> str:
+    """Return a proxy URL without its credentials, for logs."""
+    return proxy_settings(url)['server']
+
+
+class ProxyHealth:
+    """Rolling health of one proxy endpoint."""
+
+    def __init__(self) -> None:
+        self.score = 1.0
+        self.latency = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.evicted_until = 0.0
+
+    def summary(self) -> dict[str, float]:
+        return {
+            'score': round(self.score, 3),
+            'latency': round(self.latency, 3),
+            'requests': self.requests,
+            'failures': self.failures,
+            'evicted': self.evicted_until > time.monotonic(),
+        }
+
+
+class ProxyPool:
+    """Proxy endpoints handed out per browser context, weighted by their health.
+
+    Every request scores its endpoint: a blocked response, error status or
+    failed load scores 0, and a good response scores 1, less the further it
+    runs past ``SCRAPER_PROXY_SLOW_SECONDS``. Scores are an exponential moving
+    average, so recent requests count most. An endpoint whose score falls
+    below ``SCRAPER_PROXY_MIN_SCORE`` is evicted for
+    ``SCRAPER_PROXY_EVICT_SECONDS`` and then comes back on probation with a
+    fresh score. If every endpoint is evicted, the one due back soonest is
+    used rather than none. Health is kept per scraper, in memory.
+    """
+
+    def __init__(self, urls: list[str] | None = None) -> None:
+        urls = settings.SCRAPER_PROXIES if urls is None else urls
+        self.health: dict[str, ProxyHealth] = {url: ProxyHealth() for url in dict.fromkeys(urls)}
+
+    def __bool__(self) -> bool:
+        return bool(self.health)
+
+    def available(self, url: str | None) -> bool:
+        """Return whether url may take more requests; no proxy always may."""
+        if url is None or url not in self.health:
+            return True
+        health = self.health[url]
+        if health.evicted_until and health.evicted_until <= time.monotonic():
+            logger.info('Proxy %s back on probation', label(url))
+            health.evicted_until = 0.0
+            health.score = settings.SCRAPER_PROXY_MIN_SCORE + (1 - settings.SCRAPER_PROXY_MIN_SCORE) / 2
+            health.requests = 0
+        return not health.evicted_until
+
+    def choose(self) -> str | None:
+        """Return an endpoint for a new context, favouring healthier ones, or None without proxies."""
+        if not self.health:
+            return None
+        candidates = [url for url in self.health if self.available(url)]
+        if not candidates:
+            return min(self.health, key=lambda url: self.health[url].evicted_until)
+        weights = [max(self.health[url].score, 0.01) for url in candidates]
+        return random.choices(candidates, weights)[0]
+
+    def record(self, url: str | None, status: int | None, seconds: float, blocked: bool) -> None:
+        """Score a request made through url, evicting the endpoint once its score is too low."""
+        if url is None or url not in self.health:
+            return
+        health = self.health[url]
+        health.requests += 1
+        health.latency = seconds if health.requests == 1 else (1 - _DECAY) * health.latency + _DECAY * seconds
+        if blocked or status is None or status >= 500:
+            health.failures += 1
+            sample = 0.0
+        else:
+            sample = min(1.0, settings.SCRAPER_PROXY_SLOW_SECONDS / seconds) if seconds > 0 else 1.0
+        health.score = (1 - _DECAY) * health.score + _DECAY * sample
+        if (
+            not health.evicted_until
+            and health.requests >= _MIN_SAMPLES
+            and health.score < settings.SCRAPER_PROXY_MIN_SCORE
+        ):
+            health.evicted_until = time.monotonic() + settings.SCRAPER_PROXY_EVICT_SECONDS
+            logger.warning(
+                'Evicting proxy %s for %ds (score %.2f)',
+                label(url),
+                settings.SCRAPER_PROXY_EVICT_SECONDS,
+                health.score,
+            )
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {label(url): health.summary() for url, health in self.health.items()}
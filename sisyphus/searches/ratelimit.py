@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from sisyphus.core.stores import RedisStore
+
+logger = logging.getLogger(__name__)
+
+# User whose requests are being made, for sharing each host fairly between users
+current_user: ContextVar[str] = ContextVar('rate_limit_user', default='')
+
+# Longest single sleep while waiting, so a change in the number of active users is noticed
+_MAX_SLEEP = 1.0
+
+# KEYS: host bucket, user bucket, active users of the host
+# ARGV: rate, burst, now, user, active window
+# Returns 0 once a token is taken from both buckets, else the milliseconds until one could be.
+_ACQUIRE = """
+local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local window = tonumber(ARGV[5])
+redis.call('ZADD', KEYS[3], now, ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now - window)
+redis.call('EXPIRE', KEYS[3], math.ceil(window))
+local users = redis.call('ZCARD', KEYS[3])
+
+local function refill(key, bucket_rate, bucket_burst)
+    local state = redis.call('HMGET', key, 'tokens', 'at')
+    local tokens = tonumber(state[1]) or bucket_burst
+    local at = tonumber(state[2]) or now
+    return math.min(bucket_burst, tokens + math.max(0, now - at) * bucket_rate)
+end
+
+local user_rate = rate / users
+local user_burst = math.max(1, burst / users)
+local host_tokens = refill(KEYS[1], rate, burst)
+local user_tokens = refill(KEYS[2], user_rate, user_burst)
+
+local wait = 0
+if host_tokens >= 1 and user_tokens >= 1 then
+    host_tokens = host_tokens - 1
+    user_tokens = user_tokens - 1
+else
+    wait = math.max((1 - host_tokens) / rate, (1 - user_tokens) / user_rate)
+end
+
+local ttl = math.ceil(burst / rate + window)
+redis.call('HSET', KEYS[1], 'tokens', host_tokens, 'at', now)
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('HSET', KEYS[2], 'tokens', user_tokens, 'at', now)
+redis.call('EXPIRE', KEYS[2], ttl)
+return math.ceil(wait * 1000)
+"""
+
+
+@contextmanager
+def rate_limit_user(user: object) -> Iterator[None]:
+    """Attribute the requests made inside the block to user."""
+    token = current_user.set(str(user))
+    try:
+        yield
+    finally:
+        current_user.reset(token)
+
+
+class HostRateLimiter(RedisStore):
+    """Token bucket per host in Redis, shared by every scraper in every worker.
+
+    Each host refills at ``SCRAPER_RATE_LIMIT`` requests per second, or its
+    entry in ``SCRAPER_HOST_RATES``, and holds up to ``SCRAPER_RATE_BURST``
+    tokens. Users who requested the host within ``SCRAPER_RATE_USER_WINDOW``
+    seconds split the rate evenly, each drawing from their own bucket as
+    well, so one user's many searches cannot starve another's. Time spent
+    waiting and the number of throttled requests are counted per host.
+    Redis errors let requests through unthrottled.
+    """
+
+    def __init__(self, connection: Any = None) -> None:
+        super().__init__(connection)
+        self._script: Any = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the limiter is turned on in settings."""
+        return settings.SCRAPER_RATE_LIMIT > 0
+
+    def rate(self, host: str) -> float:
+        """Return the requests per second allowed to host."""
+        return float(settings.SCRAPER_HOST_RATES.get(host, settings.SCRAPER_RATE_LIMIT))
+
+    def key(self, host: str, *parts: str) -> str:
+        return ':'.join(['sisyphus:ratelimit', host, *parts])
+
+    def try_acquire(self, host: str, user: str = '') -> float:
+        """Take a token for a request to host and return 0, or return the seconds until one is due."""
+        if self._script is None or self._script.registered_client is not self.connection:
+            self._script = self.connection.register_script(_ACQUIRE)
+        keys = [self.key(host), self.key(host, 'user', user), self.key(host, 'users')]
+        args = [self.rate(host), settings.SCRAPER_RATE_BURST, time.time(), user, settings.SCRAPER_RATE_USER_WINDOW]
+        try:
+            return int(self._script(keys=keys, args=args)) / 1000
+        except RedisError:
+            logger.warning('Rate limiter unavailable, not throttling %s', host, exc_info=True)
+            return 0.0
+
+    async def wait(self, host: str | None) -> float:
+        """Wait until a request to host is allowed and return the seconds waited."""
+        if not self.enabled or not host:
+            return 0.0
+        user = current_user.get()
+        start = time.perf_counter()
+        throttled = False
+        while (delay := await asyncio.to_thread(self.try_acquire, host, user)) > 0:
+            throttled = True
+            await asyncio.sleep(min(delay, _MAX_SLEEP))
+        waited = time.perf_counter() - start
+        if throttled:
+            logger.debug('Throttled request to %s for %.2fs', host, waited)
+            self.record(host, waited)
+        return waited
+
+    def record(self, host: str, waited: float) -> None:
+        """Count a throttled request and the time it waited."""
+        try:
+            pipe = self.connection.pipeline()
+            pipe.hincrby(self.key(host, 'stats'), 'throttled', 1)
+            pipe.hincrbyfloat(self.key(host, 'stats'), 'wait_seconds', waited)
+            pipe.execute()
+        except RedisError:
+            logger.warning('Could not record rate limiter stats for %s', host, exc_info=True)
+
+    def stats(self, host: str) -> dict[str, float]:
+        """Return how many requests to host were throttled and how long they waited in total."""
+        stored = self.connection.hgetall(self.key(host, 'stats'))
+        return {
+            'throttled': int(stored.get(b'throttled', 0)),
+            'wait_seconds': round(float(stored.get(b'wait_seconds', 0)), 3),
+        }
+
+
+rate_limiter = HostRateLimiter()
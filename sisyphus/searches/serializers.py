@@ -14,9 +14,12 @@ class SearchSerializer(serializers.ModelSerializer):
             'uuid', 'keywords', 'location', 'source',
             'easy_apply', 'is_hybrid', 'is_onsite', 'is_remote',
             'is_active', 'schedule', 'status', 'last_executed_at',
+            'job_count', 'job_count_at',
             'created_at', 'updated_at',
         )
-        read_only_fields = ('uuid', 'status', 'last_executed_at', 'created_at', 'updated_at')
+        read_only_fields = (
+            'uuid', 'status', 'last_executed_at', 'job_count', 'job_count_at', 'created_at', 'updated_at',
+        )
 
     def validate(self, data):
         user = self.context['request'].user.profile
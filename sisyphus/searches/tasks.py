@@ -1,17 +1,47 @@
 import logging
+import time
+from datetime import datetime, timedelta
+from itertools import batched
+from urllib.parse import urlparse
 
 import django_rq
+from django.conf import settings
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
 
-@django_rq.job
-def run_search(search_id: int) -> dict:
-    """Execute a search using its source's parser."""
+@django_rq.job('scrape')
+def run_search(
+    search_id: int,
+    attempt: int = 0,
+    period: int | None = None,
+    after: int | None = None,
+    found: int = 0,
+    newest: datetime | None = None,
+) -> dict:
+    """Execute a search using its source's parser.
+
+    A search whose host's circuit breaker is open is deferred until it lets
+    a probe through, and one whose pages failed to load is rescheduled,
+    up to SEARCH_RETRIES times, to resume with the same period after the
+    last page it ingested, rather than retrying in the worker. The listings
+    ``found`` and the ``newest`` posting date of earlier attempts are
+    carried along, and the watermark and job count only move once the
+    whole search has loaded, so resumed pages are judged against the
+    watermark the search started with.
+    """
+    from sisyphus.core.pipeline import Stage  # noqa: PLC0415
+    from sisyphus.jobs.cache import identity_scope  # noqa: PLC0415
     from sisyphus.jobs.models import Job  # noqa: PLC0415
+    from sisyphus.searches.breaker import breaker  # noqa: PLC0415
+    from sisyphus.searches.fanin import shared_results  # noqa: PLC0415
     from sisyphus.searches.models import Search, SearchRun  # noqa: PLC0415
     from sisyphus.searches.parsers import PARSERS  # noqa: PLC0415
+    from sisyphus.searches.parsers.base import PageError  # noqa: PLC0415
+    from sisyphus.searches.playwright import FetchError  # noqa: PLC0415
+    from sisyphus.searches.ratelimit import rate_limit_user  # noqa: PLC0415
+    from sisyphus.searches.telemetry import RUN, telemetry, telemetry_run  # noqa: PLC0415
 
     search = Search.objects.select_related('source', 'location').get(id=search_id)
 
@@ -23,30 +53,108 @@ def run_search(search_id: int) -> dict:
         search.set_status(Search.Status.ERROR)
         return {'error': f'Unknown parser: {search.source.parser}'}
 
+    parser = parser_cls()
+    if period is None:
+        period = search.calculate_period()
+    host = urlparse(parser.get_page_url(search, 1, period)).hostname
+    if breaker.state(host) == breaker.OPEN:
+        delay = breaker.retry_after(host)
+        logger.info('Search %s deferred %.0fs while %s is unavailable', search_id, delay, host)
+        enqueue_search(
+            search_id,
+            search.user_id,
+            attempt=attempt,
+            delay=delay,
+            period=period,
+            after=after,
+            found=found,
+            newest=newest,
+        )
+        search.set_status(Search.Status.QUEUED)
+        return {'deferred': True, 'search_id': search_id, 'retry_in': delay}
+
     search.set_status(Search.Status.RUNNING)
-    period = search.calculate_period()
     run = SearchRun.objects.create(search=search, period=period)
-    parser = parser_cls()
 
+    # Pages load and parse on a producer thread while earlier pages are ingested here
+    pages = shared_results.iter_jobs(parser, search, period, after=after)
+    stage = Stage(pages, settings.SEARCH_INGEST_QUEUE_SIZE, name=f'search-{search_id}')
+    retry: FetchError | None = None
+    ingested = after
     try:
-        if parser.name == 'hiringcafe':
-            start = 0
-            state = parser.generate_state(search, period)
-            page_count = parser.get_page_count(state)
-        else:
-            start = 1
-            page_count = parser.get_page_count(search)
-
-        for page in range(start, page_count + 1):
+        stale_pages = 0
+        run.stop_reason = SearchRun.StopReason.EXHAUSTED
+        with identity_scope(f'search {search_id}'), rate_limit_user(search.user_id), telemetry_run(run.id), stage:
             try:
-                jobs = parser.parse(search, page=page, period=period)
-                run.jobs_found += len(jobs)
-                run.jobs_created += Job.objects.add_jobs(jobs, run)
-            except Exception:
-                break
+                for page, jobs in stage:
+                    run.last_page = page
+                    start = time.perf_counter()
+                    try:
+                        run.jobs_found += len(jobs)
+                        counts = Job.objects.ingest_jobs(jobs, run, watermark=search.watermark)
+                        run.jobs_created += counts['created']
+                        logger.info(
+                            'Search %s page %d: %d created, %d existing, %d skipped, novelty %.2f',
+                            search_id,
+                            page,
+                            counts['created'],
+                            counts['existing'],
+                            counts['skipped'],
+                            1 - counts['known'] / len(jobs) if jobs else 0.0,
+                        )
+                        ingested = page
+                    except Exception:
+                        logger.exception('Search %s page %d failed', search_id, page)
+                        run.stop_reason = SearchRun.StopReason.PAGE_ERROR
+                        break
+                    finally:
+                        run.ingest_seconds += time.perf_counter() - start
+
+                    # A page is stale when nothing on it is both unknown and as new as the watermark.
+                    # Only results sorted newest first guarantee that older pages follow a stale one.
+                    stale_pages = 0 if counts['fresh'] else stale_pages + 1
+                    if (
+                        parser.sorted_by_date
+                        and settings.SEARCH_STALE_PAGE_LIMIT
+                        and stale_pages >= settings.SEARCH_STALE_PAGE_LIMIT
+                    ):
+                        logger.info('Search %s stopping after %d stale pages at page %d', search_id, stale_pages, page)
+                        run.stop_reason = SearchRun.StopReason.STALE
+                        break
+            except PageError as exc:
+                logger.exception('Search %s page %d failed', search_id, exc.page)
+                run.last_page = exc.page
+                run.stop_reason = SearchRun.StopReason.PAGE_ERROR
+                if isinstance(exc.__cause__, FetchError):
+                    retry = exc.__cause__
+            except FetchError as exc:
+                logger.exception('Search %s failed to load', search_id)
+                run.stop_reason = SearchRun.StopReason.PAGE_ERROR
+                retry = exc
 
         run.status = SearchRun.Status.SUCCESS
-        search.set_status(Search.Status.SUCCESS)
+        newest = max(filter(None, [newest, run.newest_posted()]), default=None)
+        if retry is not None and attempt < settings.SEARCH_RETRIES:
+            delay = max(retry.retry_after, settings.SEARCH_RETRY_DELAY * 2**attempt)
+            logger.info('Search %s rescheduled in %.0fs (retry %d)', search_id, delay, attempt + 1)
+            enqueue_search(
+                search_id,
+                search.user_id,
+                attempt=attempt + 1,
+                delay=delay,
+                period=period,
+                after=ingested,
+                found=found + run.jobs_found,
+                newest=newest,
+            )
+            search.set_status(Search.Status.QUEUED)
+        else:
+            # Pages a failed load left unread would be skipped as stale had the watermark moved past them
+            if retry is None:
+                search.advance_watermark(newest)
+            if run.stop_reason == SearchRun.StopReason.EXHAUSTED:
+                search.record_job_count(found + run.jobs_found)
+            search.set_status(Search.Status.SUCCESS)
     except Exception as exc:
         logger.exception('Search %s failed', search_id)
         run.status = SearchRun.Status.ERROR
@@ -54,9 +162,16 @@ def run_search(search_id: int) -> dict:
         search.set_status(Search.Status.ERROR)
         raise
     finally:
+        run.fetch_seconds = stage.produce_seconds
+        run.fetch_blocked_seconds = stage.blocked_seconds
+        run.ingest_waiting_seconds = stage.waiting_seconds
+        if telemetry.enabled:
+            telemetry.flush()
+            run.telemetry = telemetry.stats(RUN, str(run.id))
         run.completed_at = timezone.now()
         run.save()
         parser.close()
+        logger.info('Search %s stages: ingest %.3fs, %s', search_id, run.ingest_seconds, stage.summary())
 
     return {
         'search_id': search_id,
@@ -66,11 +181,10 @@ def run_search(search_id: int) -> dict:
     }
 
 
-@django_rq.job
+# Only dispatches the pipeline, so it runs with the cheap tasks rather than behind running scrapes
+@django_rq.job('maintenance')
 def execute_search(search_id: int, user_id: int) -> dict:
     """Enqueue the search pipeline as chained jobs."""
-    from rq import Callback  # noqa: PLC0415
-
     from sisyphus.searches.models import Search  # noqa: PLC0415
 
     search = Search.objects.get(id=search_id)
@@ -80,34 +194,53 @@ def execute_search(search_id: int, user_id: int) -> dict:
         return {'skipped': True, 'reason': 'Search is already in progress'}
 
     search.set_status(Search.Status.QUEUED)
-
-    queue = django_rq.get_queue()
-    scrape_job = queue.enqueue(
-        run_search,
-        search_id,
-        on_success=Callback(_on_scrape_success),
-        on_failure=Callback(_on_scrape_failure),
-        meta={'user_id': user_id, 'search_id': search_id},
-    )
+    scrape_job = enqueue_search(search_id, user_id)
 
     return {'status': 'pipeline_started', 'scrape_job_id': scrape_job.id}
 
 
+def enqueue_search(
+    search_id: int,
+    user_id: int,
+    *,
+    attempt: int = 0,
+    delay: float = 0,
+    period: int | None = None,
+    after: int | None = None,
+    found: int = 0,
+    newest: datetime | None = None,
+):
+    """Enqueue run_search with the callbacks that continue the pipeline, after delay seconds if given."""
+    from rq import Callback  # noqa: PLC0415
+
+    queue = django_rq.get_queue('scrape')
+    options = {
+        'on_success': Callback(_on_scrape_success),
+        'on_failure': Callback(_on_scrape_failure),
+        'meta': {'user_id': user_id, 'search_id': search_id},
+    }
+    args = (search_id, attempt, period, after, found, newest)
+    if delay:
+        return queue.enqueue_in(timedelta(seconds=delay), run_search, *args, **options)
+    return queue.enqueue(run_search, *args, **options)
+
+
 def _on_scrape_success(job, connection, result):
     """After run_search succeeds, enqueue the remaining pipeline steps."""
     from sisyphus.jobs.tasks import ban_jobs_with_banned_company  # noqa: PLC0415
     from sisyphus.rules.tasks import apply_all_rules  # noqa: PLC0415
 
-    if 'error' in result:
+    # A deferred or failed run continues the pipeline from the run that replaces it
+    if 'error' in result or result.get('deferred'):
         return
 
     user_id = job.meta['user_id']
     run_id = result['run_id']
-    queue = django_rq.get_queue()
+    queue = django_rq.get_queue('maintenance')
 
     rules_job = queue.enqueue(apply_all_rules, user_id)
     ban_job = queue.enqueue(ban_jobs_with_banned_company)
-    queue.enqueue(populate_jobs, run_id, depends_on=[rules_job, ban_job])
+    django_rq.get_queue('populate').enqueue(populate_jobs, run_id, depends_on=[rules_job, ban_job])
 
 
 def _on_scrape_failure(job, connection, typ, value, traceback):
@@ -123,25 +256,35 @@ def _on_scrape_failure(job, connection, typ, value, traceback):
             pass
 
 
-@django_rq.job
+def enqueue_populate_batches(job_ids: list[int]) -> int:
+    """Enqueue populate_job_batch tasks of POPULATE_BATCH_SIZE jobs and return how many were enqueued."""
+    queue = django_rq.get_queue('populate')
+    batches = 0
+    for batch in batched(job_ids, settings.POPULATE_BATCH_SIZE):
+        queue.enqueue(populate_job_batch, list(batch))
+        batches += 1
+    return batches
+
+
+@django_rq.job('populate')
 def populate_jobs(run_id: int) -> dict:
-    """Enqueue individual populate tasks for each unpopulated job in a search run."""
+    """Enqueue batched populate tasks for the new, unpopulated jobs in a search run."""
     from sisyphus.jobs.models import Job  # noqa: PLC0415
 
-    queue = django_rq.get_queue()
-    job_ids = list(Job.objects.filter(search_run_id=run_id, populated=False).values_list('id', flat=True))
+    jobs = Job.objects.filter(search_run_id=run_id, populated=False, status=Job.Status.NEW)
+    job_ids = list(jobs.values_list('id', flat=True))
+    batches = enqueue_populate_batches(job_ids)
 
-    for job_id in job_ids:
-        queue.enqueue(populate_job, job_id)
+    return {'run_id': run_id, 'enqueued': len(job_ids), 'batches': batches}
 
-    return {'run_id': run_id, 'enqueued': len(job_ids)}
 
-
-@django_rq.job
+@django_rq.job('populate')
 def populate_job(job_id: int) -> dict:
-    """Populate a single job's details from its source."""
+    """Populate a single job's details from its source, rescheduling it while the host is unavailable."""
     from sisyphus.jobs.models import Job  # noqa: PLC0415
+    from sisyphus.searches.breaker import breaker  # noqa: PLC0415
     from sisyphus.searches.parsers import PARSERS  # noqa: PLC0415
+    from sisyphus.searches.playwright import HostUnavailable  # noqa: PLC0415
 
     job = Job.objects.select_related('source').get(id=job_id)
 
@@ -152,10 +295,84 @@ def populate_job(job_id: int) -> dict:
     if parser_cls is None:
         return {'error': f'Unknown parser: {job.source.parser}'}
 
-    parser = parser_cls()
-    parser.populate_job(job)
+    host = urlparse(job.url).hostname
+    if breaker.state(host) == breaker.OPEN:
+        delay = breaker.retry_after(host)
+    else:
+        try:
+            parser_cls().populate_job(job)
+            return {'job_id': job_id}
+        except HostUnavailable as exc:
+            delay = exc.retry_after
+
+    django_rq.get_queue('populate').enqueue_in(timedelta(seconds=delay), populate_job, job_id)
+    return {'job_id': job_id, 'deferred': True, 'retry_in': delay}
+
+
+@django_rq.job('populate')
+def populate_job_batch(job_ids: list[int], attempt: int = 0) -> dict:
+    """Claim and populate several jobs, loading their pages concurrently per source.
+
+    Jobs not reached within POPULATE_BATCH_BUDGET seconds are handed to a
+    new batch, and jobs that failed are retried in one up to POPULATE_RETRIES
+    times, after a delay starting at POPULATE_RETRY_DELAY seconds. Jobs on a
+    host whose circuit breaker is open are deferred until it lets a probe
+    through, without using up a retry.
+    """
+    from sisyphus.jobs.models import Job  # noqa: PLC0415
+    from sisyphus.searches.breaker import breaker  # noqa: PLC0415
+    from sisyphus.searches.parsers import PARSERS  # noqa: PLC0415
+
+    jobs = Job.objects.claim_unpopulated(job_ids)
+    by_parser: dict[str, list[Job]] = {}
+    for job in jobs:
+        by_parser.setdefault(getattr(job.source, 'parser', ''), []).append(job)
+
+    deadline = time.monotonic() + settings.POPULATE_BATCH_BUDGET if settings.POPULATE_BATCH_BUDGET else None
+    populated = 0
+    failed: list[Job] = []
+    unfinished: list[Job] = []
+    deferred: dict[float, list[Job]] = {}
+    try:
+        for name, parser_jobs in by_parser.items():
+            parser_cls = PARSERS.get(name)
+            if parser_cls is None:
+                logger.warning('Unknown parser %r for %d jobs', name, len(parser_jobs))
+                continue
+            hosts = {urlparse(job.url).hostname for job in parser_jobs}
+            if unavailable := [host for host in hosts if breaker.state(host) == breaker.OPEN]:
+                deferred.setdefault(max(map(breaker.retry_after, unavailable)), []).extend(parser_jobs)
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                unfinished.extend(parser_jobs)
+                continue
+            result = parser_cls().populate_jobs(parser_jobs, deadline=deadline)
+            populated += len(result['populated'])
+            failed.extend(result['failed'])
+            unfinished.extend(result['unfinished'])
+    finally:
+        Job.objects.release_claims(jobs)
+
+    queue = django_rq.get_queue('populate')
+    if unfinished:
+        logger.info('Populate batch out of time, requeueing %d jobs', len(unfinished))
+        queue.enqueue(populate_job_batch, [job.id for job in unfinished], attempt)
+    retried = failed if attempt < settings.POPULATE_RETRIES else []
+    if retried:
+        delay = timedelta(seconds=settings.POPULATE_RETRY_DELAY * 2**attempt)
+        queue.enqueue_in(delay, populate_job_batch, [job.id for job in retried], attempt + 1)
+    for delay, waiting in deferred.items():
+        logger.info('Deferring %d jobs %.0fs while their host is unavailable', len(waiting), delay)
+        queue.enqueue_in(timedelta(seconds=delay), populate_job_batch, [job.id for job in waiting], attempt)
 
-    return {'job_id': job_id}
+    return {
+        'job_ids': job_ids,
+        'claimed': len(jobs),
+        'populated': populated,
+        'failed': len(failed),
+        'requeued': len(unfinished) + len(retried),
+        'deferred': sum(len(waiting) for waiting in deferred.values()),
+    }
 
 
 def score_new_jobs(run_id: int, user_id: int) -> dict:
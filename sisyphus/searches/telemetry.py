@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from sisyphus.core.stores import RedisStore
+
+logger = logging.getLogger(__name__)
+
+# SearchRun the requests being made belong to
+current_run: ContextVar[str] = ContextVar('telemetry_run', default='')
+
+# How a request ended
+OK = 'ok'
+ERROR = 'error'
+BLOCKED = 'blocked'
+CHALLENGE = 'challenge'
+FAILED = 'failed'
+
+# How a request was served
+BROWSER = 'browser'
+HTTP = 'http'
+CACHE = 'cache'
+
+# Aggregates kept in Redis
+PARSER = 'parser'
+RUN = 'run'
+WORKER = 'worker'
+
+# Phases each request is timed through
+_TIMINGS = ('context_seconds', 'navigation_seconds', 'ready_seconds')
+
+
+@contextmanager
+def telemetry_run(run: object) -> Iterator[None]:
+    """Attribute the requests made inside the block to a SearchRun."""
+    token = current_run.set(str(run))
+    try:
+        yield
+    finally:
+        current_run.reset(token)
+
+
+def worker_name() -> str:
+    # Looked up per call, as prefork workers import this module before they fork
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class RequestTelemetry:
+    """Where one fetch spent its time and what it got back.
+
+    ``via`` is ``browser``, ``http`` or ``cache``; only browser fetches have
+    context and readiness times. ``blocked`` counts the sub-requests the
+    block profile or interceptor refused.
+    """
+
+    def __init__(self, url: str, parser: str = '', via: str = BROWSER) -> None:
+        self.url = url
+        self.parser = parser
+        self.via = via
+        self.run = current_run.get()
+        self.context_seconds = 0.0
+        self.navigation_seconds = 0.0
+        self.ready_seconds = 0.0
+        self.status: int | None = None
+        self.bytes = 0
+        self.blocked = 0
+        self.outcome = FAILED
+
+    def counters(self) -> Counter[str]:
+        """Return what this request adds to each of its aggregates."""
+        counters: Counter[str] = Counter(requests=1, bytes=self.bytes, blocked_requests=self.blocked)
+        counters[f'via:{self.via}'] += 1
+        counters[f'outcome:{self.outcome}'] += 1
+        if self.status is not None:
+            counters[f'status:{self.status}'] += 1
+        for field in _TIMINGS:
+            counters[field] += getattr(self, field)
+        return counters
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'url': self.url,
+            'parser': self.parser,
+            'run': self.run,
+            'via': self.via,
+            'status': self.status,
+            'outcome': self.outcome,
+            'bytes': self.bytes,
+            'blocked': self.blocked,
+            **{field: round(getattr(self, field), 3) for field in _TIMINGS},
+        }
+
+
+class Telemetry(RedisStore):
+    """Request telemetry summed per parser, SearchRun and worker in Redis hashes.
+
+    Requests are added up in memory and written in one pipeline once
+    ``SCRAPER_TELEMETRY_FLUSH`` have accumulated, and whenever a run ends,
+    so recording costs no round trip per request. Each hash holds request,
+    byte and blocked sub-request totals, summed seconds per phase, and
+    counts per status, outcome and transport; keys expire after
+    ``SCRAPER_TELEMETRY_TTL`` seconds without a write. Redis errors drop
+    the pending counts.
+    """
+
+    def __init__(self, connection: Any = None) -> None:
+        super().__init__(connection)
+        self._pending: dict[str, Counter[str]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether telemetry is turned on in settings."""
+        return settings.SCRAPER_TELEMETRY
+
+    def key(self, scope: str, name: str = '') -> str:
+        return f'sisyphus:telemetry:{scope}:{name}'
+
+    def record(self, request: RequestTelemetry) -> bool:
+        """Add a request to its aggregates and return whether enough are pending to flush."""
+        if not self.enabled:
+            return False
+        counters = request.counters()
+        scopes = [(PARSER, request.parser or 'scraper'), (WORKER, worker_name())]
+        if request.run:
+            scopes.append((RUN, request.run))
+        with self._lock:
+            for scope, name in scopes:
+                self._pending.setdefault(self.key(scope, name), Counter()).update(counters)
+            self._count += 1
+            return self._count >= settings.SCRAPER_TELEMETRY_FLUSH
+
+    def flush(self) -> None:
+        """Write the pending counts to Redis."""
+        with self._lock:
+            pending, self._pending, self._count = self._pending, {}, 0
+        if not pending:
+            return
+        try:
+            pipe = self.connection.pipeline(transaction=False)
+            for key, counters in pending.items():
+                for field, value in counters.items():
+                    if isinstance(value, float):
+                        pipe.hincrbyfloat(key, field, value)
+                    else:
+                        pipe.hincrby(key, field, value)
+                pipe.expire(key, settings.SCRAPER_TELEMETRY_TTL)
+            pipe.execute()
+        except RedisError:
+            logger.warning('Could not record telemetry for %d aggregates', len(pending), exc_info=True)
+
+    def stats(self, scope: str, name: str) -> dict[str, float]:
+        """Return the totals recorded for one parser, run or worker, with mean seconds per request fetched."""
+        try:
+            stored = self.connection.hgetall(self.key(scope, name))
+        except RedisError:
+            logger.warning('Could not read telemetry for %s %s', scope, name, exc_info=True)
+            return {}
+        stats: dict[str, float] = {}
+        for field, value in stored.items():
+            number = float(value)
+            stats[field.decode()] = int(number) if number.is_integer() else round(number, 3)
+        fetched = stats.get('requests', 0) - stats.get(f'via:{CACHE}', 0)
+        for field in _TIMINGS:
+            if field in stats:
+                stats[f'mean_{field}'] = round(stats[field] / fetched, 3) if fetched else 0.0
+        return stats
+
+    def names(self, scope: str) -> list[str]:
+        """Return every parser, run or worker with recorded telemetry."""
+        prefix = self.key(scope)
+        return sorted(key.decode().removeprefix(prefix) for key in self.connection.scan_iter(f'{prefix}*'))
+
+
+telemetry = Telemetry()
@@ -0,0 +1,87 @@
+import pytest
+
+from sisyphus.searches.backends import PARSER_BACKENDS, parse_html, to_selector
+from sisyphus.searches.parsers.linkedin import LinkedInParser
+from sisyphus.searches.tests.test_parsers import CARD
+
+PAGE = f'''
+<html><body>
+  <ul><li>{CARD}</li><li>{CARD}</li></ul>
+  <div class="show-more-less-html__markup"> <p>Build <b>things</b>.</p> </div>
+  <code id="applyUrl">https://example.com/apply</code>
+  <pre>{{"total": 3}}</pre>
+</body></html>
+'''
+
+
+class TestToSelector:
+    """Tests for to_selector."""
+
+    def test_class_and_id(self):
+        assert to_selector('div', {'class': 'a b'}) == 'div.a.b'
+        assert to_selector('code', {'id': 'applyUrl'}) == 'code[id="applyUrl"]'
+
+    def test_kwargs(self):
+        assert to_selector('span', class_='count') == 'span.count'
+
+    def test_any(self):
+        assert to_selector() == '*'
+
+    def test_unsupported(self):
+        with pytest.raises(TypeError):
+            to_selector('div', {'class': ['a']})
+
+
+@pytest.mark.parametrize('backend', PARSER_BACKENDS)
+class TestParseHtml:
+    """Each backend gives the parsers the same fields."""
+
+    def test_cards(self, backend):
+        jobs = LinkedInParser().parse_cards(parse_html(PAGE, backend))
+        assert [job['title'] for job in jobs] == ['Engineer', 'Engineer']
+        assert jobs[0]['company'] == 'Acme'
+        assert jobs[0]['company_url'] == 'https://www.linkedin.com/company/acme'
+        assert jobs[0]['date_posted'] == '2026-01-02'
+
+    def test_detail_fields(self, backend):
+        tag = parse_html(PAGE, backend)
+        description = tag.find('div', {'class': 'show-more-less-html__markup'}).decode_contents().strip()
+        assert description == '<p>Build <b>things</b>.</p>'
+        assert tag.find('code', {'id': 'applyUrl'}).text == 'https://example.com/apply'
+        assert tag.find('pre').string == '{"total": 3}'
+
+    def test_missing(self, backend):
+        tag = parse_html(PAGE, backend)
+        assert not tag.find('table')
+        assert tag.find('table').find('td').text == ''
+
+    def test_find_excludes_self(self, backend):
+        tag = parse_html('<html><body><div class="c"><div class="c">inner</div></div></body></html>', backend)
+        outer = tag.find('div', {'class': 'c'})
+        assert outer.find('div', {'class': 'c'}).text == 'inner'
+        assert len(outer.find_all('div', {'class': 'c'})) == 1
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match='Unknown HTML parser backend'):
+        parse_html('<html></html>', 'html5lib')
+
+
+@pytest.mark.parametrize('backend', ['html.parser', 'lxml'])
+class TestParseOnly:
+    """Parsing only the targets a call site names."""
+
+    def test_keeps_only_targets(self, backend):
+        tag = parse_html(PAGE, backend, only=LinkedInParser.CARD_TARGETS)
+        assert len(LinkedInParser().parse_cards(tag)) == 2
+        assert not tag.find('pre')
+
+    def test_several_targets(self, backend):
+        tag = parse_html(PAGE, backend, only=LinkedInParser.JOB_TARGETS)
+        assert tag.find('div', {'class': 'show-more-less-html__markup'}).text == 'Buildthings.'
+        assert tag.find('code', {'id': 'applyUrl'})
+        assert not tag.find('div', {'class': 'job-search-card'})
+
+    def test_json_body(self, backend):
+        tag = parse_html(PAGE, backend, only=[('pre', {})])
+        assert tag.find('pre').text == '{"total": 3}'
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from sisyphus.searches.blocking import RESOURCE_TYPE_PATTERNS, BlockProfile, BlockStats, install
+from sisyphus.searches.parsers import PARSERS
+from sisyphus.searches.parsers.base import BaseParser
+
+
+class FakeSession:
+    def __init__(self):
+        self.sent = []
+        self.handlers = {}
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+class FakeContext:
+    def __init__(self):
+        self.session = FakeSession()
+
+    async def new_cdp_session(self, page):
+        return self.session
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+
+class TestBlockProfile:
+    """Tests for BlockProfile."""
+
+    def test_patterns(self):
+        profile = BlockProfile(resource_types={'font'}, url_patterns=['*/li/track*'], hosts=['ads.example.com'])
+        patterns = profile.patterns()
+        assert patterns[0] == '*://ads.example.com/*'
+        assert '*.woff2*' in patterns
+        assert patterns[-1] == '*/li/track*'
+
+    def test_unknown_type_has_no_patterns(self):
+        assert BlockProfile(resource_types={'ping'}).patterns() == []
+
+    @pytest.mark.parametrize('parser', PARSERS.values())
+    def test_parser_types_have_patterns(self, parser):
+        profile = parser.block_profile or BlockProfile()
+        assert profile.resource_types <= RESOURCE_TYPE_PATTERNS.keys()
+
+    def test_with_hosts(self):
+        profile = BlockProfile(resource_types={'image'})
+        combined = profile.with_hosts(['media.example.com'])
+        assert combined.hosts == ('media.example.com',)
+        assert combined.blocks('image')
+        assert profile.hosts == ()
+
+    def test_blocks(self):
+        profile = BlockProfile(resource_types={'image', 'media'})
+        assert profile.blocks('image')
+        assert not profile.blocks('document')
+
+
+class TestBlockStats:
+    """Tests for BlockStats."""
+
+    def test_counts(self):
+        stats = BlockStats()
+        stats.on_loading_failed({'type': 'Image', 'blockedReason': 'inspector'})
+        stats.on_loading_failed({'type': 'Font', 'errorText': 'net::ERR_BLOCKED_BY_CLIENT'})
+        stats.on_loading_failed({'type': 'Document', 'errorText': 'net::ERR_CONNECTION_RESET'})
+        stats.on_loading_finished({'encodedDataLength': 1200})
+        summary = stats.summary()
+        assert summary['blocked'] == 2
+        assert summary['blocked_by_type'] == {'image': 1, 'font': 1}
+        assert summary['allowed'] == 1
+        assert summary['allowed_bytes'] == 1200
+        assert summary['bytes_saved'] == 50_000
+
+
+class TestInstall:
+    """Tests for installing a profile on a page."""
+
+    def test_no_listeners_without_stats(self):
+        page = FakePage()
+        asyncio.run(install(page, BlockProfile(url_patterns=['*.css*'])))
+        assert page.context.session.handlers == {}
+
+    def test_sets_blocked_urls_once(self):
+        page = FakePage()
+        stats = BlockStats()
+        asyncio.run(install(page, BlockProfile(url_patterns=['*.css*']), stats))
+        session = page.context.session
+        assert session.sent == [('Network.enable', None), ('Network.setBlockedURLs', {'urls': ['*.css*']})]
+        session.handlers['Network.loadingFailed']({'type': 'Stylesheet', 'blockedReason': 'inspector'})
+        assert stats.blocked['stylesheet'] == 1
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = type('Request', (), {'url': url, 'resource_type': resource_type})()
+        self.aborted = None
+        self.continued = False
+
+    async def abort(self, error_code='failed'):
+        self.aborted = error_code
+
+    async def continue_(self):
+        self.continued = True
+
+
+class TestInterceptRequest:
+    """Tests for the route-level fallback in BaseParser.intercept_request."""
+
+    def make_parser(self):
+        class ProfileParser(BaseParser):
+            blocklist = ['ads.example.com']
+            block_profile = BlockProfile(resource_types={'image'})
+
+        return ProfileParser()
+
+    def test_blocks_extensionless_image(self):
+        route = FakeRoute('https://cdn.example.com/logo?v=2', 'image')
+        asyncio.run(self.make_parser().intercept_request(route))
+        assert route.aborted == 'blockedbyclient'
+
+    def test_blocks_host(self):
+        route = FakeRoute('https://ads.example.com/pixel', 'script')
+        asyncio.run(self.make_parser().intercept_request(route))
+        assert route.aborted == 'blockedbyclient'
+
+    def test_allows_document(self):
+        route = FakeRoute('https://www.example.com/jobs/1', 'document')
+        asyncio.run(self.make_parser().intercept_request(route))
+        assert route.continued
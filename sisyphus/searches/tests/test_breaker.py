@@ -0,0 +1,68 @@
+import pytest
+
+from sisyphus.searches.breaker import breaker
+
+pytestmark = [
+    pytest.mark.limits(SCRAPER_BREAKER_THRESHOLD=2, SCRAPER_BREAKER_WINDOW=60, SCRAPER_BREAKER_COOLDOWN=30),
+    pytest.mark.clock('sisyphus.searches.breaker.time.time'),
+]
+
+
+class TestCircuitBreaker:
+    """Tests for the per-host CircuitBreaker."""
+
+    def test_opens_at_threshold(self, limits, clock):
+        breaker.record_failure('a.com')
+        assert breaker.state('a.com') == breaker.CLOSED
+        breaker.record_failure('a.com')
+        assert breaker.state('a.com') == breaker.OPEN
+        assert not breaker.allow('a.com')
+        assert breaker.retry_after('a.com') == 30
+        assert breaker.state('b.com') == breaker.CLOSED
+
+    def test_failures_outside_window_do_not_open(self, limits, clock, fake_redis):
+        breaker.record_failure('a.com')
+        fake_redis.delete(breaker.keys('a.com')[1])
+        breaker.record_failure('a.com')
+        assert breaker.state('a.com') == breaker.CLOSED
+
+    def test_success_resets_failures(self, limits, clock):
+        breaker.record_failure('a.com')
+        breaker.record_success('a.com')
+        breaker.record_failure('a.com')
+        assert breaker.state('a.com') == breaker.CLOSED
+
+    def test_half_open_lets_one_probe_through(self, limits, clock):
+        breaker.record_failure('a.com')
+        breaker.record_failure('a.com')
+        clock[0] += 31
+        assert breaker.state('a.com') == breaker.HALF_OPEN
+        assert breaker.allow('a.com')
+        assert not breaker.allow('a.com')
+
+    def test_probe_success_closes(self, limits, clock):
+        breaker.record_failure('a.com')
+        breaker.record_failure('a.com')
+        # Stragglers finishing while the circuit is open do not close it
+        breaker.record_success('a.com')
+        assert breaker.state('a.com') == breaker.OPEN
+        clock[0] += 31
+        breaker.allow('a.com')
+        breaker.record_success('a.com')
+        assert breaker.state('a.com') == breaker.CLOSED
+        assert breaker.allow('a.com')
+
+    def test_probe_failure_reopens(self, limits, clock):
+        breaker.record_failure('a.com')
+        breaker.record_failure('a.com')
+        clock[0] += 31
+        breaker.allow('a.com')
+        breaker.record_failure('a.com')
+        assert breaker.state('a.com') == breaker.OPEN
+        assert breaker.retry_after('a.com') == 30
+
+    def test_disabled(self, limits, clock):
+        limits.SCRAPER_BREAKER_THRESHOLD = 0
+        breaker.record_failure('a.com')
+        breaker.record_failure('a.com')
+        assert breaker.allow('a.com')
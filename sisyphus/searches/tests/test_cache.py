@@ -0,0 +1,279 @@
+import os
+
+import pytest
+
+from sisyphus.searches.cache import CacheMiss, ResponseCache, canonical_url, encode, fingerprint, response_cache
+from sisyphus.searches.parsers.linkedin import LinkedInParser
+from sisyphus.searches.playwright import Extracted, RawResponse, Scraper
+
+URL = 'https://www.linkedin.com/jobs/view/engineer-1'
+SEARCH_URL = 'https://www.linkedin.com/s?p='
+
+
+pytestmark = [
+    pytest.mark.limits(
+        SCRAPER_CACHE_MODE='cache',
+        SCRAPER_CACHE_TTL=0,
+        SCRAPER_CACHE_TTLS={'www.linkedin.com/jobs/view': 60},
+        SCRAPER_CACHE_MAX_MB=1,
+    ),
+    pytest.mark.clock('sisyphus.searches.cache.time.time'),
+]
+
+
+class TestCanonicalUrl:
+    """Tests for canonical_url and fingerprint."""
+
+    def test_drops_tracking_and_fragment(self):
+        assert canonical_url('HTTPS://WWW.LinkedIn.com/jobs/view/1?trk=x&utm_source=y#top') == (
+            'https://www.linkedin.com/jobs/view/1'
+        )
+
+    def test_sorts_query(self):
+        assert canonical_url('https://a.com/s?b=2&a=1') == canonical_url('https://a.com/s?a=1&b=2')
+
+    def test_fingerprint_depends_on_kind(self):
+        assert fingerprint(URL, 'html') == fingerprint(f'{URL}?trk=x', 'html')
+        assert fingerprint(URL, 'html') != fingerprint(URL, 'raw')
+
+
+class TestResponseCache:
+    """Tests for the on-disk ResponseCache."""
+
+    @pytest.mark.parametrize(
+        'result',
+        [
+            '<html>job</html>',
+            RawResponse(b'{"total": 3}', 'application/json', 200),
+            Extracted([{'title': 'Engineer'}], html='<html></html>'),
+        ],
+    )
+    def test_round_trip(self, limits, result):
+        response_cache.put(URL, 'html', result)
+        cached = response_cache.get(URL, 'html')
+        assert type(cached) is type(result)
+        assert encode(cached) == encode(result)
+
+    def test_only_endpoints_with_ttl_are_cached(self, limits, response_cache_dir):
+        response_cache.put('https://www.linkedin.com/jobs/search?q=x', 'html', '<html></html>')
+        response_cache.put(URL, 'html', None)
+        assert not response_cache_dir.exists()
+
+    def test_expires_after_ttl(self, limits, clock):
+        response_cache.put(URL, 'html', '<html>job</html>')
+        clock[0] += 59
+        assert response_cache.get(URL, 'html') == '<html>job</html>'
+        clock[0] += 1
+        assert response_cache.get(URL, 'html') is None
+
+    def test_record_then_replay(self, limits, clock):
+        limits.SCRAPER_CACHE_MODE = 'record'
+        url = 'https://www.linkedin.com/jobs/search?q=x'
+        response_cache.put(url, 'html', '<html>search</html>')
+        assert response_cache.get(url, 'html') is None
+
+        limits.SCRAPER_CACHE_MODE = 'replay'
+        clock[0] += 86400
+        assert response_cache.get(url, 'html') == '<html>search</html>'
+        with pytest.raises(CacheMiss):
+            response_cache.get(URL, 'html')
+
+    def test_off(self, limits, response_cache_dir):
+        limits.SCRAPER_CACHE_MODE = 'off'
+        response_cache.put(URL, 'html', '<html>job</html>')
+        assert response_cache.get(URL, 'html') is None
+        assert not response_cache_dir.exists()
+
+    def test_unreadable_entry_is_a_miss(self, limits):
+        response_cache.put(URL, 'html', '<html>job</html>')
+        response_cache.path(fingerprint(URL, 'html')).write_bytes(b'garbage')
+        assert response_cache.get(URL, 'html') is None
+
+    def test_evicts_least_recently_used(self, limits, tmp_path):
+        cache = ResponseCache(tmp_path / 'lru')
+        urls = [f'{URL}{n}' for n in range(3)]
+        for age, url in enumerate(urls):
+            cache.put(url, 'html', os.urandom(1000).hex())
+            path = cache.path(fingerprint(url, 'html'))
+            os.utime(path, (1000 - age, 1000 - age))
+        # Reading the oldest entry makes it the most recently used
+        cache.get(urls[2], 'html')
+        size = cache.size()
+        assert cache.prune(size - 1) == 1
+        assert cache.get(urls[1], 'html') is None
+        assert cache.get(urls[0], 'html') is not None
+        assert cache.get(urls[2], 'html') is not None
+
+    def test_put_prunes_past_max_size(self, limits, tmp_path):
+        limits.SCRAPER_CACHE_MAX_MB = 0.01
+        cache = ResponseCache(tmp_path / 'lru')
+        for n in range(5):
+            cache.put(f'{URL}{n}', 'html', os.urandom(4000).hex())
+        assert cache.size() <= 0.01 * 1024 * 1024
+
+    def test_clear(self, limits):
+        response_cache.put(URL, 'html', '<html>job</html>')
+        assert response_cache.clear() == 1
+        assert response_cache.size() == 0
+
+
+class FakeRequest:
+    async def sizes(self):
+        return {'responseHeadersSize': 100, 'responseBodySize': 1000}
+
+
+class FakeResponse:
+    status = 200
+    headers = {'content-type': 'text/html'}
+    request = FakeRequest()
+
+
+class FakePage:
+    def __init__(self, site):
+        self.site = site
+        self.url = 'about:blank'
+
+    def on(self, event, handler):
+        pass
+
+    async def goto(self, url, wait_until):
+        self.url = url
+        self.site.fetched.append(url)
+        return FakeResponse()
+
+    async def wait_for_selector(self, selector, state, timeout):
+        pass
+
+    async def wait_for_load_state(self, state, timeout):
+        pass
+
+    async def content(self):
+        return self.site.pages[self.url]
+
+
+class FakeContext:
+    def __init__(self, site):
+        self.site = site
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return FakePage(self.site)
+
+    async def close(self):
+        pass
+
+
+class FakeSite:
+    """Browser serving canned pages by URL."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **kwargs):
+        return FakeContext(self)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def offline(limits, monkeypatch):
+    async def install(page, profile, stats):
+        pass
+
+    limits.SCRAPER_RATE_LIMIT = 0
+    limits.SCRAPER_HTTP_FAST_PATH = False
+    monkeypatch.setattr('sisyphus.searches.playwright.install', install)
+    return limits
+
+
+class TestScraperCache:
+    """Tests for fetches going through the response cache."""
+
+    def test_serves_cached_and_stores_fetched(self, offline):
+        scraper = Scraper(pool_size=1)
+        scraper._browser = site = FakeSite({URL: '<html>job</html>'})
+        try:
+            assert scraper.get_with_retry(URL) == '<html>job</html>'
+            assert scraper.get_with_retry(f'{URL}?trk=x') == '<html>job</html>'
+        finally:
+            scraper.close()
+        assert site.fetched == [URL]
+
+    def test_challenge_page_is_not_cached(self, offline):
+        login = 'https://www.linkedin.com/uas/login'
+        scraper = Scraper(pool_size=1)
+        scraper._browser = site = FakeSite({login: '<html>sign in</html>'})
+        try:
+            scraper.get_with_retry(login)
+            scraper.get_with_retry(login)
+        finally:
+            scraper.close()
+        assert site.fetched == [login, login]
+
+    def test_request_kind(self):
+        scraper = Scraper(extract_script=lambda url: '() => 1' if 'search' in url else None)
+        assert scraper.request_kind(URL, raw=True) == 'raw'
+        assert scraper.request_kind(URL, raw=False) == 'html'
+        assert scraper.request_kind('https://a.com/search', raw=False).startswith('extract:')
+
+
+CARD = '''
+<div class="base-card job-search-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/engineer-{n}"></a>
+  <h3 class="base-search-card__title">Engineer {n}</h3>
+  <h4 class="base-search-card__subtitle"><a href="https://www.linkedin.com/company/acme">Acme</a></h4>
+  <span class="job-search-card__location">Remote</span>
+  <time class="job-search-card__listdate" datetime="2026-01-02"></time>
+</div>
+'''
+
+
+class TestRecordReplay:
+    """Tests for running a parser offline against recorded traffic."""
+
+    @pytest.fixture
+    def parser(self, offline, monkeypatch):
+        offline.LINKEDIN_ADAPTIVE_PAGINATION = True
+        parser = LinkedInParser()
+        monkeypatch.setattr(parser, 'JOBS_PER_PAGE', 2)
+        monkeypatch.setattr(parser, 'get_page_url', lambda search, page, period: f'{SEARCH_URL}{page}')
+        yield parser
+        parser.scraper.close()
+
+    def serve(self, parser, pages):
+        site = FakeSite(
+            {
+                f'{SEARCH_URL}{page}': f'<html><body>{"".join(CARD.format(n=n) for n in cards)}</body></html>'
+                for page, cards in pages.items()
+            }
+        )
+        parser.scraper._browser = site
+        return site
+
+    def titles(self, parser):
+        return [(page, [job['title'] for job in jobs]) for page, jobs in parser.iter_jobs(None, 86400)]
+
+    def test_replays_search_offline(self, parser, offline):
+        offline.SCRAPER_CACHE_MODE = 'record'
+        self.serve(parser, {page: [] for page in range(3, 10)} | {1: [1, 2], 2: [3]})
+        recorded = self.titles(parser)
+        assert recorded == [(1, ['Engineer 1', 'Engineer 2']), (2, ['Engineer 3'])]
+
+        offline.SCRAPER_CACHE_MODE = 'replay'
+        site = self.serve(parser, {})
+        assert self.titles(parser) == recorded
+        assert site.fetched == []
+
+    def test_replay_miss_raises(self, parser, offline):
+        offline.SCRAPER_CACHE_MODE = 'replay'
+        site = self.serve(parser, {1: [1, 2]})
+        with pytest.raises(CacheMiss):
+            list(parser.iter_jobs(None, 86400))
+        assert site.fetched == []
@@ -0,0 +1,104 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from sisyphus.searches.fanin import SharedResults, shared_results
+
+
+class FakeSearch:
+    def __init__(self, keywords='python'):
+        self.keywords = keywords
+
+
+class FakeParser:
+    name = 'fake'
+
+    def __init__(self, pages=3):
+        self.pages = pages
+        self.loaded = []
+
+    def get_page_url(self, search, page, period=None):
+        return f'https://x.com/search?q={search.keywords}&page={page}&period={period}'
+
+    def iter_jobs(self, search, period=None, after=None):
+        for page in range(1, self.pages + 1):
+            if after is not None and page <= after:
+                continue
+            self.loaded.append(page)
+            yield page, [{'url': f'https://x.com/j/{page}'}]
+
+
+class TestSharedResults:
+    """Tests for SharedResults."""
+
+    @pytest.fixture(autouse=True)
+    def short_lock(self, settings):
+        settings.SEARCH_FANIN_WAIT = 1
+        settings.SEARCH_FANIN_LOCK_TIMEOUT = 5
+
+    def test_key_ignores_case_and_spacing(self):
+        parser = FakeParser()
+        key = shared_results.key(parser, FakeSearch('Python  Developer'), 86400)
+        assert key == shared_results.key(parser, FakeSearch(' python developer'), 86400)
+        assert key != shared_results.key(parser, FakeSearch('python developer'), 3600)
+        assert key != shared_results.key(parser, FakeSearch('golang'), 86400)
+
+    def test_replays_complete_query(self, fake_redis):
+        first = FakeParser()
+        assert [page for page, _ in shared_results.iter_jobs(first, FakeSearch(), 86400)] == [1, 2, 3]
+        second = FakeParser()
+        pages = list(shared_results.iter_jobs(second, FakeSearch('PYTHON'), 86400))
+        assert pages == [(page, [{'url': f'https://x.com/j/{page}'}]) for page in (1, 2, 3)]
+        assert second.loaded == []
+        assert fake_redis.ttl(shared_results.key(first, FakeSearch(), 86400)) > 0
+
+    def test_continues_after_partial_query(self):
+        first = FakeParser()
+        pages = shared_results.iter_jobs(first, FakeSearch(), 86400)
+        assert next(pages)[0] == 1
+        pages.close()
+
+        second = FakeParser()
+        assert [page for page, _ in shared_results.iter_jobs(second, FakeSearch(), 86400)] == [1, 2, 3]
+        assert second.loaded == [2, 3]
+
+    def test_resumes_after_page(self):
+        list(shared_results.iter_jobs(FakeParser(2), FakeSearch(), 86400))
+        parser = FakeParser(4)
+        assert [page for page, _ in shared_results.iter_jobs(parser, FakeSearch(), 86400, after=1)] == [2]
+
+        pages = shared_results.iter_jobs(FakeParser(4), FakeSearch('golang'), 86400)
+        assert next(pages)[0] == 1
+        pages.close()
+        parser = FakeParser(4)
+        assert [page for page, _ in shared_results.iter_jobs(parser, FakeSearch('golang'), 86400, after=2)] == [3, 4]
+        assert parser.loaded == [3, 4]
+
+    def test_releases_lock(self, fake_redis):
+        parser = FakeParser()
+        list(shared_results.iter_jobs(parser, FakeSearch(), 86400))
+        assert not fake_redis.exists(f'{shared_results.key(parser, FakeSearch(), 86400)}:lock')
+
+    def test_renews_lock_per_page(self, fake_redis):
+        parser = FakeParser()
+        lock = f'{shared_results.key(parser, FakeSearch(), 86400)}:lock'
+        pages = shared_results.iter_jobs(parser, FakeSearch(), 86400)
+        next(pages)
+        fake_redis.pexpire(lock, 100)
+        next(pages)
+        assert fake_redis.pttl(lock) > 1000
+        pages.close()
+
+    def test_disabled(self, settings, fake_redis):
+        settings.SEARCH_FANIN_TTL = 0
+        list(shared_results.iter_jobs(FakeParser(), FakeSearch(), 86400))
+        assert fake_redis.keys('sisyphus:fanin:*') == []
+
+    @pytest.mark.parametrize('pages', [0, 2])
+    def test_redis_errors_load_directly(self, pages):
+        class BrokenRedis:
+            def lock(self, name, **kwargs):
+                raise RedisConnectionError
+
+        parser = FakeParser(pages)
+        results = SharedResults(BrokenRedis())
+        assert [page for page, _ in results.iter_jobs(parser, FakeSearch(), 86400)] == list(range(1, pages + 1))
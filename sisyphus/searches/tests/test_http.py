@@ -0,0 +1,178 @@
+import asyncio
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from sisyphus.searches.breaker import breaker
+from sisyphus.searches.http import BrowserFallback, HttpClient, render_like_browser
+from sisyphus.searches.playwright import Scraper
+from sisyphus.searches.proxies import ProxyPool
+from sisyphus.searches.telemetry import PARSER, RequestTelemetry, telemetry
+from sisyphus.searches.utils import NullableTag
+
+
+def html(text, status=200):
+    return httpx.Response(status, text=text, headers={'content-type': 'text/html'})
+
+
+def make_client(handler):
+    client = HttpClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def fetch(client, url='https://example.com/api'):
+    return asyncio.run(client.fetch(url))
+
+
+class TestRenderLikeBrowser:
+    """Tests for render_like_browser."""
+
+    def test_json_in_pre(self):
+        response = httpx.Response(200, json={'a': '<b>'})
+        soup = BeautifulSoup(render_like_browser(response), 'html.parser')
+        assert NullableTag(soup.html).find('pre').text == '{"a":"<b>"}'
+
+    def test_fragment_wrapped(self):
+        assert render_like_browser(html('<li>one</li>')) == '<html><head></head><body><li>one</li></body></html>'
+
+    def test_document_unchanged(self):
+        text = '<!DOCTYPE html><html><body>x</body></html>'
+        assert render_like_browser(html(text)) == text
+
+
+class TestHttpClient:
+    """Tests for HttpClient.fetch."""
+
+    def test_ok(self):
+        client = make_client(lambda request: html('<li>one</li>'))
+        assert '<li>one</li>' in fetch(client)
+
+    def test_raw(self):
+        client = make_client(lambda request: httpx.Response(200, json={'total': 3}))
+        body = asyncio.run(client.fetch_raw('https://example.com/api'))
+        assert body.content_type == 'application/json'
+        assert body.json() == {'total': 3}
+
+    def test_not_found(self):
+        client = make_client(lambda request: httpx.Response(404))
+        assert fetch(client) is None
+
+    def test_rate_limited(self):
+        client = make_client(lambda request: httpx.Response(429))
+        with pytest.raises(BrowserFallback):
+            fetch(client)
+        assert client._client is None
+
+    def test_challenge_page(self):
+        client = make_client(lambda request: html('<title>Just a moment...</title>'))
+        with pytest.raises(BrowserFallback):
+            fetch(client)
+
+    def test_transport_error(self):
+        def handler(request):
+            raise httpx.ConnectError('refused')
+
+        client = make_client(handler)
+        with pytest.raises(BrowserFallback):
+            fetch(client)
+
+    def test_fills_telemetry(self):
+        client = make_client(lambda request: html('<li>one</li>', status=404))
+        sample = RequestTelemetry('https://example.com/api', via='http')
+        asyncio.run(client.fetch('https://example.com/api', sample))
+        assert (sample.status, sample.outcome) == (404, 'error')
+        assert sample.bytes == len('<li>one</li>')
+
+    def test_classifies_challenge(self):
+        client = make_client(lambda request: html('<title>Just a moment...</title>'))
+        sample = RequestTelemetry('https://example.com/api', via='http')
+        with pytest.raises(BrowserFallback):
+            asyncio.run(client.fetch('https://example.com/api', sample))
+        assert (sample.status, sample.outcome) == (200, 'challenge')
+
+    def test_blocks_score_proxy(self, settings):
+        settings.SCRAPER_PROXY_MIN_SCORE = 0.5
+        proxies = ProxyPool(['http://p1.example:8000'])
+        client = make_client(lambda request: httpx.Response(403))
+        client.proxies = proxies
+        client.proxy = 'http://p1.example:8000'
+        with pytest.raises(BrowserFallback):
+            fetch(client)
+        health = proxies.health['http://p1.example:8000']
+        assert (health.requests, health.failures) == (1, 1)
+
+    def test_evicted_proxy_replaces_client(self, settings):
+        proxies = ProxyPool(['http://p1.example:8000'])
+        client = make_client(lambda request: html('<li>one</li>'))
+        stale = client._client
+        client.proxies = proxies
+        client.proxy = 'http://p1.example:8000'
+        proxies.health[client.proxy].evicted_until = float('inf')
+        asyncio.run(client._get_client())
+        assert client._client is not stale
+        asyncio.run(client.close())
+
+
+class TestScraperFastPath:
+    """Tests for the HTTP fast path in Scraper."""
+
+    def make_scraper(self, handler, monkeypatch):
+        browser_urls = []
+
+        async def browser_fetch(url, **kwargs):
+            browser_urls.append(url)
+            return '<html>browser</html>'
+
+        scraper = Scraper(use_http=lambda url: url.startswith('https://example.com/api'))
+        scraper.http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(scraper, 'fetch', browser_fetch)
+        return scraper, browser_urls
+
+    def test_uses_http(self, monkeypatch):
+        scraper, browser_urls = self.make_scraper(lambda request: html('<li>x</li>'), monkeypatch)
+        try:
+            assert '<li>x</li>' in scraper.get_with_retry('https://example.com/api/jobs')
+        finally:
+            scraper.close()
+        assert browser_urls == []
+        stats = telemetry.stats(PARSER, 'scraper')
+        assert (stats['via:http'], stats['outcome:ok']) == (1, 1)
+
+    def test_falls_back_to_browser(self, monkeypatch):
+        scraper, browser_urls = self.make_scraper(lambda request: httpx.Response(403), monkeypatch)
+        try:
+            assert scraper.get_with_retry('https://example.com/api/jobs') == '<html>browser</html>'
+        finally:
+            scraper.close()
+        assert browser_urls == ['https://example.com/api/jobs']
+
+    def test_other_urls_use_browser(self, monkeypatch):
+        scraper, browser_urls = self.make_scraper(lambda request: httpx.Response(200), monkeypatch)
+        try:
+            scraper.get_with_retry('https://example.com/jobs/1')
+        finally:
+            scraper.close()
+        assert browser_urls == ['https://example.com/jobs/1']
+
+    @pytest.mark.parametrize(('status', 'opens'), [(503, True), (403, True), (200, False)])
+    def test_reports_to_breaker(self, monkeypatch, settings, status, opens):
+        settings.SCRAPER_RATE_LIMIT = 0
+        settings.SCRAPER_BREAKER_THRESHOLD = 2
+        scraper, _ = self.make_scraper(lambda request: html('<li>x</li>', status=status), monkeypatch)
+        try:
+            for _ in range(2):
+                scraper.get_with_retry('https://example.com/api/jobs', max_retries=0)
+        finally:
+            scraper.close()
+        assert (breaker.state('example.com') == breaker.OPEN) is opens
+
+    def test_disabled(self, monkeypatch, settings):
+        settings.SCRAPER_HTTP_FAST_PATH = False
+        scraper, browser_urls = self.make_scraper(lambda request: httpx.Response(200), monkeypatch)
+        try:
+            scraper.get_with_retry('https://example.com/api/jobs')
+        finally:
+            scraper.close()
+        assert browser_urls == ['https://example.com/api/jobs']
@@ -0,0 +1,308 @@
+import base64
+import json
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from urllib.parse import unquote
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from sisyphus.jobs.models import Job
+from sisyphus.searches.parsers.base import BaseParser, PageError
+from sisyphus.searches.parsers.hiringcafe import HiringCafeParser
+from sisyphus.searches.parsers.linkedin import LinkedInParser
+from sisyphus.searches.playwright import Extracted, FetchError, RawResponse
+
+CARD = '''
+<div class="base-card job-search-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/engineer-1?trk=x"></a>
+  <h3 class="base-search-card__title">
+    Engineer
+  </h3>
+  <h4 class="base-search-card__subtitle">
+    <a href="https://www.linkedin.com/company/acme?trk=y"> Acme </a>
+  </h4>
+  <span class="job-search-card__location"> Remote </span>
+  <time class="job-search-card__listdate" datetime="2026-01-02"></time>
+</div>
+'''
+
+RECORD = {
+    'company': 'Acme',
+    'company_url': 'https://www.linkedin.com/company/acme?trk=y',
+    'title': 'Engineer',
+    'url': 'https://www.linkedin.com/jobs/view/engineer-1?trk=x',
+    'location': 'Remote',
+    'date_posted': '2026-01-02',
+}
+
+URL = 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?page=1'
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    parser = LinkedInParser()
+    monkeypatch.setattr(parser, 'get_page_url', lambda search, page, period: URL)
+    yield parser
+    parser._prefetched.clear()
+
+
+class TestLinkedInExtraction:
+    """Tests for in-page extraction in LinkedInParser."""
+
+    def test_record_matches_parsed_card(self, parser):
+        parsed = parser.parse_cards(parser.tag(f'<html><body>{CARD}</body></html>'))
+        assert parser.verify_extraction(URL, [parser.parse_record(RECORD)], parsed)
+
+    def test_parse_uses_records(self, parser):
+        parser._prefetched[URL] = Extracted([RECORD])
+        jobs = parser.parse(None)
+        assert jobs[0]['url'] == 'https://www.linkedin.com/jobs/view/engineer-1'
+        assert jobs[0]['company_url'] == 'https://www.linkedin.com/company/acme'
+
+    @pytest.mark.parametrize('field', ['company_url', 'title', 'url', 'date_posted'])
+    def test_parse_drops_incomplete_records(self, parser, field):
+        parser._prefetched[URL] = Extracted([{**RECORD, field: None}, RECORD])
+        jobs, count = parser.parse_page(None, 1)
+        assert [job['url'] for job in jobs] == ['https://www.linkedin.com/jobs/view/engineer-1']
+        assert count == 2
+
+    def test_parse_verifies_sample(self, parser, caplog):
+        parser._prefetched[URL] = Extracted([{**RECORD, 'title': 'Other'}], html=f'<html><body>{CARD}</body></html>')
+        parser.parse(None)
+        assert 'differs from parsed HTML' in caplog.text
+
+    def test_parse_falls_back_to_html(self, parser):
+        parser._prefetched[URL] = f'<html><body>{CARD}</body></html>'
+        assert parser.parse(None)[0]['title'] == 'Engineer'
+
+    def test_prefetched_failure_raises(self, parser):
+        parser._prefetched[URL] = FetchError(URL, retry_after=5)
+        with pytest.raises(FetchError):
+            parser.parse(None)
+
+    def test_script_disabled(self, parser, settings):
+        settings.SCRAPER_IN_PAGE_EXTRACT = False
+        assert parser.extract_script(URL) is None
+
+
+RESULT = (
+    '{"apply_url": "https://jobs.example.com/1", "job_information": {"title": "Engineer", "description": " Build "},'
+    ' "v5_processed_job_data": {"company_name": "Acme", "company_website": "https://acme.com",'
+    ' "number_of_workplace_cities": 1, "workplace_cities": ["Denver"], "estimated_publish_date_millis": 0}}'
+)
+
+
+class TestHiringCafeRawBody:
+    """Tests for reading HiringCafe API responses as raw JSON."""
+
+    def test_parse_keeps_result_text(self, monkeypatch):
+        parser = HiringCafeParser()
+        url = 'https://hiring.cafe/api/search-jobs?page=0'
+        monkeypatch.setattr(parser, 'get_page_url', lambda search, page, period: url)
+        parser._prefetched[url] = RawResponse(f'{{"results": [{RESULT}]}}'.encode(), 'application/json')
+        jobs = parser.parse(None)
+        assert jobs[0]['title'] == 'Engineer'
+        assert jobs[0]['location'] == 'Denver'
+        assert jobs[0]['raw_html'] == RESULT
+
+    def test_job_count(self, monkeypatch):
+        parser = HiringCafeParser()
+        url = parser.get_search_url('/get-total-count', 'state')
+        parser._prefetched[url] = RawResponse(b'{"total": 120}', 'application/json')
+        assert parser.get_job_count('state') == 120
+
+    def test_job_count_missing(self):
+        parser = HiringCafeParser()
+        parser._prefetched[parser.get_search_url('/get-total-count', 'state')] = None
+        assert parser.get_job_count('state') == 0
+
+    def test_reads_api_raw(self):
+        assert HiringCafeParser().reads_raw('https://hiring.cafe/api/search-jobs?page=0')
+
+
+class TestHiringCafeState:
+    """Tests for HiringCafe search state encoding."""
+
+    def search(self, keywords='python'):
+        return type('Search', (), {'keywords': keywords, 'last_executed_at': None})()
+
+    def test_template_is_not_shared(self):
+        parser = HiringCafeParser()
+        parser.generate_state(self.search('golang'), 86400)
+        template = parser.template()
+        assert template['searchQuery'] == ''
+        template['searchQuery'] = 'x'
+        assert parser.template()['searchQuery'] == ''
+
+    def test_default_days(self):
+        parser = HiringCafeParser()
+        state = json.loads(unquote(base64.b64decode(parser.generate_state(self.search())).decode()))
+        assert state['dateFetchedPastNDays'] == parser.DEFAULT_DAYS
+
+    def test_nested_template_is_not_shared(self):
+        parser = HiringCafeParser()
+        parser.template()['locations'].clear()
+        parser.encode_state.cache_clear()
+        assert parser.template()['locations']
+        assert 'United States' in base64.b64decode(parser.generate_state(self.search(), 86400)).decode()
+
+    def test_state_is_cached(self):
+        parser = HiringCafeParser()
+        parser.encode_state.cache_clear()
+        first = parser.generate_state(self.search(), 86400)
+        assert parser.generate_state(self.search(), 86400) == first
+        assert parser.encode_state.cache_info().hits == 1
+        assert parser.generate_state(self.search('rust'), 86400) != first
+
+    def test_page_size_override(self, settings):
+        settings.HIRINGCAFE_PAGE_SIZE = 100
+        assert 'size=100' in HiringCafeParser().get_search_url('', 'state')
+
+
+class TestPageUrl:
+    """Tests for BaseParser.get_page_url."""
+
+    def test_formats_template(self):
+        class TemplateParser(BaseParser):
+            page_url_template = 'https://jobs.example.com/search?q={search.keywords}&page={page}&age={period}'
+
+        search = SimpleNamespace(keywords='python')
+        url = TemplateParser().get_page_url(search, 2, 86400)
+        assert url == 'https://jobs.example.com/search?q=python&page=2&age=86400'
+
+    def test_missing_template(self):
+        class BareParser(BaseParser):
+            pass
+
+        with pytest.raises(ImproperlyConfigured):
+            BareParser().get_page_url(SimpleNamespace(keywords='python'), 1)
+
+
+class TestIterJobs:
+    """Tests for BaseParser.iter_jobs."""
+
+    @pytest.fixture
+    def pages(self, monkeypatch, settings):
+        settings.LINKEDIN_ADAPTIVE_PAGINATION = False
+        parser = LinkedInParser()
+        monkeypatch.setattr(parser, 'get_page_count', lambda search: 3)
+        monkeypatch.setattr(parser, 'get_page_url', lambda search, page, period: f'{URL}&p={page}')
+        monkeypatch.setattr(parser, 'prefetch_stream', lambda urls, window: (url for url in urls))
+        return parser
+
+    def test_yields_pages_in_order(self, pages, monkeypatch):
+        monkeypatch.setattr(pages, 'parse_page', lambda search, page, period: ([page], 1))
+        assert list(pages.iter_jobs(None, 86400)) == [(1, [1]), (2, [2]), (3, [3])]
+
+    def test_page_error(self, pages, monkeypatch):
+        def parse_page(search, page, period):
+            if page == 2:
+                raise ValueError('bad page')
+            return [], 0
+
+        monkeypatch.setattr(pages, 'parse_page', parse_page)
+        jobs = pages.iter_jobs(None, 86400)
+        assert next(jobs) == (1, [])
+        with pytest.raises(PageError) as excinfo:
+            next(jobs)
+        assert excinfo.value.page == 2
+
+    def test_adaptive_stops_on_short_page(self, pages, monkeypatch, settings):
+        settings.LINKEDIN_ADAPTIVE_PAGINATION = True
+
+        def probe(search):
+            raise AssertionError('count probed')
+
+        monkeypatch.setattr(pages, 'get_page_count', probe)
+        monkeypatch.setattr(pages, 'parse_page', lambda search, page, period: ([{}], 10 if page < 3 else 4))
+        assert [page for page, _ in pages.iter_jobs(None, 86400)] == [1, 2, 3]
+
+    def test_adaptive_stops_on_empty_page(self, pages, monkeypatch, settings):
+        settings.LINKEDIN_ADAPTIVE_PAGINATION = True
+        monkeypatch.setattr(pages, 'parse_page', lambda search, page, period: ([{}] * 10, 10) if page == 1 else ([], 0))
+        assert [page for page, _ in pages.iter_jobs(None, 86400)] == [1, 2]
+
+    def test_failed_load_is_not_last_page(self, pages, monkeypatch, settings):
+        settings.LINKEDIN_ADAPTIVE_PAGINATION = True
+        monkeypatch.setattr(pages, 'get_pages', lambda search, period: range(1, 4))
+        pages._prefetched[f'{URL}&p=1'] = f'<html><body>{CARD * 10}</body></html>'
+        pages._prefetched[f'{URL}&p=2'] = None
+        jobs = pages.iter_jobs(None, 86400)
+        assert next(jobs)[0] == 1
+        with pytest.raises(PageError) as excinfo:
+            next(jobs)
+        assert excinfo.value.page == 2
+        assert isinstance(excinfo.value.__cause__, FetchError)
+
+    def test_adaptive_counts_dropped_cards(self, pages, monkeypatch, settings):
+        settings.LINKEDIN_ADAPTIVE_PAGINATION = True
+        monkeypatch.setattr(pages, 'JOBS_PER_PAGE', 2)
+        monkeypatch.setattr(pages, 'get_pages', lambda search, period: range(1, 3))
+        parse_job = pages.parse_job
+        monkeypatch.setattr(pages, 'parse_job', lambda div: parse_job(div) if div.find('h3') else None)
+        broken = CARD.replace('h3', 'h5')
+        for page in (1, 2):
+            pages._prefetched[f'{URL}&p={page}'] = f'<html><body>{CARD}{broken}</body></html>'
+        assert [(page, len(jobs)) for page, jobs in pages.iter_jobs(None, 86400)] == [(1, 1), (2, 1)]
+
+
+class TestPopulateJobs:
+    """Tests for BaseParser.populate_jobs."""
+
+    def test_skips_jobs_that_are_no_longer_new(self, job, monkeypatch):
+        parser = LinkedInParser()
+        filtered = Job.objects.create(
+            company=job.company, user=job.user, title='Engineer', url='https://test.com/jobs/9', status=Job.Status.FILTERED
+        )
+        prefetched, populated = [], []
+
+        def prefetch_stream(urls, window):
+            prefetched.extend(urls)
+            yield from urls
+
+        monkeypatch.setattr(parser, 'prefetch_stream', prefetch_stream)
+        monkeypatch.setattr(parser, 'populate_job', lambda job, save: populated.append(job))
+        parser.populate_jobs([job, filtered])
+        assert prefetched == [job.url]
+        assert populated == [job]
+
+    def test_saves_in_one_update_and_stops_at_deadline(self, job, monkeypatch, django_assert_num_queries):
+        parser = LinkedInParser()
+        jobs = [job] + [
+            Job.objects.create(company=job.company, user=job.user, title='Engineer', url=f'https://test.com/jobs/{n}')
+            for n in (7, 8, 9)
+        ]
+
+        def populate_job(job, save):
+            if job.url.endswith('/8'):
+                raise ValueError('bad page')
+            job.description = 'Details'
+            job.populated = True
+
+        monkeypatch.setattr(parser, 'prefetch_stream', lambda urls, window: (url for url in urls))
+        monkeypatch.setattr(parser, 'populate_job', populate_job)
+        with django_assert_num_queries(1):
+            result = parser.populate_jobs(jobs, deadline=time.monotonic() + 60)
+        assert result == {'populated': [jobs[0], jobs[1], jobs[3]], 'failed': [jobs[2]], 'unfinished': []}
+        assert Job.objects.filter(populated=True, description='Details').count() == 3
+
+        result = parser.populate_jobs(jobs[2:], deadline=0)
+        assert result['failed'] == [jobs[2]]
+        assert result['unfinished'] == [jobs[3]]
+
+    def test_populate_job_keeps_whole_page(self, job):
+        parser = LinkedInParser()
+        page = (
+            '<html><head><title>Engineer</title></head><body>'
+            '<div class="show-more-less-html__markup"> Details </div>'
+            '<section class="similar-jobs"><ul></ul></section>'
+            '</body></html>'
+        )
+        parser._prefetched[job.url] = page
+        parser.populate_job(job)
+        job.refresh_from_db()
+        assert job.raw_html == page
+        assert job.description == 'Details'
+        assert job.populated
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from sisyphus.searches.ratelimit import current_user, rate_limit_user, rate_limiter
+
+
+pytestmark = pytest.mark.limits(
+    SCRAPER_RATE_LIMIT=1.0, SCRAPER_RATE_BURST=2, SCRAPER_HOST_RATES={}, SCRAPER_RATE_USER_WINDOW=30
+)
+
+
+class TestHostRateLimiter:
+    """Tests for the Redis token bucket in HostRateLimiter."""
+
+    def test_burst_then_throttle(self, limits):
+        assert rate_limiter.try_acquire('a.com') == 0
+        assert rate_limiter.try_acquire('a.com') == 0
+        assert 0 < rate_limiter.try_acquire('a.com') <= 1
+        assert rate_limiter.try_acquire('b.com') == 0
+
+    def test_host_override(self, limits):
+        limits.SCRAPER_HOST_RATES = {'a.com': 0.1}
+        rate_limiter.try_acquire('a.com')
+        rate_limiter.try_acquire('a.com')
+        assert rate_limiter.try_acquire('a.com') > 1
+
+    def test_active_users_share_the_host(self, limits):
+        limits.SCRAPER_RATE_BURST = 4
+        assert rate_limiter.try_acquire('a.com', 'bob') == 0
+        assert rate_limiter.try_acquire('a.com', 'alice') == 0
+        assert rate_limiter.try_acquire('a.com', 'alice') == 0
+        # Two active users split the burst of four, so alice waits though the host has a token left
+        assert rate_limiter.try_acquire('a.com', 'alice') > 0
+        assert rate_limiter.try_acquire('a.com', 'bob') == 0
+
+    def test_wait_records_throttled_requests(self, limits, monkeypatch):
+        delays = iter([0.01, 0.0])
+        monkeypatch.setattr(rate_limiter, 'try_acquire', lambda host, user: next(delays))
+        assert asyncio.run(rate_limiter.wait('a.com')) >= 0.01
+        stats = rate_limiter.stats('a.com')
+        assert stats['throttled'] == 1
+        assert stats['wait_seconds'] > 0
+
+    def test_disabled(self, limits, monkeypatch):
+        limits.SCRAPER_RATE_LIMIT = 0
+        monkeypatch.setattr(rate_limiter, 'try_acquire', lambda host, user: pytest.fail('limiter used'))
+        assert asyncio.run(rate_limiter.wait('a.com')) == 0
+
+    def test_rate_limit_user(self):
+        with rate_limit_user(7):
+            assert current_user.get() == '7'
+        assert current_user.get() == ''
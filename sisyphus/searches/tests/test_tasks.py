@@ -0,0 +1,409 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.utils import timezone
+
+from sisyphus.jobs.models import Job
+from sisyphus.jobs.tasks import ban_jobs_with_banned_company
+from sisyphus.rules.tasks import apply_all_rules
+from sisyphus.searches.breaker import breaker
+from sisyphus.searches.models import Search, SearchRun, Source
+from sisyphus.searches.parsers import PARSERS
+from sisyphus.searches.parsers.base import PageError
+from sisyphus.searches.playwright import FetchError
+from sisyphus.searches.telemetry import RequestTelemetry, telemetry
+from sisyphus.searches.tasks import (
+    _on_scrape_success,
+    enqueue_populate_batches,
+    execute_search,
+    populate_job_batch,
+    populate_jobs,
+    run_search,
+)
+
+
+class FakeParser:
+    """Parser that serves canned pages instead of scraping."""
+
+    name = 'fake'
+
+    sorted_by_date = True
+
+    pages: dict[int, list[dict]] = {}
+
+    failing: int | None = None
+
+    loaded: list[int] = []
+
+    def get_page_url(self, search, page, period=None):
+        return f'https://x.com/search?q={search.keywords}&page={page}'
+
+    def iter_jobs(self, search, period=None, after=None):
+        for page in range(1, max(self.pages, default=0) + 1):
+            if after is not None and page <= after:
+                continue
+            if page == self.failing:
+                raise PageError(page)
+            self.loaded.append(page)
+            yield page, self.pages.get(page, [])
+
+    populated: list[list[int]] = []
+
+    def populate_jobs(self, jobs, deadline=None):
+        self.populated.append(sorted(job.id for job in jobs))
+        return {'populated': list(jobs), 'failed': [], 'unfinished': []}
+
+    def close(self):
+        pass
+
+
+def listing(n, date_posted='2026-01-01T00:00:00'):
+    return {
+        'company': 'Acme',
+        'company_url': 'https://linkedin.com/company/acme',
+        'title': f'Engineer {n}',
+        'url': f'https://x.com/j/{n}',
+        'location': 'Remote',
+        'date_posted': date_posted,
+        'date_found': '2026-01-02T00:00:00',
+    }
+
+
+@pytest.fixture
+def search(user_profile, monkeypatch):
+    monkeypatch.setitem(PARSERS, FakeParser.name, FakeParser)
+    source = Source.objects.create(name='Fake', parser=FakeParser.name)
+    return Search.objects.create(user=user_profile, keywords='python', source=source)
+
+
+class TestRunSearch:
+    """Tests for the run_search task."""
+
+    def test_walks_all_pages(self, search, monkeypatch):
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)]})
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.jobs_created == 2
+        assert run.stop_reason == SearchRun.StopReason.EXHAUSTED
+        assert run.last_page == 2
+        search.refresh_from_db()
+        assert search.watermark == Job.objects.parse_datetime('2026-01-01T00:00:00')
+        assert search.job_count == 2
+
+    def test_stops_after_stale_pages(self, search, monkeypatch, settings):
+        settings.SEARCH_STALE_PAGE_LIMIT = 2
+        settings.SEARCH_FANIN_TTL = 0
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)], 3: [listing(3)]})
+        run_search(search.id)
+
+        fresh = {1: [listing(1)], 2: [listing(2)], 3: [listing(3)], 4: [listing(4, '2026-03-01T00:00:00')]}
+        monkeypatch.setattr(FakeParser, 'pages', fresh)
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.stop_reason == SearchRun.StopReason.STALE
+        assert run.last_page == 2
+        assert run.jobs_created == 0
+        search.refresh_from_db()
+        assert search.job_count == 3
+
+    def test_new_listing_on_watermark_day_is_fresh(self, search, monkeypatch, settings):
+        settings.SEARCH_STALE_PAGE_LIMIT = 1
+        settings.SEARCH_FANIN_TTL = 0
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)]})
+        run_search(search.id)
+
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(2)], 2: [listing(1)], 3: [listing(3)]})
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.stop_reason == SearchRun.StopReason.STALE
+        assert run.last_page == 2
+        assert run.jobs_created == 1
+
+    def test_unsorted_source_never_stops_early(self, search, monkeypatch, settings):
+        settings.SEARCH_STALE_PAGE_LIMIT = 1
+        settings.SEARCH_FANIN_TTL = 0
+        monkeypatch.setattr(FakeParser, 'sorted_by_date', False)
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)]})
+        run_search(search.id)
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.stop_reason == SearchRun.StopReason.EXHAUSTED
+        assert run.last_page == 2
+
+    def test_page_error_keeps_earlier_pages(self, search, monkeypatch):
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)], 3: [listing(3)]})
+        monkeypatch.setattr(FakeParser, 'failing', 2)
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.status == SearchRun.Status.SUCCESS
+        assert run.stop_reason == SearchRun.StopReason.PAGE_ERROR
+        assert run.last_page == 2
+        assert run.jobs_created == 1
+
+    def test_defers_while_host_unavailable(self, search, monkeypatch, queue, settings):
+        settings.SCRAPER_BREAKER_THRESHOLD = 1
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)]})
+        monkeypatch.setattr(FakeParser, 'loaded', [])
+        breaker.record_failure('x.com')
+        result = run_search(search.id)
+        assert result['deferred']
+        assert FakeParser.loaded == []
+        assert not SearchRun.objects.filter(search=search).exists()
+        [(delay, func, args)] = queue.scheduled
+        assert func is run_search
+        assert args == (search.id, 0, search.calculate_period(), None, 0, None)
+        search.refresh_from_db()
+        assert search.status == Search.Status.QUEUED
+
+    @pytest.mark.parametrize(('attempt', 'retried'), [(0, True), (3, False)])
+    def test_fetch_error_reschedules_remaining_pages(self, search, monkeypatch, queue, settings, attempt, retried):
+        settings.SEARCH_RETRIES = 3
+        settings.SEARCH_RETRY_DELAY = 10
+        settings.SEARCH_FANIN_TTL = 0
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)], 3: [listing(3)]})
+
+        def iter_jobs(self, search, period=None, after=None):
+            yield 1, self.pages[1]
+            raise PageError(2) from FetchError('https://x.com/search?page=2', retry_after=5)
+
+        monkeypatch.setattr(FakeParser, 'iter_jobs', iter_jobs)
+        result = run_search(search.id, attempt, 3600)
+        assert SearchRun.objects.get(id=result['run_id']).jobs_created == 1
+        search.refresh_from_db()
+        if retried:
+            newest = Job.objects.parse_datetime('2026-01-01T00:00:00')
+            assert queue.scheduled == [(timedelta(seconds=10), run_search, (search.id, 1, 3600, 1, 1, newest))]
+            assert search.status == Search.Status.QUEUED
+        else:
+            assert queue.scheduled == []
+            assert search.status == Search.Status.SUCCESS
+
+    def test_resumed_run_keeps_starting_watermark(self, search, monkeypatch, queue, settings):
+        settings.SEARCH_STALE_PAGE_LIMIT = 2
+        settings.SEARCH_FANIN_TTL = 0
+        search.watermark = Job.objects.parse_datetime('2026-01-01T00:00:00')
+        search.save()
+        pages = {page: [listing(page, f'2026-01-{10 - page:02d}T00:00:00')] for page in range(1, 5)}
+        monkeypatch.setattr(FakeParser, 'pages', pages)
+        failing = [2]
+
+        def iter_jobs(self, search, period=None, after=None):
+            for page in range(after + 1 if after else 1, 5):
+                if page in failing:
+                    failing.remove(page)
+                    raise PageError(page) from FetchError(f'https://x.com/search?page={page}')
+                yield page, self.pages[page]
+
+        monkeypatch.setattr(FakeParser, 'iter_jobs', iter_jobs)
+        run_search(search.id, 0, 3600)
+        search.refresh_from_db()
+        assert search.watermark == Job.objects.parse_datetime('2026-01-01T00:00:00')
+        assert search.job_count is None
+
+        [(_, _, args)] = queue.scheduled
+        result = run_search(*args)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.stop_reason == SearchRun.StopReason.EXHAUSTED
+        assert run.jobs_created == 3
+        search.refresh_from_db()
+        assert search.watermark == Job.objects.parse_datetime('2026-01-09T00:00:00')
+        assert search.job_count == 4
+
+    def test_failed_run_keeps_watermark(self, search, monkeypatch, settings):
+        settings.SEARCH_RETRIES = 0
+        settings.SEARCH_FANIN_TTL = 0
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)]})
+
+        def iter_jobs(self, search, period=None, after=None):
+            yield 1, self.pages[1]
+            raise PageError(2) from FetchError('https://x.com/search?page=2')
+
+        monkeypatch.setattr(FakeParser, 'iter_jobs', iter_jobs)
+        run_search(search.id)
+        search.refresh_from_db()
+        assert search.watermark is None
+
+    @pytest.mark.parametrize('queue_size', [0, 1])
+    def test_records_stage_timings(self, search, monkeypatch, settings, queue_size):
+        settings.SEARCH_INGEST_QUEUE_SIZE = queue_size
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)]})
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.jobs_created == 2
+        assert run.fetch_seconds > 0
+        assert run.ingest_seconds > 0
+
+    @pytest.mark.parametrize('queue_size', [0, 1])
+    def test_records_telemetry(self, search, monkeypatch, settings, queue_size):
+        settings.SEARCH_INGEST_QUEUE_SIZE = queue_size
+        settings.SEARCH_FANIN_TTL = 0
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)]})
+        iter_jobs = FakeParser.iter_jobs
+
+        def fetching(parser, search, period=None, after=None):
+            for page, jobs in iter_jobs(parser, search, period, after):
+                # Pages load on the producer thread, as the scraper would record them
+                request = RequestTelemetry(parser.get_page_url(search, page), parser.name)
+                request.outcome = 'ok'
+                request.bytes = 1000
+                telemetry.record(request)
+                yield page, jobs
+
+        monkeypatch.setattr(FakeParser, 'iter_jobs', fetching)
+        result = run_search(search.id)
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.telemetry['requests'] == 2
+        assert run.telemetry['outcome:ok'] == 2
+        assert run.telemetry['bytes'] == 2000
+
+
+class TestSharedResults:
+    """Tests for equivalent searches sharing one load of their result pages."""
+
+    @pytest.fixture(autouse=True)
+    def short_lock(self, settings):
+        settings.SEARCH_FANIN_WAIT = 1
+        settings.SEARCH_FANIN_LOCK_TIMEOUT = 5
+
+    @pytest.fixture
+    def other_search(self, search, db):
+        from sisyphus.accounts.models import User, UserProfile
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        profile, _ = UserProfile.objects.get_or_create(user=other)
+        return Search.objects.create(user=profile, keywords='  Python ', source=search.source)
+
+    def test_second_user_replays_pages(self, search, other_search, monkeypatch):
+        monkeypatch.setattr(FakeParser, 'pages', {1: [listing(1)], 2: [listing(2)]})
+        monkeypatch.setattr(FakeParser, 'loaded', [])
+        run_search(search.id)
+        result = run_search(other_search.id)
+        assert FakeParser.loaded == [1, 2]
+        run = SearchRun.objects.get(id=result['run_id'])
+        assert run.jobs_created == 2
+        assert Job.objects.filter(user=other_search.user).count() == 2
+
+
+class FakeQueue:
+    def __init__(self):
+        self.enqueued = []
+        self.scheduled = []
+        self.names = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append((func, args))
+        return SimpleNamespace(id=f'job-{len(self.enqueued)}')
+
+    def enqueue_in(self, delay, func, *args, **kwargs):
+        self.scheduled.append((delay, func, args))
+        return SimpleNamespace(id=f'scheduled-{len(self.scheduled)}')
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = FakeQueue()
+
+    def get_queue(name='default', **kwargs):
+        queue.names.append(name)
+        return queue
+
+    monkeypatch.setattr('sisyphus.searches.tasks.django_rq.get_queue', get_queue)
+    return queue
+
+
+class TestQueueRouting:
+    """Tests for routing pipeline stages to their queues."""
+
+    def test_scrape_success_routes_stages(self, queue):
+        job = SimpleNamespace(meta={'user_id': 1, 'search_id': 2})
+        _on_scrape_success(job, None, {'run_id': 3})
+        assert queue.names == ['maintenance', 'populate']
+        assert [func for func, _ in queue.enqueued] == [apply_all_rules, ban_jobs_with_banned_company, populate_jobs]
+
+    def test_deferred_scrape_continues_later(self, queue):
+        job = SimpleNamespace(meta={'user_id': 1, 'search_id': 2})
+        _on_scrape_success(job, None, {'deferred': True, 'search_id': 2, 'retry_in': 30})
+        assert queue.enqueued == []
+
+    def test_execute_search_enqueues_scrape(self, search, queue):
+        execute_search(search.id, search.user_id)
+        assert queue.names == ['scrape']
+        assert queue.enqueued == [(run_search, (search.id, 0, None, None, 0, None))]
+
+
+class TestPopulateTasks:
+    """Tests for the batched populate tasks."""
+
+    def make_job(self, company, n, **kwargs):
+        return Job.objects.create(company=company, user=company.user, title='Engineer', url=f'https://x.com/j/{n}', **kwargs)
+
+    def test_enqueue_populate_batches(self, queue, settings):
+        settings.POPULATE_BATCH_SIZE = 2
+        assert enqueue_populate_batches([1, 2, 3, 4, 5]) == 3
+        assert queue.enqueued == [
+            (populate_job_batch, ([1, 2],)),
+            (populate_job_batch, ([3, 4],)),
+            (populate_job_batch, ([5],)),
+        ]
+        assert set(queue.names) == {'populate'}
+
+    def test_populate_jobs_only_enqueues_new_unpopulated(self, search, company, queue):
+        run = SearchRun.objects.create(search=search)
+        new = self.make_job(company, 1, search_run=run)
+        self.make_job(company, 2, search_run=run, populated=True)
+        self.make_job(company, 3, search_run=run, status=Job.Status.FILTERED)
+        self.make_job(company, 4)
+        result = populate_jobs(run.id)
+        assert result['enqueued'] == 1
+        assert queue.enqueued == [(populate_job_batch, ([new.id],))]
+
+    def test_populate_job_batch_groups_by_parser(self, search, company, monkeypatch, queue):
+        monkeypatch.setattr(FakeParser, 'populated', [])
+        other = Source.objects.create(name='Gone', parser='gone')
+        jobs = [self.make_job(company, n, source=search.source) for n in (1, 2)]
+        orphan = self.make_job(company, 3, source=other)
+        result = populate_job_batch([job.id for job in jobs] + [orphan.id])
+        assert result['populated'] == 2
+        assert FakeParser.populated == [sorted(job.id for job in jobs)]
+
+    def test_populate_job_batch_skips_claimed_jobs(self, search, company, monkeypatch, queue):
+        monkeypatch.setattr(FakeParser, 'populated', [])
+        free = self.make_job(company, 1, source=search.source)
+        taken = self.make_job(company, 2, source=search.source, populate_claimed_at=timezone.now())
+        stale = self.make_job(
+            company, 3, source=search.source, populate_claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        result = populate_job_batch([free.id, taken.id, stale.id])
+        assert result['claimed'] == 2
+        assert FakeParser.populated == [sorted([free.id, stale.id])]
+        free.refresh_from_db()
+        assert free.populate_claimed_at is None
+
+    @pytest.mark.parametrize(('attempt', 'retried'), [(0, True), (1, False)])
+    def test_populate_job_batch_requeues(self, search, company, monkeypatch, queue, settings, attempt, retried):
+        settings.POPULATE_RETRIES = 1
+        failed, unfinished = (self.make_job(company, n, source=search.source) for n in (1, 2))
+        monkeypatch.setattr(
+            FakeParser,
+            'populate_jobs',
+            lambda self, jobs, deadline=None: {'populated': [], 'failed': [failed], 'unfinished': [unfinished]},
+        )
+        settings.POPULATE_RETRY_DELAY = 10
+        result = populate_job_batch([failed.id, unfinished.id], attempt)
+        assert queue.enqueued == [(populate_job_batch, ([unfinished.id], attempt))]
+        expected = [(timedelta(seconds=10), populate_job_batch, ([failed.id], 1))] if retried else []
+        assert queue.scheduled == expected
+        assert result['requeued'] == 1 + len(expected)
+
+    def test_populate_job_batch_defers_unavailable_host(self, search, company, monkeypatch, queue, settings):
+        settings.SCRAPER_BREAKER_THRESHOLD = 1
+        monkeypatch.setattr(FakeParser, 'populated', [])
+        job = self.make_job(company, 1, source=search.source)
+        breaker.record_failure('x.com')
+        result = populate_job_batch([job.id], 1)
+        assert FakeParser.populated == []
+        assert result['deferred'] == 1
+        [(delay, func, args)] = queue.scheduled
+        assert (func, args) == (populate_job_batch, ([job.id], 1))
+        assert 0 < delay.total_seconds() <= settings.SCRAPER_BREAKER_COOLDOWN
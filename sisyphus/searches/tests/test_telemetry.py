@@ -0,0 +1,114 @@
+import pytest
+from redis.exceptions import RedisError
+
+from sisyphus.searches.telemetry import (
+    PARSER,
+    RUN,
+    WORKER,
+    RequestTelemetry,
+    current_run,
+    telemetry,
+    telemetry_run,
+    worker_name,
+)
+
+
+def sample(parser='linkedin', via='browser', outcome='ok', status=200, **fields):
+    request = RequestTelemetry('https://www.linkedin.com/jobs/view/1', parser, via)
+    request.outcome = outcome
+    request.status = status
+    for field, value in fields.items():
+        setattr(request, field, value)
+    return request
+
+
+class TestRequestTelemetry:
+    """Tests for RequestTelemetry."""
+
+    def test_counters(self):
+        counters = sample(bytes=2048, blocked=3, navigation_seconds=1.5).counters()
+        assert counters['requests'] == 1
+        assert counters['via:browser'] == 1
+        assert counters['outcome:ok'] == 1
+        assert counters['status:200'] == 1
+        assert counters['bytes'] == 2048
+        assert counters['blocked_requests'] == 3
+        assert counters['navigation_seconds'] == 1.5
+
+    def test_no_status_for_failed_load(self):
+        counters = sample(outcome='failed', status=None).counters()
+        assert counters['outcome:failed'] == 1
+        assert not any(field.startswith('status:') for field in counters)
+
+    def test_run_from_context(self):
+        with telemetry_run(42):
+            assert sample().run == '42'
+        assert current_run.get() == ''
+        assert sample().run == ''
+
+
+class TestTelemetry:
+    """Tests for the Telemetry aggregates."""
+
+    def test_buffers_until_flush(self, settings, fake_redis):
+        settings.SCRAPER_TELEMETRY_FLUSH = 2
+        assert not telemetry.record(sample())
+        assert fake_redis.keys('sisyphus:telemetry:*') == []
+        assert telemetry.record(sample())
+        telemetry.flush()
+        assert telemetry.stats(PARSER, 'linkedin')['requests'] == 2
+
+    def test_aggregates_per_parser_run_and_worker(self):
+        with telemetry_run('run-1'):
+            telemetry.record(sample(navigation_seconds=1.0, context_seconds=0.5))
+            telemetry.record(sample(parser='hiringcafe', via='http', navigation_seconds=3.0))
+        telemetry.record(sample(via='cache'))
+        telemetry.flush()
+        assert telemetry.stats(PARSER, 'linkedin')['requests'] == 2
+        assert telemetry.stats(PARSER, 'hiringcafe')['requests'] == 1
+        assert telemetry.stats(WORKER, worker_name())['requests'] == 3
+        run = telemetry.stats(RUN, 'run-1')
+        assert run['requests'] == 2
+        assert run['via:http'] == 1
+        assert run['mean_navigation_seconds'] == 2.0
+        assert run['mean_context_seconds'] == 0.25
+        assert telemetry.names(PARSER) == ['hiringcafe', 'linkedin']
+
+    def test_cache_hits_excluded_from_means(self):
+        telemetry.record(sample(navigation_seconds=2.0))
+        telemetry.record(sample(via='cache'))
+        telemetry.flush()
+        stats = telemetry.stats(PARSER, 'linkedin')
+        assert stats['via:cache'] == 1
+        assert stats['mean_navigation_seconds'] == 2.0
+
+    def test_keys_expire(self, settings, fake_redis):
+        settings.SCRAPER_TELEMETRY_TTL = 60
+        telemetry.record(sample())
+        telemetry.flush()
+        assert 0 < fake_redis.ttl(telemetry.key(PARSER, 'linkedin')) <= 60
+
+    def test_disabled(self, settings):
+        settings.SCRAPER_TELEMETRY = False
+        assert not telemetry.record(sample())
+        telemetry.flush()
+        assert telemetry.stats(PARSER, 'linkedin') == {}
+
+    def test_redis_errors_drop_pending(self, monkeypatch, caplog):
+        class BrokenPipeline:
+            def __getattr__(self, name):
+                def fail(*args, **kwargs):
+                    raise RedisError('down')
+
+                return fail
+
+        telemetry.record(sample())
+        monkeypatch.setattr(telemetry.connection, 'pipeline', lambda **kwargs: BrokenPipeline())
+        telemetry.flush()
+        assert 'Could not record telemetry' in caplog.text
+        assert telemetry._pending == {}
+
+    @pytest.mark.parametrize('value', [b'3', b'1.5'])
+    def test_stats_numbers(self, fake_redis, value):
+        fake_redis.hset(telemetry.key(PARSER, 'linkedin'), 'bytes', value)
+        assert telemetry.stats(PARSER, 'linkedin')['bytes'] == float(value)
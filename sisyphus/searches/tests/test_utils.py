@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from sisyphus.searches.utils import decode_with_raw_items, remove_query
+
+
+class TestRemoveQuery:
+    """Tests for remove_query."""
+
+    def test_strips_query(self):
+        assert remove_query('https://x.com/jobs/1?trk=a') == 'https://x.com/jobs/1'
+
+    def test_none(self):
+        assert remove_query(None) is None
+
+
+class TestDecodeWithRawItems:
+    """Tests for decode_with_raw_items."""
+
+    def test_items_keep_source_text(self):
+        text = ' {"total": 2, "results": [ {"a": [1, 2]} , {"b": "]"} ], "meta": {"results": []}} '
+        data, items = decode_with_raw_items(text, 'results')
+        assert data == json.loads(text)
+        assert items == [({'a': [1, 2]}, '{"a": [1, 2]}'), ({'b': ']'}, '{"b": "]"}')]
+
+    def test_missing_key(self):
+        assert decode_with_raw_items('{"error": "nope"}', 'results') == ({'error': 'nope'}, [])
+
+    def test_empty(self):
+        assert decode_with_raw_items('{}', 'results') == ({}, [])
+        assert decode_with_raw_items('{"results": []}', 'results') == ({'results': []}, [])
+
+    @pytest.mark.parametrize('text', ['', '[]', '{"results": [1', '{"a": 1'])
+    def test_invalid(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            decode_with_raw_items(text, 'results')
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import json
+import re
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urljoin, urlparse
 
 if TYPE_CHECKING:
@@ -14,7 +16,54 @@ def remove_query(url: str | None) -> str | None:
     return urljoin(url, urlparse(url).path)
 
 
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+def _expect(text: str, index: int, char: str) -> int:
+    """Return the index after char, skipping whitespace, or raise if it is not next."""
+    index = _whitespace.match(text, index).end()
+    if text[index : index + 1] != char:
+        raise json.JSONDecodeError(f'Expecting {char!r}', text, index)
+    return _whitespace.match(text, index + 1).end()
+
+
+def decode_with_raw_items(text: str, key: str) -> tuple[dict[str, Any], list[tuple[Any, str]]]:
+    """Decode a JSON object and return the source text of each item in its ``key`` array.
+
+    Each item is decoded once, so its original text comes for free instead
+    of re-encoding the decoded item with ``json.dumps``.
+    """
+    data: dict[str, Any] = {}
+    items: list[tuple[Any, str]] = []
+    index = _expect(text, 0, '{')
+    while text[index : index + 1] != '}':
+        if data:
+            index = _expect(text, index, ',')
+        name, index = _decoder.raw_decode(text, index)
+        index = _expect(text, index, ':')
+        if name == key and text[index : index + 1] == '[':
+            values = []
+            index = _expect(text, index, '[')
+            while text[index : index + 1] != ']':
+                if values:
+                    index = _expect(text, index, ',')
+                start = index
+                value, index = _decoder.raw_decode(text, index)
+                values.append(value)
+                items.append((value, text[start:index]))
+                index = _whitespace.match(text, index).end()
+            index += 1
+            data[name] = values
+        else:
+            data[name], index = _decoder.raw_decode(text, index)
+        index = _whitespace.match(text, index).end()
+    return data, items
+
+
 class NullableTag:
+    """Wraps a bs4 Tag, or a backend adapter with the same methods, so lookups never return None."""
+
     def __init__(self, tag: Tag | None = None):
         self._tag = tag
 
@@ -108,6 +108,131 @@ OPENAI_API_KEY = env('OPENAI_API_KEY')
 
 PROXY = env('PROXY', default=None)
 
+# Proxy URLs handed out per browser context and HTTP client, defaulting to PROXY alone
+SCRAPER_PROXIES = env.list('SCRAPER_PROXIES', default=[PROXY] if PROXY else [])
+
+# Rolling score below which a proxy is evicted, seconds it stays out, and the load time
+# past which a response counts against its proxy
+SCRAPER_PROXY_MIN_SCORE = env.float('SCRAPER_PROXY_MIN_SCORE', default=0.5)
+SCRAPER_PROXY_EVICT_SECONDS = env.int('SCRAPER_PROXY_EVICT_SECONDS', default=600)
+SCRAPER_PROXY_SLOW_SECONDS = env.float('SCRAPER_PROXY_SLOW_SECONDS', default=10.0)
+
+# Browser contexts kept warm per scraper (also the cap on concurrent page loads),
+# and requests served by each before it is replaced
+SCRAPER_POOL_SIZE = env.int('SCRAPER_POOL_SIZE', default=4)
+SCRAPER_CONTEXT_MAX_USES = env.int('SCRAPER_CONTEXT_MAX_USES', default=25)
+
+# Concurrent page loads allowed against a single host
+SCRAPER_PER_HOST_CONCURRENCY = env.int('SCRAPER_PER_HOST_CONCURRENCY', default=2)
+
+# Requests per second to each host shared by all workers (0 turns the limiter off),
+# per-host overrides as host=rate pairs, and the burst each host's bucket allows
+SCRAPER_RATE_LIMIT = env.float('SCRAPER_RATE_LIMIT', default=1.0)
+SCRAPER_HOST_RATES = env.dict('SCRAPER_HOST_RATES', cast={'value': float}, default={})
+SCRAPER_RATE_BURST = env.int('SCRAPER_RATE_BURST', default=5)
+
+# Seconds a user counts as active on a host, splitting its rate with the other active users
+SCRAPER_RATE_USER_WINDOW = env.int('SCRAPER_RATE_USER_WINDOW', default=30)
+
+# Times a failed fetch is retried in place, and the cap in seconds on the backoff between
+# attempts, before the task reschedules its remaining work instead
+SCRAPER_FETCH_RETRIES = env.int('SCRAPER_FETCH_RETRIES', default=2)
+SCRAPER_RETRY_MAX_DELAY = env.float('SCRAPER_RETRY_MAX_DELAY', default=5.0)
+
+# Failed requests to a host within the window (seconds) that open its circuit breaker (0 disables),
+# and seconds requests to it are refused before a probe is let through
+SCRAPER_BREAKER_THRESHOLD = env.int('SCRAPER_BREAKER_THRESHOLD', default=5)
+SCRAPER_BREAKER_WINDOW = env.int('SCRAPER_BREAKER_WINDOW', default=60)
+SCRAPER_BREAKER_COOLDOWN = env.int('SCRAPER_BREAKER_COOLDOWN', default=120)
+
+# How fetches use the on-disk response cache: off, cache, record (store every response)
+# or replay (serve only stored responses, for running pipelines offline)
+SCRAPER_CACHE_MODE = env('SCRAPER_CACHE_MODE', default='cache')
+SCRAPER_CACHE_DIR = env('SCRAPER_CACHE_DIR', default=str(BASE_DIR.parent / '.cache' / 'responses'))
+SCRAPER_CACHE_MAX_MB = env.int('SCRAPER_CACHE_MAX_MB', default=512)
+
+# Seconds cached responses stay fresh (0 does not cache), and per-endpoint overrides
+# as endpoint=seconds pairs, an endpoint being a host and its first two path segments
+SCRAPER_CACHE_TTL = env.int('SCRAPER_CACHE_TTL', default=0)
+SCRAPER_CACHE_TTLS = env.dict(
+    'SCRAPER_CACHE_TTLS', cast={'value': int}, default={'www.linkedin.com/jobs/view': 86400}
+)
+
+# Try parser-declared JSON/fragment endpoints over keep-alive HTTP before the browser
+SCRAPER_HTTP_FAST_PATH = env.bool('SCRAPER_HTTP_FAST_PATH', default=True)
+SCRAPER_HTTP_TIMEOUT = env.float('SCRAPER_HTTP_TIMEOUT', default=30.0)
+
+# Install each parser's resource blocking profile on browser contexts
+SCRAPER_BLOCK_RESOURCES = env.bool('SCRAPER_BLOCK_RESOURCES', default=True)
+
+# Count blocked and allowed requests, at the cost of a Python callback per request
+SCRAPER_BLOCK_STATS = env.bool('SCRAPER_BLOCK_STATS', default=False)
+
+# Sum per-request timings, sizes and outcomes per parser, search run and worker in Redis,
+# writing every SCRAPER_TELEMETRY_FLUSH requests and keeping idle totals for SCRAPER_TELEMETRY_TTL seconds
+SCRAPER_TELEMETRY = env.bool('SCRAPER_TELEMETRY', default=True)
+SCRAPER_TELEMETRY_FLUSH = env.int('SCRAPER_TELEMETRY_FLUSH', default=50)
+SCRAPER_TELEMETRY_TTL = env.int('SCRAPER_TELEMETRY_TTL', default=604800)
+
+# Seconds to wait for a parser's readiness selector before falling back to networkidle
+SCRAPER_READY_TIMEOUT = env.float('SCRAPER_READY_TIMEOUT', default=10.0)
+
+# Run parsers' in-page extraction scripts instead of serializing the DOM, and the
+# fraction of those pages also parsed from HTML to check both agree
+SCRAPER_IN_PAGE_EXTRACT = env.bool('SCRAPER_IN_PAGE_EXTRACT', default=True)
+SCRAPER_EXTRACT_VERIFY_RATE = env.float('SCRAPER_EXTRACT_VERIFY_RATE', default=0.05)
+
+# HTML parser behind BaseParser.soupify: html.parser, lxml or selectolax
+HTML_PARSER_BACKEND = env('HTML_PARSER_BACKEND', default='lxml')
+
+# Search result pages kept loading ahead of the page being ingested
+SEARCH_PAGE_CONCURRENCY = env.int('SEARCH_PAGE_CONCURRENCY', default=4)
+
+# Parsed result pages allowed to wait for ingestion before loading pauses (0 parses and ingests in turn)
+SEARCH_INGEST_QUEUE_SIZE = env.int('SEARCH_INGEST_QUEUE_SIZE', default=2)
+
+# Walk LinkedIn result pages until a short one instead of loading the search page for a job count
+LINKEDIN_ADAPTIVE_PAGINATION = env.bool('LINKEDIN_ADAPTIVE_PAGINATION', default=True)
+
+# Seconds parsed result pages are shared with equivalent searches by other users (0 disables)
+SEARCH_FANIN_TTL = env.int('SEARCH_FANIN_TTL', default=1800)
+
+# Seconds an equivalent search waits for another run of its query to finish
+SEARCH_FANIN_WAIT = env.int('SEARCH_FANIN_WAIT', default=900)
+
+# Seconds a run's hold on its query lasts after the last page it handled
+SEARCH_FANIN_LOCK_TIMEOUT = env.int('SEARCH_FANIN_LOCK_TIMEOUT', default=120)
+
+# Times a search whose pages failed to load is rescheduled to resume, and the seconds before
+# its first retry, doubling with each one
+SEARCH_RETRIES = env.int('SEARCH_RETRIES', default=3)
+SEARCH_RETRY_DELAY = env.int('SEARCH_RETRY_DELAY', default=60)
+
+# Results requested per HiringCafe page (0 keeps the parser default)
+HIRINGCAFE_PAGE_SIZE = env.int('HIRINGCAFE_PAGE_SIZE', default=0)
+
+# Jobs whose detail pages are loaded together by one populate task
+POPULATE_BATCH_SIZE = env.int('POPULATE_BATCH_SIZE', default=8)
+
+# Seconds a populate task spends before handing the jobs it has not reached to a new task (0 for no limit)
+POPULATE_BATCH_BUDGET = env.int('POPULATE_BATCH_BUDGET', default=300)
+
+# Times jobs that failed to populate are retried in a new task
+POPULATE_RETRIES = env.int('POPULATE_RETRIES', default=2)
+
+# Seconds before failed jobs are first retried, doubling with each retry
+POPULATE_RETRY_DELAY = env.int('POPULATE_RETRY_DELAY', default=60)
+
+# Seconds before a populate task's claim on its jobs lapses, e.g. after the worker died
+POPULATE_CLAIM_TTL = env.int('POPULATE_CLAIM_TTL', default=900)
+
+# Max Company and Location rows kept in the per-run identity cache
+IDENTITY_CACHE_SIZE = env.int('IDENTITY_CACHE_SIZE', default=4096)
+
+# Stop paginating a search after this many consecutive pages with no listings
+# that are both unknown and newer than the search watermark (0 disables)
+SEARCH_STALE_PAGE_LIMIT = env.int('SEARCH_STALE_PAGE_LIMIT', default=2)
+
 ROOT_URLCONF = 'sisyphus.urls'
 
 TEMPLATES = [
@@ -185,15 +310,46 @@ LOGOUT_REDIRECT_URL = 'metrics:index'
 
 REDIS_URL = env('REDIS_URL')
 
+# One queue per pipeline stage, each with its own workers and a timeout sized for
+# its tasks, so that a long scrape never holds up populating, scoring or rule runs
+RQ_SCRAPE_TIMEOUT = env.int('RQ_SCRAPE_TIMEOUT', default=14400)
+RQ_POPULATE_TIMEOUT = env.int('RQ_POPULATE_TIMEOUT', default=1800)
+RQ_SCORE_TIMEOUT = env.int('RQ_SCORE_TIMEOUT', default=300)
+RQ_MAINTENANCE_TIMEOUT = env.int('RQ_MAINTENANCE_TIMEOUT', default=3600)
+
 RQ_QUEUES = {
     'default': {
         'URL': REDIS_URL,
         'DEFAULT_TIMEOUT': 43200,
     },
+    'scrape': {
+        'URL': REDIS_URL,
+        'DEFAULT_TIMEOUT': RQ_SCRAPE_TIMEOUT,
+    },
+    'populate': {
+        'URL': REDIS_URL,
+        'DEFAULT_TIMEOUT': RQ_POPULATE_TIMEOUT,
+    },
+    'score': {
+        'URL': REDIS_URL,
+        'DEFAULT_TIMEOUT': RQ_SCORE_TIMEOUT,
+    },
+    'maintenance': {
+        'URL': REDIS_URL,
+        'DEFAULT_TIMEOUT': RQ_MAINTENANCE_TIMEOUT,
+    },
 }
 
 RQ_SHOW_ADMIN_LINK = True
 
+# Children per warmworkers pool, and jobs each runs before it is recycled (0 for no limit)
+WORKER_POOL_SIZE = env.int('WORKER_POOL_SIZE', default=2)
+WORKER_MAX_JOBS = env.int('WORKER_MAX_JOBS', default=128)
+
+# Per-user set of stored job URLs in Redis, checked before ingestion
+KNOWN_URL_FILTER = env.bool('KNOWN_URL_FILTER', default=True)
+KNOWN_URL_TTL = env.int('KNOWN_URL_TTL', default=86400)
+
 # Simple JWT
 SIMPLE_JWT = {
     'USER_ID_FIELD': 'uuid',